@@ -0,0 +1,298 @@
+"""
+Micro-benchmark for the scalar Glicko-2 ``Player`` update.
+
+Compares :class:`libs.glicko2.Player` against the previous three-pass
+implementation on rating periods of one to three games, the typical load
+for a football team in a single week.
+
+Usage::
+
+    python -m benchmarks.bench_glicko2 [--periods N] [--repeat N]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import timeit
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from libs.constants import (  # noqa: E402
+    CONVERGENCE_TOLERANCE,
+    DEFAULT_RATING,
+    DEFAULT_RD,
+    DEFAULT_VOLATILITY,
+    GLICKO2_SCALER,
+    TAU,
+)
+from libs.glicko2 import Player  # noqa: E402
+
+Period = tuple[
+    tuple[float, float, float], list[float], list[float], list[float]
+]
+
+
+class LegacyPlayer:
+    """Three-pass Player implementation that predates the fused kernel."""
+
+    def get_rating(self) -> float:
+        """Return the player's rating."""
+        return (self.__rating * GLICKO2_SCALER) + DEFAULT_RATING
+
+    def set_rating(self, rating: float) -> None:
+        """Set the player's rating."""
+        self.__rating = (rating - DEFAULT_RATING) / GLICKO2_SCALER
+
+    rating = property(get_rating, set_rating)
+
+    def get_rd(self) -> float:
+        """Return the player's rating deviation."""
+        return self.__rd * GLICKO2_SCALER
+
+    def set_rd(self, rd: float) -> None:
+        """Set the player's rating deviation."""
+        self.__rd = rd / GLICKO2_SCALER
+
+    rd = property(get_rd, set_rd)
+
+    def __init__(
+        self,
+        rating: float = DEFAULT_RATING,
+        rd: float = DEFAULT_RD,
+        vol: float = DEFAULT_VOLATILITY,
+        tau: float = TAU,
+    ) -> None:
+        """Initialize a player."""
+        # For testing purposes, preload the values assigned
+        # to an unrated player.
+        self._tau = tau
+        self.set_rating(rating)
+        self.set_rd(rd)
+        self.vol = vol
+
+    def _pre_rating_rd(self) -> None:
+        """
+        Calculate a player's new rating deviation for a rating period.
+
+        preRatingRD() -> None
+        """
+        self.__rd = math.sqrt(math.pow(self.__rd, 2) + math.pow(self.vol, 2))
+
+    def update_player(
+        self,
+        rating_list: list[float],
+        rd_list: list[float],
+        outcome_list: list[float],
+    ) -> None:
+        """
+        Calculate the new rating and rating deviation of the player.
+
+        update_player(list[int], list[int], list[bool]) -> None
+        """
+        # Convert the rating and rating deviation values for internal use.
+        rating_list = [
+            (x - DEFAULT_RATING) / GLICKO2_SCALER for x in rating_list
+        ]
+        rd_list = [x / GLICKO2_SCALER for x in rd_list]
+
+        v = self._v(rating_list, rd_list)
+        self.vol = self._new_vol(rating_list, rd_list, outcome_list, v)
+        self._pre_rating_rd()
+
+        self.__rd = 1 / math.sqrt((1 / math.pow(self.__rd, 2)) + (1 / v))
+
+        temp_sum = 0.0
+        for i in range(len(rating_list)):
+            temp_sum += self._g(rd_list[i]) * (
+                outcome_list[i] - self._e(rating_list[i], rd_list[i])
+            )
+        self.__rating += math.pow(self.__rd, 2) * temp_sum
+
+    # step 5
+    def _new_vol(
+        self,
+        rating_list: list[float],
+        rd_list: list[float],
+        outcome_list: list[float],
+        v: float,
+    ) -> float:
+        """
+        Calculate the new volatility as per the Glicko2 system.
+
+        Updated for Feb 22, 2012 revision. -Leo
+
+        _newVol(list, list, list, float) -> float
+        """
+        # step 1
+        a = math.log(self.vol**2)
+        eps = CONVERGENCE_TOLERANCE
+        _a = a
+
+        # step 2
+        b: float | None = None
+        delta = self._delta(rating_list, rd_list, outcome_list, v)
+        tau = self._tau
+        if (delta**2) > ((self.__rd**2) + v):
+            b = math.log(delta**2 - self.__rd**2 - v)
+        else:
+            k = 1
+            while self._f(a - k * math.sqrt(tau**2), delta, v, a) < 0:
+                k = k + 1
+            b = a - k * math.sqrt(tau**2)
+
+        # step 3
+        f_a = self._f(_a, delta, v, a)
+        f_b = self._f(b, delta, v, a)
+
+        # step 4
+        while math.fabs(b - _a) > eps:
+            # a
+            c = _a + ((_a - b) * f_a) / (f_b - f_a)
+            f_c = self._f(c, delta, v, a)
+            # b
+            if f_c * f_b <= 0:
+                _a = b
+                f_a = f_b
+            else:
+                f_a = f_a / 2.0
+            # c
+            b = c
+            f_b = f_c
+
+        # step 5
+        return math.exp(_a / 2)
+
+    def _f(self, x: float, delta: float, v: float, a: float) -> float:
+        """Return the helper function used during volatility calculation."""
+        ex = math.exp(x)
+        num1 = ex * (delta**2 - self.__rating**2 - v - ex)
+        denom1 = 2 * ((self.__rating**2 + v + ex) ** 2)
+        return (num1 / denom1) - ((x - a) / (self._tau**2))
+
+    def _delta(
+        self,
+        rating_list: list[float],
+        rd_list: list[float],
+        outcome_list: list[float],
+        v: float,
+    ) -> float:
+        """
+        Compute the delta function of the Glicko2 system.
+
+        _delta(list, list, list) -> float
+        """
+        temp_sum = 0.0
+        for i in range(len(rating_list)):
+            temp_sum += self._g(rd_list[i]) * (
+                outcome_list[i] - self._e(rating_list[i], rd_list[i])
+            )
+        return v * temp_sum
+
+    def _v(self, rating_list: list[float], rd_list: list[float]) -> float:
+        """
+        Compute the v function of the Glicko2 system.
+
+        _v(list[int], list[int]) -> float
+        """
+        temp_sum = 0.0
+        for i in range(len(rating_list)):
+            temp_e = self._e(rating_list[i], rd_list[i])
+            temp_sum += math.pow(self._g(rd_list[i]), 2) * temp_e * (1 - temp_e)
+        return 1 / max(temp_sum, 0.00001)
+
+    def _e(self, p2rating: float, p2rd: float) -> float:
+        """
+        Compute the Glicko E function.
+
+        _E(int) -> float
+        """
+        return 1 / (
+            1 + math.exp(-1 * self._g(p2rd) * (self.__rating - p2rating))
+        )
+
+    def _g(self, rd: float) -> float:
+        """
+        Compute the Glicko2 g(RD) function.
+
+        _g() -> float
+        """
+        return 1 / math.sqrt(1 + 3 * math.pow(rd, 2) / math.pow(math.pi, 2))
+
+    def did_not_compete(self) -> None:
+        """
+        Apply step 6 of the algorithm.
+
+        Use this for players who did not compete in the rating period.
+
+        did_not_compete() -> None
+        """
+        self._pre_rating_rd()
+
+
+def make_periods(count: int, seed: int = 1869) -> list[Period]:
+    """Return ``count`` random rating periods of one to three games."""
+    rng = random.Random(seed)  # noqa: S311
+    periods = []
+    for _ in range(count):
+        games = rng.randint(1, 3)
+        player = (
+            rng.gauss(1400, 250),
+            rng.uniform(40, 350),
+            rng.uniform(0.05, 0.12),
+        )
+        periods.append(
+            (
+                player,
+                [rng.gauss(1400, 250) for _ in range(games)],
+                [rng.uniform(40, 350) for _ in range(games)],
+                [rng.choice((0.0, 0.25, 0.5, 0.75, 1.0)) for _ in range(games)],
+            )
+        )
+    return periods
+
+
+def run(player_cls: type, periods: list[Period]) -> None:
+    """Rate every period with a fresh ``player_cls`` instance."""
+    for (rating, rd, vol), ratings, rds, outcomes in periods:
+        player_cls(rating, rd, vol).update_player(ratings, rds, outcomes)
+
+
+def main() -> None:
+    """Time both implementations and report the speedup."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--periods", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    periods = make_periods(args.periods)
+    for (rating, rd, vol), ratings, rds, outcomes in periods[:100]:
+        fused = Player(rating, rd, vol)
+        fused.update_player(ratings, rds, outcomes)
+        legacy = LegacyPlayer(rating, rd, vol)
+        legacy.update_player(ratings, rds, outcomes)
+        assert math.isclose(fused.rating, legacy.rating, rel_tol=1e-12)  # noqa: S101
+
+    results = {}
+    for name, player_cls in (("legacy", LegacyPlayer), ("fused", Player)):
+        best = min(
+            timeit.repeat(
+                lambda cls=player_cls: run(cls, periods),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        results[name] = best
+        sys.stdout.write(
+            f"{name:>6}: {best * 1e6 / len(periods):7.2f} us per period\n"
+        )
+    sys.stdout.write(f"speedup: {results['legacy'] / results['fused']:.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -148,6 +148,18 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Rating engine checkpoints
+# End-of-season state saved by the glicko and elo commands for --resume-from.
+
+RATING_CHECKPOINT_DIR = Path(
+    os.environ.get("RATING_CHECKPOINT_DIR", BASE_DIR / "checkpoints")
+)
+
+# CFBD API response cache
+# Raw responses stored by cfbd_import and replayed with --offline.
+
+CFBD_CACHE_DIR = Path(os.environ.get("CFBD_CACHE_DIR", BASE_DIR / "cfbd_cache"))
+
 UNFOLD = {
     "SITE_TITLE": "CFB Oracle",
     "SITE_HEADER": "CFB Oracle",
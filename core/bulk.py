@@ -0,0 +1,182 @@
+"""Fast bulk writes of raw rows for the rating commands."""
+
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+# Rows buffered before a write. Executemany and COPY have no per-statement
+# parameter limit, so this only bounds the memory held by the buffer.
+BULK_BATCH_ROWS = 10_000
+
+
+@contextmanager
+def bulk_transaction(using: str = DEFAULT_DB_ALIAS) -> Iterator[None]:
+    """
+    Run the block in one transaction tuned for large writes.
+
+    On SQLite ``synchronous`` is switched off for the duration, so commits
+    skip the fsync calls that dominate many small transactions; the
+    previous setting is restored afterwards. SQLite only allows this
+    outside a transaction, so nested blocks run with the current settings.
+    """
+    connection = connections[using]
+    relax = connection.vendor == "sqlite" and not connection.in_atomic_block
+    if relax:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            (synchronous,) = cursor.fetchone()
+            cursor.execute("PRAGMA synchronous = OFF")
+    try:
+        with transaction.atomic(using=using):
+            yield
+    finally:
+        if relax:
+            with connection.cursor() as cursor:
+                cursor.execute(f"PRAGMA synchronous = {int(synchronous)}")
+
+
+class BulkWriter:
+    """
+    Buffer raw value tuples for one model and insert them in batches.
+
+    Rows hold the values of ``fields`` in order, already in database form
+    (foreign keys as ids). Other fields with a model default are filled with
+    it, since model defaults are not database defaults. SQLite receives the
+    rows through ``executemany`` of a single prepared ``INSERT`` and
+    PostgreSQL with psycopg 3 through ``COPY``; other backends fall back to
+    ``bulk_create``, which splits batches at the backend's parameter limit.
+    With ``ignore_conflicts`` rows rejected by a constraint are skipped, as
+    ``bulk_create`` does.
+    """
+
+    def __init__(
+        self,
+        model: type[models.Model],
+        fields: Sequence[str],
+        *,
+        ignore_conflicts: bool = False,
+        batch_size: int = BULK_BATCH_ROWS,
+        using: str = DEFAULT_DB_ALIAS,
+    ) -> None:
+        """Create a writer for ``fields`` of ``model``."""
+        self.model = model
+        self.fields = list(fields)
+        self.ignore_conflicts = ignore_conflicts
+        self.batch_size = batch_size
+        self.using = using
+        self.rows_written = 0
+        self._rows: list[tuple] = []
+        self._defaults = {
+            field.attname: field.get_default()
+            for field in model._meta.concrete_fields
+            if field.has_default() and field.attname not in self.fields
+        }
+
+    def add(self, row: tuple) -> None:
+        """Queue ``row``, writing the buffer once it holds a full batch."""
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def extend(self, rows: Iterable[tuple]) -> None:
+        """Queue every row of ``rows``."""
+        for row in rows:
+            self.add(row)
+
+    def flush(self) -> int:
+        """Write the buffered rows and return how many were sent."""
+        rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        connection = connections[self.using]
+        if connection.vendor == "sqlite":
+            self._executemany(connection, rows)
+        elif self._supports_copy(connection):
+            self._copy(connection, rows)
+        else:
+            self._bulk_create(rows)
+        self.rows_written += len(rows)
+        return len(rows)
+
+    def _columns(self, connection: object) -> str:
+        """Return the quoted columns of ``fields`` and defaulted fields."""
+        opts = self.model._meta
+        return ", ".join(
+            connection.ops.quote_name(opts.get_field(name).column)
+            for name in (*self.fields, *self._defaults)
+        )
+
+    def _with_defaults(self, rows: list[tuple]) -> list[tuple]:
+        """Append the default values to each of ``rows``."""
+        if not self._defaults:
+            return rows
+        defaults = tuple(self._defaults.values())
+        return [row + defaults for row in rows]
+
+    def _executemany(self, connection: object, rows: list[tuple]) -> None:
+        """Insert ``rows`` with one prepared statement."""
+        insert = "INSERT OR IGNORE" if self.ignore_conflicts else "INSERT"
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        columns = self._columns(connection)
+        placeholders = ", ".join(
+            ["%s"] * (len(self.fields) + len(self._defaults))
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"{insert} INTO {table} ({columns}) VALUES ({placeholders})",
+                self._with_defaults(rows),
+            )
+
+    @staticmethod
+    def _supports_copy(connection: object) -> bool:
+        """Return whether ``connection`` is PostgreSQL through psycopg 3."""
+        return (
+            connection.vendor == "postgresql"
+            and connection.Database.__name__ == "psycopg"
+        )
+
+    def _copy(self, connection: object, rows: list[tuple]) -> None:
+        """
+        Stream ``rows`` with ``COPY``.
+
+        ``COPY`` cannot skip conflicting rows, so with ``ignore_conflicts``
+        the rows are copied into a temporary table first and moved over
+        with ``INSERT ... ON CONFLICT DO NOTHING``. The temporary table is
+        qualified with ``pg_temp`` so dropping it can never reach a regular
+        table of the same name.
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        columns = self._columns(connection)
+        target = table
+        with connection.cursor() as cursor:
+            if self.ignore_conflicts:
+                target = "pg_temp." + connection.ops.quote_name(
+                    f"{self.model._meta.db_table}_bulk"
+                )
+                cursor.execute(f"DROP TABLE IF EXISTS {target}")
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {target} AS "  # noqa: S608
+                    f"SELECT {columns} FROM {table} WITH NO DATA"
+                )
+            with cursor.cursor.copy(
+                f"COPY {target} ({columns}) FROM STDIN"
+            ) as copy:
+                for row in self._with_defaults(rows):
+                    copy.write_row(row)
+            if self.ignore_conflicts:
+                cursor.execute(
+                    f"INSERT INTO {table} ({columns}) "  # noqa: S608
+                    f"SELECT {columns} FROM {target} ON CONFLICT DO NOTHING"
+                )
+                cursor.execute(f"DROP TABLE {target}")
+
+    def _bulk_create(self, rows: list[tuple]) -> None:
+        """Insert ``rows`` through the ORM."""
+        self.model.objects.using(self.using).bulk_create(
+            [
+                self.model(**dict(zip(self.fields, row, strict=True)))
+                for row in rows
+            ],
+            ignore_conflicts=self.ignore_conflicts,
+        )
@@ -0,0 +1 @@
+"""Helpers for importing data from the CFBD API."""
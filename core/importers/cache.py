@@ -0,0 +1,166 @@
+"""On-disk cache of CFBD API responses."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+
+import cfbd
+
+# Bump when the stored payload format changes.
+CACHE_VERSION = 1
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Seconds a cached response stays fresh, per API method. Responses for a
+# ``year`` before the current season never expire.
+CACHE_TTLS = {
+    "get_venues": 7 * DAY,
+    "get_conferences": 7 * DAY,
+    "get_teams": DAY,
+    "get_games": HOUR,
+}
+
+# Model each cached API method returns a list of.
+RESPONSE_MODELS = {
+    "get_venues": cfbd.Venue,
+    "get_conferences": cfbd.Conference,
+    "get_teams": cfbd.Team,
+    "get_games": cfbd.Game,
+}
+
+
+class OfflineCacheError(LookupError):
+    """Raised offline when a response was never cached."""
+
+
+def current_season(today: date | None = None) -> int:
+    """
+    Return the latest season that can still change.
+
+    Bowl games run into January, so a season stays current until the end
+    of February.
+    """
+    today = today or date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+def _json_default(value: object) -> str:
+    """Encode the dates found in CFBD models."""
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class ResponseCache:
+    """
+    API responses stored as JSON, one file per endpoint and parameters.
+
+    Files live under ``directory/<endpoint>/<hash of parameters>.json`` and
+    are replaced atomically, so concurrent fetches never read a partial
+    file. Offline, every stored response is served regardless of age.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        *,
+        offline: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create a cache rooted at ``directory``."""
+        self.directory = Path(directory)
+        self.offline = offline
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def path(self, endpoint: str, params: dict[str, object]) -> Path:
+        """Return the file caching ``endpoint`` called with ``params``."""
+        key = json.dumps(
+            {"version": CACHE_VERSION, "params": params},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+        return self.directory / endpoint / f"{digest}.json"
+
+    def ttl(self, endpoint: str, params: dict[str, object]) -> float | None:
+        """Return how long a response stays fresh, or ``None`` for ever."""
+        year = params.get("year")
+        if year is not None and year < current_season():
+            return None
+        return CACHE_TTLS.get(endpoint, 0)
+
+    def get(self, endpoint: str, params: dict[str, object]) -> list | None:
+        """Return the stored payload, or ``None`` if missing or stale."""
+        path = self.path(endpoint, params)
+        try:
+            age = self.clock() - path.stat().st_mtime
+            ttl = self.ttl(endpoint, params)
+            if self.offline or ttl is None or age < ttl:
+                payload = json.loads(path.read_text())
+            else:
+                payload = None
+        except FileNotFoundError:
+            payload = None
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if payload is None and self.offline:
+            raise OfflineCacheError(
+                f"No cached {endpoint} response for {params}"
+            )
+        return payload
+
+    def put(
+        self, endpoint: str, params: dict[str, object], payload: list
+    ) -> None:
+        """Atomically store ``payload`` for ``endpoint`` and ``params``."""
+        path = self.path(endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(payload, fh, default=_json_default)
+        Path(tmp).replace(path)
+
+
+class CachedApi:
+    """
+    A ``cfbd`` API instance whose list endpoints go through a cache.
+
+    Methods listed in :data:`RESPONSE_MODELS` must be called with keyword
+    arguments; their results are stored as the JSON the API returns and
+    rebuilt into models on a hit. Other attributes pass through.
+    """
+
+    def __init__(self, api: object, cache: ResponseCache) -> None:
+        """Wrap ``api`` so its responses are read from ``cache``."""
+        self.api = api
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> object:
+        """Return ``name`` of the wrapped API, cached if it is an endpoint."""
+        method = getattr(self.api, name)
+        model = RESPONSE_MODELS.get(name)
+        if model is None:
+            return method
+
+        def cached(**params: object) -> list:
+            payload = self.cache.get(name, params)
+            if payload is not None:
+                return [model.from_dict(item) for item in payload]
+            response = method(**params)
+            self.cache.put(name, params, [item.to_dict() for item in response])
+            return response
+
+        return cached
@@ -0,0 +1,175 @@
+"""Rate limiting and retries around CFBD API calls."""
+
+import random
+import threading
+import time
+from collections.abc import Callable
+
+from cfbd.rest import ApiException
+
+# Response statuses worth retrying: throttling and server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Requests allowed at ``rate`` per second, in bursts of up to ``burst``.
+
+    Every call takes a token, so the bucket may go negative: a caller that
+    finds it empty reserves the next token and sleeps until it is due.
+    Concurrent callers thus queue up fairly without holding the lock while
+    they sleep.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create a full bucket refilled at ``rate`` tokens per second."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.clock = clock
+        self.sleep = sleep
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is available; return the wait."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = max(-self._tokens / self.rate, 0.0)
+            if wait:
+                self.waits += 1
+                self.wait_seconds += wait
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return whether ``error`` is a throttled or failed API response."""
+    return isinstance(error, ApiException) and error.status in RETRY_STATUSES
+
+
+def retry_after(error: ApiException) -> float:
+    """Return the seconds a ``Retry-After`` header asks for, or zero."""
+    value = (error.headers or {}).get("Retry-After")
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ResilientClient:
+    """
+    Throttling and retry policy shared by the API instances it wraps.
+
+    Every call first takes a token from the optional :class:`TokenBucket`.
+    Responses with a status in :data:`RETRY_STATUSES` are retried up to
+    ``retries`` times, sleeping a random time up to ``backoff`` seconds
+    doubled per attempt and capped at ``max_backoff`` ("full jitter"), or
+    longer if the response carries ``Retry-After``. Other errors, and the
+    last retryable one, are raised to the caller.
+    """
+
+    def __init__(
+        self,
+        *,
+        limiter: TokenBucket | None = None,
+        retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        """Create a client applying ``limiter`` and the retry policy."""
+        self.limiter = limiter
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.jitter = jitter
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self.backoff_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, method: Callable[..., object], **params: object) -> object:
+        """Return ``method(**params)``, throttled and retried."""
+        attempt = 0
+        while True:
+            if self.limiter:
+                self.limiter.acquire()
+            with self._lock:
+                self.requests += 1
+            try:
+                return method(**params)
+            except Exception as error:
+                if not is_retryable(error) or attempt == self.retries:
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                delay = max(
+                    self.jitter()
+                    * min(self.max_backoff, self.backoff * 2**attempt),
+                    retry_after(error),
+                )
+            with self._lock:
+                self.retried += 1
+                self.backoff_seconds += delay
+            self.sleep(delay)
+            attempt += 1
+
+    def wrap(self, api: object) -> "ResilientApi":
+        """Return ``api`` with its calls going through this client."""
+        return ResilientApi(api, self)
+
+    def summary(self) -> str:
+        """Return the request, retry and throttling counts."""
+        waits = self.limiter.waits if self.limiter else 0
+        waited = self.limiter.wait_seconds if self.limiter else 0.0
+        return (
+            f"{self.requests} requests, {self.retried} retries "
+            f"({self.backoff_seconds:.2f}s backoff), {self.failures} "
+            f"failures; throttled {waits} times for {waited:.2f}s"
+        )
+
+
+class ResilientApi:
+    """
+    A ``cfbd`` API instance whose ``get_*`` calls go through a client.
+
+    Endpoints must be called with keyword arguments; other attributes pass
+    through.
+    """
+
+    def __init__(self, api: object, client: ResilientClient) -> None:
+        """Wrap ``api`` so its requests use ``client``."""
+        self.api = api
+        self.client = client
+
+    def __getattr__(self, name: str) -> object:
+        """Return ``name`` of the wrapped API, retried if it is an endpoint."""
+        method = getattr(self.api, name)
+        if not name.startswith("get_"):
+            return method
+
+        def call(**params: object) -> object:
+            return self.client.call(method, **params)
+
+        return call
@@ -0,0 +1,217 @@
+"""Concurrent fetching of API pages that are consumed in order."""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class PipelineStats:
+    """
+    Throughput of fetching threads and of the consumer they feed.
+
+    Queue depth is the number of fetched results waiting for the consumer,
+    sampled each time it takes one.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        """Start the clock for a queue holding up to ``queue_size``."""
+        self.queue_size = queue_size
+        self.fetched = 0
+        self.fetch_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_depth = 0
+        self._depth_total = 0
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def timed(self, fetch: Callable[[K], V]) -> Callable[[K], V]:
+        """Return ``fetch`` wrapped to add its run time to the totals."""
+
+        def run(key: K) -> V:
+            started = time.perf_counter()
+            try:
+                return fetch(key)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.fetched += 1
+                    self.fetch_seconds += elapsed
+
+        return run
+
+    def taken(self, depth: int, waited: float) -> None:
+        """Record a result taken with ``depth`` results queued."""
+        self._depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+        self.wait_seconds += waited
+
+    def summary(self) -> str:
+        """Return the fetch and consume rates and queue depth."""
+        elapsed = time.perf_counter() - self._started
+        busy = max(elapsed - self.wait_seconds, 1e-9)
+        fetching = max(self.fetch_seconds, 1e-9)
+        mean_depth = self._depth_total / self.fetched if self.fetched else 0
+        return (
+            f"fetched {self.fetched} responses in {self.fetch_seconds:.2f}s "
+            f"of fetch time ({self.fetched / fetching:.1f}/s per worker); "
+            f"writer busy {busy:.2f}s ({self.fetched / busy:.1f}/s), "
+            f"waited {self.wait_seconds:.2f}s; queue depth mean "
+            f"{mean_depth:.1f}, max {self.max_depth}/{self.queue_size}"
+        )
+
+
+def fetch_in_order(
+    fetch: Callable[[K], V],
+    keys: Iterable[K],
+    *,
+    concurrency: int = 1,
+    lookahead: int | None = None,
+    stats: PipelineStats | None = None,
+) -> Iterator[tuple[K, V]]:
+    """
+    Yield ``(key, fetch(key))`` for every key, in the order of ``keys``.
+
+    With ``concurrency`` above one, or an explicit ``lookahead``, the calls
+    run on that many worker threads while the caller consumes earlier
+    results on its own thread. At most ``lookahead`` keys, twice
+    ``concurrency`` by default, are fetched ahead, so a slow consumer
+    bounds the memory held by finished pages. An exception from ``fetch``
+    is raised when its key is reached; fetches not yet started are then
+    cancelled.
+    """
+    if concurrency <= 1 and lookahead is None:
+        for key in keys:
+            yield key, fetch(key)
+        return
+
+    lookahead = lookahead or 2 * concurrency
+    if stats:
+        fetch = stats.timed(fetch)
+    executor = ThreadPoolExecutor(
+        max_workers=max(concurrency, 1), thread_name_prefix="cfbd-fetch"
+    )
+    pending: deque[tuple[K, Future[V]]] = deque()
+
+    def take() -> tuple[K, V]:
+        key, future = pending.popleft()
+        if not stats:
+            return key, future.result()
+        depth = sum(queued.done() for _, queued in pending) + future.done()
+        started = time.perf_counter()
+        result = future.result()
+        stats.taken(depth, time.perf_counter() - started)
+        return key, result
+
+    try:
+        for key in keys:
+            pending.append((key, executor.submit(fetch, key)))
+            if len(pending) >= lookahead:
+                yield take()
+        while pending:
+            yield take()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def request_key(method: str, params: dict[str, object]) -> Hashable:
+    """Return the key identifying a call of ``method`` with ``params``."""
+    return method, tuple(sorted(params.items()))
+
+
+class FetchPipeline:
+    """
+    API calls fetched ahead on worker threads for a single consumer.
+
+    ``tasks`` pair a :func:`request_key` with the call producing it. The
+    calls start in order on ``workers`` threads and their results wait in a
+    queue of at most ``queue_size``, so fetching stalls instead of
+    buffering the whole import when the consumer falls behind. The consumer
+    reads through :meth:`wrap`, in the same order as the tasks. A failed
+    call raises when its result is taken and the rest keep flowing.
+    """
+
+    def __init__(
+        self,
+        tasks: Iterable[tuple[Hashable, Callable[[], object]]],
+        *,
+        workers: int = 1,
+        queue_size: int = 8,
+    ) -> None:
+        """Start fetching ``tasks``."""
+        tasks = list(tasks)
+        self._waiting = {key for key, _ in tasks}
+        self.stats = PipelineStats(queue_size)
+        self._results = fetch_in_order(
+            _outcome,
+            tasks,
+            concurrency=workers,
+            lookahead=queue_size,
+            stats=self.stats,
+        )
+
+    def take(self, key: Hashable, fetch: Callable[[], V]) -> V:
+        """
+        Return the fetched result of ``key``.
+
+        Queued results before ``key`` are dropped. A key that is not queued
+        is fetched by calling ``fetch`` on the consumer's thread.
+        """
+        if key in self._waiting:
+            for (done, _), (result, error) in self._results:
+                self._waiting.discard(done)
+                if done == key:
+                    if error:
+                        raise error
+                    return result
+        return fetch()
+
+    def close(self) -> None:
+        """Cancel the fetches that have not started."""
+        self._results.close()
+
+    def wrap(self, api: object) -> "PipelinedApi":
+        """Return ``api`` with its calls answered by this pipeline."""
+        return PipelinedApi(api, self)
+
+
+def _outcome(
+    task: tuple[Hashable, Callable[[], V]],
+) -> tuple[V | None, Exception | None]:
+    """Return the result of calling ``task``, or the error it raised."""
+    try:
+        return task[1](), None
+    except Exception as error:
+        return None, error
+
+
+class PipelinedApi:
+    """An API instance whose keyword calls are read from a pipeline."""
+
+    def __init__(self, api: object, pipeline: FetchPipeline) -> None:
+        """Wrap ``api`` so its calls are taken from ``pipeline``."""
+        self.api = api
+        self.pipeline = pipeline
+
+    def __getattr__(self, name: str) -> Callable[..., object]:
+        """Return method ``name`` of the wrapped API, read from the queue."""
+        method = getattr(self.api, name)
+
+        def call(**params: object) -> object:
+            return self.pipeline.take(
+                request_key(name, params), lambda: method(**params)
+            )
+
+        return call
+
+
+def pipeline_task(
+    api: object, method: str, **params: object
+) -> tuple[Hashable, Callable[[], object]]:
+    """Return a :class:`FetchPipeline` task calling ``api.method``."""
+    return request_key(method, params), lambda: getattr(api, method)(**params)
@@ -0,0 +1,128 @@
+"""CFBD responses read from local JSON or JSONL dumps."""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+
+from core.importers.cache import RESPONSE_MODELS
+
+# Characters read at a time from a JSON array dump.
+CHUNK_SIZE = 1 << 16
+
+# Dump file extensions, in order of preference.
+SUFFIXES = (".jsonl", ".json")
+
+
+class SourceError(LookupError):
+    """Raised when a dump needed by the import is missing or malformed."""
+
+
+def iter_records(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Yield the records of a ``.jsonl`` file or of a ``.json`` array.
+
+    Neither format is read whole: JSONL is decoded line by line and an
+    array one element at a time from ``chunk_size`` reads, so only the
+    record being decoded is held as text. A malformed dump raises
+    :class:`SourceError`.
+    """
+    with path.open(encoding="utf-8") as fh:
+        if path.suffix == ".jsonl":
+            for number, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise SourceError(f"{path}, line {number}: {e}") from e
+                yield record
+        else:
+            yield from _iter_array(fh, path, chunk_size)
+
+
+def _iter_array(fh: IO[str], path: Path, chunk_size: int) -> Iterator[dict]:
+    """Yield the elements of the JSON array read from ``fh``."""
+    decoder = json.JSONDecoder()
+    buffer = fh.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise SourceError(f"{path} does not hold a JSON array")
+    buffer = buffer[1:]
+    while True:
+        buffer = buffer.lstrip().removeprefix(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                raise SourceError(f"{path}: {e}") from e
+            buffer += chunk
+            continue
+        yield record
+        buffer = buffer[end:]
+
+
+class DumpApi:
+    """
+    Stand-in for the ``cfbd`` API instances that reads a dump directory.
+
+    The directory holds ``venues``, ``conferences`` and ``teams`` dumps
+    and one ``games/<season>`` dump per season, each as ``.jsonl`` or as a
+    ``.json`` array of the objects the API returns. Endpoints return
+    iterators that rebuild each record into the same model as an API
+    response as it is read, so a dump is never held in memory whole and
+    must be iterated only once. A dump is imported as it was taken, so the
+    API's ``conference`` and ``year`` filters are rejected.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        """Read dumps from ``directory``."""
+        self.directory = Path(directory)
+
+    def path(self, name: str) -> Path:
+        """Return the dump file called ``name``, with either extension."""
+        for suffix in SUFFIXES:
+            path = self.directory / f"{name}{suffix}"
+            if path.is_file():
+                return path
+        raise SourceError(f"No {name} dump in {self.directory}")
+
+    def seasons(self) -> list[int]:
+        """Return the seasons with a games dump, in order."""
+        return sorted(
+            {
+                int(path.stem)
+                for path in (self.directory / "games").glob("*.json*")
+                if path.stem.isdigit() and path.suffix in SUFFIXES
+            }
+        )
+
+    def _load(self, endpoint: str, name: str) -> Iterator:
+        """Return the models of dump ``name``; a missing dump raises now."""
+        model = RESPONSE_MODELS[endpoint]
+        path = self.path(name)
+        return (model.from_dict(record) for record in iter_records(path))
+
+    def get_venues(self) -> Iterator:
+        """Return the venues dump."""
+        return self._load("get_venues", "venues")
+
+    def get_conferences(self) -> Iterator:
+        """Return the conferences dump."""
+        return self._load("get_conferences", "conferences")
+
+    def get_teams(
+        self, *, conference: str | None = None, year: int | None = None
+    ) -> Iterator:
+        """Return the teams dump, which cannot be filtered."""
+        if conference is not None or year is not None:
+            raise SourceError(
+                "Team dumps cannot be filtered by conference or year"
+            )
+        return self._load("get_teams", "teams")
+
+    def get_games(self, *, year: int, **params: object) -> Iterator:
+        """Return the games dump of season ``year``."""
+        return self._load("get_games", f"games/{year}")
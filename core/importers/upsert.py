@@ -0,0 +1,146 @@
+"""Bulk insert-or-update of imported rows."""
+
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+
+class UpsertCounts(NamedTuple):
+    """Number of rows inserted, updated and left unchanged by an upsert."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def plus(self, other: "UpsertCounts") -> "UpsertCounts":
+        """Return the field-wise sum of two counts."""
+        return UpsertCounts(
+            *(mine + theirs for mine, theirs in zip(self, other, strict=True))
+        )
+
+    def __str__(self) -> str:
+        """Return the counts for display."""
+        return (
+            f"{self.inserted} inserted, {self.updated} updated, "
+            f"{self.unchanged} unchanged"
+        )
+
+
+def upsert(
+    objs: Iterable[models.Model],
+    fields: Sequence[str],
+    *,
+    changed_pks: list | None = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> UpsertCounts:
+    """
+    Insert new ``objs`` and update the ``fields`` of changed ones.
+
+    Rows are matched on primary key. The stored ``fields`` of every payload
+    row are read first, so rows that have not changed are not written at
+    all; when a key repeats, its last object wins. New and changed rows are
+    written in one atomic block, with ``bulk_create(update_conflicts=True)``
+    where the backend supports it and ``bulk_create`` plus ``bulk_update``
+    elsewhere. The keys of the rows written are appended to ``changed_pks``
+    when it is given.
+    """
+    by_pk = {obj.pk: obj for obj in objs}
+    if not by_pk:
+        return UpsertCounts()
+    model = type(next(iter(by_pk.values())))
+    attnames = [model._meta.get_field(field).attname for field in fields]
+    stored = _stored_values(model, list(by_pk), attnames, using)
+
+    new, changed = [], []
+    for pk, obj in by_pk.items():
+        values = tuple(getattr(obj, attname) for attname in attnames)
+        if pk not in stored:
+            new.append(obj)
+        elif stored[pk] != values:
+            changed.append(obj)
+
+    if not new and not changed:
+        return UpsertCounts(unchanged=len(by_pk))
+    if changed_pks is not None:
+        changed_pks.extend(obj.pk for obj in [*new, *changed])
+    manager = model._default_manager.using(using)
+    with transaction.atomic(using=using):
+        if connections[using].features.supports_update_conflicts_with_target:
+            manager.bulk_create(
+                [*new, *changed],
+                update_conflicts=True,
+                unique_fields=[model._meta.pk.name],
+                update_fields=fields,
+            )
+        else:
+            manager.bulk_create(new)
+            manager.bulk_update(changed, fields)
+    return UpsertCounts(
+        len(new), len(changed), len(by_pk) - len(new) - len(changed)
+    )
+
+
+def _stored_values(
+    model: type[models.Model],
+    pks: list,
+    attnames: Sequence[str],
+    using: str,
+) -> dict:
+    """Return the stored ``attnames`` values of the rows with ``pks``."""
+    batch_size = connections[using].features.max_query_params or len(pks)
+    queryset = model._default_manager.using(using).order_by()
+    stored = {}
+    for start in range(0, len(pks), batch_size):
+        rows = queryset.filter(pk__in=pks[start : start + batch_size])
+        stored.update(
+            (pk, tuple(values))
+            for pk, *values in rows.values_list("pk", *attnames)
+        )
+    return stored
+
+
+def sync_children(
+    model: type[models.Model],
+    parent_field: str,
+    value_field: str,
+    wanted: dict[int, Iterable],
+    *,
+    using: str = DEFAULT_DB_ALIAS,
+) -> tuple[int, int]:
+    """
+    Make the ``value_field`` rows of every parent in ``wanted`` match it.
+
+    The stored rows are read in one query and diffed in memory. Missing
+    values are created in payload order with one ``bulk_create``, and rows
+    that are no longer wanted, including duplicates, are removed with one
+    delete. Parents absent from ``wanted`` are left alone. Returns the
+    numbers of rows added and removed.
+    """
+    parent_attname = model._meta.get_field(parent_field).attname
+    manager = model._default_manager.using(using)
+    stored: dict[tuple, object] = {}
+    stale = []
+    rows = manager.order_by("pk").values_list("pk", parent_attname, value_field)
+    for pk, parent, value in rows:
+        if parent not in wanted:
+            continue
+        if (parent, value) in stored:
+            stale.append(pk)
+        else:
+            stored[parent, value] = pk
+
+    keep = dict.fromkeys(
+        (parent, value) for parent, values in wanted.items() for value in values
+    )
+    stale.extend(pk for key, pk in stored.items() if key not in keep)
+    new = [
+        model(**{parent_attname: parent, value_field: value})
+        for parent, value in keep
+        if (parent, value) not in stored
+    ]
+    with transaction.atomic(using=using):
+        manager.bulk_create(new)
+        if stale:
+            manager.filter(pk__in=stale).delete()
+    return len(new), len(stale)
@@ -1,21 +1,86 @@
 """Management command to import data from the CFBD API."""
 
 import argparse
+import json
 import os
 import time
+from collections.abc import Collection
 from datetime import date
+from pathlib import Path
 
 import cfbd
 from cfbd.rest import ApiException
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.utils import timezone
 from dotenv import load_dotenv
 
+from core.importers.cache import (
+    CachedApi,
+    OfflineCacheError,
+    ResponseCache,
+    current_season,
+)
+from core.importers.client import ResilientClient, TokenBucket
+from core.importers.fetch import (
+    FetchPipeline,
+    fetch_in_order,
+    pipeline_task,
+)
+from core.importers.source import DumpApi, SourceError
+from core.importers.upsert import UpsertCounts, sync_children, upsert
 from core.models.conference import Conference
+from core.models.import_state import ImportState
 from core.models.match import Match
+from core.models.rating_period import digest_matches
 from core.models.team import Team, TeamAlternativeName, TeamLogo
 from core.models.venue import Venue
 
+# Responses a pipelined import fetches ahead of the database writes.
+PIPELINE_QUEUE_SIZE = 8
+
+# Default API request budget: sustained requests per second and burst.
+RATE_LIMIT = 10.0
+RATE_BURST = 5
+
+# Team columns written by the teams import.
+TEAM_FIELDS = (
+    "school",
+    "mascot",
+    "abbreviation",
+    "slug",
+    "conference",
+    "classification",
+    "color",
+    "alternate_color",
+    "twitter",
+    "location",
+)
+
+# Match columns written by the games import.
+MATCH_FIELDS = (
+    "season",
+    "week",
+    "season_type",
+    "start_date",
+    "completed",
+    "venue",
+    "neutral_site",
+    "attendance",
+    "home_team",
+    "home_classification",
+    "home_conference",
+    "home_score",
+    "away_team",
+    "away_classification",
+    "away_conference",
+    "away_score",
+)
+MATCH_ATTNAMES = tuple(
+    Match._meta.get_field(field).attname for field in MATCH_FIELDS
+)
+
 
 class Command(BaseCommand):
     """Import data from the CFBD API."""
@@ -48,6 +113,90 @@ class Command(BaseCommand):
             default=date.today().year,
             help="Last season year to import games from",
         )
+        parser.add_argument(
+            "--source",
+            type=str,
+            help=(
+                "Import from a directory of JSON or JSONL dumps instead of "
+                "the API: venues, conferences, teams and games/<season>; "
+                "seasons without a games dump are skipped"
+            ),
+        )
+        parser.add_argument(
+            "--cache-dir",
+            type=str,
+            help=(
+                "Directory of cached API responses "
+                "(default: settings.CFBD_CACHE_DIR)"
+            ),
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Always call the API and store nothing",
+        )
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Replay every response from the cache without the API",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Number of seasons of games to fetch in parallel",
+        )
+        parser.add_argument(
+            "--rate-limit",
+            type=float,
+            default=RATE_LIMIT,
+            help="Maximum API requests per second, 0 for no limit",
+        )
+        parser.add_argument(
+            "--burst",
+            type=int,
+            default=RATE_BURST,
+            help="API requests allowed at once before --rate-limit applies",
+        )
+        parser.add_argument(
+            "--retries",
+            type=int,
+            default=3,
+            help="Times a throttled or failed API request is retried",
+        )
+        parser.add_argument(
+            "--backoff",
+            type=float,
+            default=1.0,
+            help="Base delay in seconds of the exponential retry backoff",
+        )
+        parser.add_argument(
+            "--pipeline",
+            action="store_true",
+            help=(
+                "Fetch every API response ahead on --concurrency threads "
+                "while the database writes run"
+            ),
+        )
+        parser.add_argument(
+            "--queue-size",
+            type=int,
+            default=PIPELINE_QUEUE_SIZE,
+            help="Responses fetched ahead of the writer in --pipeline mode",
+        )
+        parser.add_argument(
+            "--delta",
+            action="store_true",
+            help=(
+                "Only fetch seasons that can still change and skip seasons "
+                "whose games are unchanged since the last import"
+            ),
+        )
+        parser.add_argument(
+            "--changed-ids",
+            type=str,
+            help="Write the ids of inserted and updated matches to this file",
+        )
 
     def import_venues(self, api_instance: cfbd.VenuesApi) -> None:
         """
@@ -115,18 +264,23 @@ class Command(BaseCommand):
         *,
         conference: str | None = None,
         year: int | None = None,
-    ) -> None:
+    ) -> UpsertCounts:
         """
         Fetch team data and related records from CFBD.
 
         Steps:
         1. Call :func:`TeamsApi.get_teams` with optional ``conference`` and
            ``year``.
-        2. Create or update :class:`Team` instances, including venue and
-           conference links.
-        3. Store associated :class:`TeamLogo` and
-           :class:`TeamAlternativeName` records.
-        4. Output a status line for every processed team.
+        2. Build :class:`Team` instances, including venue and conference
+           links and unique slugs, and :func:`upsert` them.
+        3. Sync the associated :class:`TeamLogo` and
+           :class:`TeamAlternativeName` records of every fetched team with
+           :func:`sync_children`, removing ones the payload no longer lists.
+        4. Output a status line for every processed team and the counts of
+           changed rows.
+
+        All writes run in one transaction, with a number of queries that does
+        not depend on the number of teams.
         """
         teams_response = api_instance.get_teams(
             conference=conference, year=year
@@ -150,6 +304,16 @@ class Command(BaseCommand):
         # dictionary directly for ID lookups.
         venues_by_id = Venue.objects.in_bulk()
 
+        # Slugs are allocated in memory against every stored slug, so new
+        # and renamed teams never need a uniqueness query each.
+        slugs = dict(Team.objects.values_list("id", "slug"))
+        taken = set(slugs.values())
+
+        # The response is iterated once, so it may be a streamed dump.
+        teams = []
+        logos = {}
+        alternate_names = {}
+        labels = []
         for team in teams_response:
             conference_obj = None
             if team.conference:
@@ -157,38 +321,44 @@ class Command(BaseCommand):
                     team.conference
                 ) or conferences_by_name.get(team.conference)
 
-            new_team, _ = Team.objects.update_or_create(
+            new_team = Team(
                 id=team.id,
-                defaults={
-                    "school": team.school,
-                    "mascot": team.mascot or "",
-                    "abbreviation": team.abbreviation or "",
-                    "conference": conference_obj,
-                    "classification": team.classification or "",
-                    "color": team.color,
-                    "alternate_color": team.alternate_color,
-                    "twitter": team.twitter or "",
-                    "location": (
-                        venues_by_id.get(team.location.id)
-                        if team.location and team.location.id
-                        else None
-                    ),
-                },
+                school=team.school,
+                mascot=team.mascot or "",
+                abbreviation=team.abbreviation or "",
+                slug=slugs.get(team.id, ""),
+                conference=conference_obj,
+                classification=team.classification or "",
+                color=team.color,
+                alternate_color=team.alternate_color,
+                twitter=team.twitter or "",
+                location=(
+                    venues_by_id.get(team.location.id)
+                    if team.location and team.location.id
+                    else None
+                ),
             )
-            for logo in team.logos or []:
-                TeamLogo.objects.update_or_create(
-                    team=new_team,
-                    url=logo,
-                )
-            for alt_name in team.alternate_names or []:
-                TeamAlternativeName.objects.update_or_create(
-                    team=new_team,
-                    name=alt_name,
-                )
-            self.stdout.write(
-                f"Team {team.school} ({team.abbreviation}) "
-                "imported/updated successfully."
+            new_team.assign_slug(taken.__contains__)
+            taken.add(new_team.slug)
+            teams.append(new_team)
+            logos[team.id] = team.logos or []
+            alternate_names[team.id] = team.alternate_names or []
+            labels.append(f"{team.school} ({team.abbreviation})")
+
+        with transaction.atomic():
+            counts = upsert(teams, TEAM_FIELDS)
+            logo_counts = sync_children(TeamLogo, "team", "url", logos)
+            name_counts = sync_children(
+                TeamAlternativeName, "team", "name", alternate_names
             )
+        for label in labels:
+            self.stdout.write(f"Team {label} imported/updated successfully.")
+        self.stdout.write(
+            f"Teams: {counts}; logos: {logo_counts[0]} added, "
+            f"{logo_counts[1]} removed; alternative names: {name_counts[0]} "
+            f"added, {name_counts[1]} removed."
+        )
+        return counts
 
     def import_games(
         self,
@@ -196,16 +366,32 @@ class Command(BaseCommand):
         *,
         start_year: int,
         end_year: int,
-    ) -> None:
+        concurrency: int = 1,
+        delta: bool = False,
+        available: Collection[int] | None = None,
+    ) -> UpsertCounts:
         """
         Fetch game data and store it using the :class:`Match` model.
 
         Steps:
-        1. Loop over the supplied year range and call
-           :func:`GamesApi.get_games`.
-        2. ``update_or_create`` each :class:`Match` instance linking teams,
-           venues, and conferences where possible.
-        3. Output a status line for every processed game.
+        1. Call :func:`GamesApi.get_games` for every season of the supplied
+           year range, up to ``concurrency`` seasons at a time. With
+           ``delta``, seasons whose :class:`ImportState` is settled are not
+           fetched, and when ``available`` is given, only the seasons it
+           holds are. A season whose request still fails with
+           :class:`ApiException` is reported and skipped, leaving its
+           :class:`ImportState` untouched, and the import goes on.
+        2. Build a :class:`Match` instance for every game, linking teams,
+           venues, and conferences where possible, and :func:`upsert` each
+           season in one transaction together with its
+           :class:`ImportState`. Seasons are written on the calling thread
+           in year order. With ``delta``, a season whose payload digest is
+           unchanged is not written.
+        3. Output a status line for every processed game and the number of
+           matches inserted, updated and left unchanged.
+
+        The ids of inserted and updated matches are collected in
+        ``changed_match_ids`` and the skipped seasons in ``failed_seasons``.
         """
         # Preload related objects for efficient lookup during import
         teams_by_id = Team.objects.in_bulk()
@@ -218,70 +404,274 @@ class Command(BaseCommand):
             c.name: c for c in conferences.values() if c.name
         }
 
-        for season in range(start_year, end_year + 1):
-            games_response = api_instance.get_games(
-                year=season, season_type=cfbd.SeasonType.BOTH
+        states = ImportState.objects.in_bulk(field_name="season")
+        seasons = self._game_seasons(
+            states, start_year, end_year, delta=delta, available=available
+        )
+        if delta:
+            self.stdout.write(
+                f"Delta import of {len(seasons)} unsettled seasons."
             )
+        self.changed_match_ids: list[int] = []
+        self.failed_seasons: list[int] = []
+
+        def fetch_season(season: int) -> list | ApiException:
+            try:
+                return api_instance.get_games(
+                    year=season, season_type=cfbd.SeasonType.BOTH
+                )
+            except ApiException as e:
+                return e
+
+        responses = fetch_in_order(
+            fetch_season, seasons, concurrency=concurrency
+        )
+        totals = UpsertCounts()
+        for season, games_response in responses:
+            if isinstance(games_response, ApiException):
+                self.failed_seasons.append(season)
+                self.stderr.write(
+                    f"Season {season} games failed: "
+                    f"({games_response.status}) {games_response.reason}\n"
+                )
+                continue
+            # Each response is iterated once, so it may be a streamed dump.
+            matches = []
+            labels = []
             for game in games_response:
+                labels.append(f"{game.home_team} vs {game.away_team}")
                 start_date = game.start_date
                 if timezone.is_naive(start_date):
                     start_date = timezone.make_aware(start_date)
-                Match.objects.update_or_create(
-                    id=game.id,
-                    defaults={
-                        "season": game.season,
-                        "week": game.week,
-                        "season_type": game.season_type.value,
-                        "start_date": start_date,
-                        "completed": game.completed,
-                        "venue": venues_by_id.get(game.venue_id),
-                        "neutral_site": game.neutral_site,
-                        "attendance": game.attendance,
-                        "home_team": teams_by_id.get(game.home_id),
-                        "home_classification": (
+                matches.append(
+                    Match(
+                        id=game.id,
+                        season=game.season,
+                        week=game.week,
+                        season_type=game.season_type.value,
+                        start_date=start_date,
+                        completed=game.completed,
+                        venue=venues_by_id.get(game.venue_id),
+                        neutral_site=game.neutral_site,
+                        attendance=game.attendance,
+                        home_team=teams_by_id.get(game.home_id),
+                        home_classification=(
                             game.home_classification.value
                             if game.home_classification
                             else ""
                         ),
-                        "home_conference": conferences_by_abbrev.get(
+                        home_conference=conferences_by_abbrev.get(
                             game.home_conference
                         )
                         or conferences_by_name.get(game.home_conference),
-                        "home_score": game.home_points,
-                        "away_team": teams_by_id.get(game.away_id),
-                        "away_classification": (
+                        home_score=game.home_points,
+                        away_team=teams_by_id.get(game.away_id),
+                        away_classification=(
                             game.away_classification.value
                             if game.away_classification
                             else ""
                         ),
-                        "away_conference": conferences_by_abbrev.get(
+                        away_conference=conferences_by_abbrev.get(
                             game.away_conference
                         )
                         or conferences_by_name.get(game.away_conference),
-                        "away_score": game.away_points,
-                    },
+                        away_score=game.away_points,
+                    )
+                )
+            payload_hash = digest_matches(
+                (match.id, *(getattr(match, name) for name in MATCH_ATTNAMES))
+                for match in matches
+            )
+            state = states.get(season)
+            if delta and state and state.payload_hash == payload_hash:
+                counts = UpsertCounts(unchanged=len(matches))
+                ImportState.objects.filter(pk=state.pk).update(
+                    imported_at=timezone.now()
                 )
                 self.stdout.write(
-                    f"Match {game.home_team} vs {game.away_team} ({season}) "
-                    "imported/updated successfully."
+                    f"Season {season} games: payload unchanged, "
+                    f"{len(matches)} skipped."
                 )
+            else:
+                with transaction.atomic():
+                    counts = upsert(
+                        matches,
+                        MATCH_FIELDS,
+                        changed_pks=self.changed_match_ids,
+                    )
+                    ImportState.objects.update_or_create(
+                        season=season,
+                        defaults={
+                            "imported_at": timezone.now(),
+                            "payload_hash": payload_hash,
+                            "game_count": len(matches),
+                            "completed_count": sum(
+                                match.completed for match in matches
+                            ),
+                        },
+                    )
+                for label in labels:
+                    self.stdout.write(
+                        f"Match {label} ({season}) imported/updated "
+                        "successfully."
+                    )
+                self.stdout.write(f"Season {season} games: {counts}.")
+            totals = totals.plus(counts)
+        self.stdout.write(f"Games: {totals}.")
+        if self.failed_seasons:
+            self.stderr.write(
+                f"Skipped {len(self.failed_seasons)} failed seasons: "
+                f"{', '.join(map(str, self.failed_seasons))}\n"
+            )
+        return totals
+
+    @staticmethod
+    def _game_seasons(
+        states: dict[int, ImportState],
+        start_year: int,
+        end_year: int,
+        *,
+        delta: bool,
+        available: Collection[int] | None = None,
+    ) -> list[int]:
+        """
+        Return the seasons to fetch games for.
+
+        Seasons missing from ``available``, when given, and with ``delta``
+        settled seasons are skipped.
+        """
+        seasons = range(start_year, end_year + 1)
+        if available is not None:
+            seasons = [season for season in seasons if season in available]
+        if not delta:
+            return list(seasons)
+        latest = current_season()
+        return [
+            season
+            for season in seasons
+            if season not in states or not states[season].is_settled(latest)
+        ]
+
+    def _write_changed_ids(self, path: str | None) -> None:
+        """Report the changed matches and write their ids to ``path``."""
+        ids = sorted(set(self.changed_match_ids))
+        self.stdout.write(f"{len(ids)} matches changed.")
+        if path:
+            Path(path).write_text(json.dumps(ids))
+            self.stdout.write(f"Wrote changed match ids to {path}.")
 
     def handle(self, *args: str, **options: int | str | None) -> None:
         """Execute the import process."""
         load_dotenv()
+        offline = options.get("offline", False)
+        source = options.get("source") and DumpApi(options["source"])
         api_key = os.environ.get("CFBD_API_KEY")
-        if not api_key:
+        if not api_key and not offline and not source:
             raise CommandError("CFBD_API_KEY environment variable not set")
+        if source and (options.get("conference") or options.get("year")):
+            raise CommandError(
+                "--conference and --year filter API requests and cannot be "
+                "used with --source"
+            )
+
+        concurrency = options.get("concurrency", 1)
+        if concurrency < 1:
+            raise CommandError("concurrency must be at least 1")
+        queue_size = options.get("queue_size", PIPELINE_QUEUE_SIZE)
+        if queue_size < 1:
+            raise CommandError("queue size must be at least 1")
+        retries = options.get("retries", 3)
+        if retries < 0:
+            raise CommandError("retries must not be negative")
+        rate_limit = options.get("rate_limit", RATE_LIMIT)
+        client = ResilientClient(
+            limiter=(
+                TokenBucket(rate_limit, options.get("burst", RATE_BURST))
+                if rate_limit > 0
+                else None
+            ),
+            retries=retries,
+            backoff=options.get("backoff", 1.0),
+        )
+
+        cache = None
+        # Dumps are read locally and never cached.
+        if source or options.get("no_cache", False):
+            if offline:
+                raise CommandError("--offline needs the response cache")
+        else:
+            cache = ResponseCache(
+                options.get("cache_dir") or settings.CFBD_CACHE_DIR,
+                offline=offline,
+            )
+
+        start_year = options.get("start_year")
+        end_year = options.get("end_year")
+        # Only seasons present in the dump can be imported.
+        available = set(source.seasons()) if source else None
 
         configuration = cfbd.Configuration(access_token=api_key)
+        # Keep a pooled connection for every fetching thread.
+        configuration.connection_pool_maxsize = max(
+            configuration.connection_pool_maxsize, concurrency
+        )
 
+        self.changed_match_ids = []
         with cfbd.ApiClient(configuration) as api_client:
-            venues_api_instance = cfbd.VenuesApi(api_client)
-            teams_api_instance = cfbd.TeamsApi(api_client)
-            conferences_api_instance = cfbd.ConferencesApi(api_client)
-            games_api_instance = cfbd.GamesApi(api_client)
+
+            def api(api_class: type) -> object:
+                if source:
+                    return source
+                instance = client.wrap(api_class(api_client))
+                return CachedApi(instance, cache) if cache else instance
+
+            venues_api_instance = api(cfbd.VenuesApi)
+            teams_api_instance = api(cfbd.TeamsApi)
+            conferences_api_instance = api(cfbd.ConferencesApi)
+            games_api_instance = api(cfbd.GamesApi)
             total_start = time.perf_counter()
 
+            pipeline = None
+            if options.get("pipeline", False):
+                seasons = self._game_seasons(
+                    ImportState.objects.in_bulk(field_name="season"),
+                    start_year,
+                    end_year,
+                    delta=options.get("delta", False),
+                    available=available,
+                )
+                pipeline = FetchPipeline(
+                    [
+                        pipeline_task(venues_api_instance, "get_venues"),
+                        pipeline_task(
+                            conferences_api_instance, "get_conferences"
+                        ),
+                        pipeline_task(
+                            teams_api_instance,
+                            "get_teams",
+                            conference=options.get("conference"),
+                            year=options.get("year"),
+                        ),
+                        *(
+                            pipeline_task(
+                                games_api_instance,
+                                "get_games",
+                                year=season,
+                                season_type=cfbd.SeasonType.BOTH,
+                            )
+                            for season in seasons
+                        ),
+                    ],
+                    workers=concurrency,
+                    queue_size=queue_size,
+                )
+                venues_api_instance = pipeline.wrap(venues_api_instance)
+                conferences_api_instance = pipeline.wrap(
+                    conferences_api_instance
+                )
+                teams_api_instance = pipeline.wrap(teams_api_instance)
+                games_api_instance = pipeline.wrap(games_api_instance)
+
             try:
                 step_start = time.perf_counter()
                 self.import_venues(venues_api_instance)
@@ -311,16 +701,34 @@ class Command(BaseCommand):
                 step_start = time.perf_counter()
                 self.import_games(
                     games_api_instance,
-                    start_year=options.get("start_year"),
-                    end_year=options.get("end_year"),
+                    start_year=start_year,
+                    end_year=end_year,
+                    # The pipeline already fetches seasons in parallel.
+                    concurrency=1 if pipeline else concurrency,
+                    delta=options.get("delta", False),
+                    available=available,
                 )
                 self.stdout.write(
                     f"Games import completed in "
                     f"{time.perf_counter() - step_start:.2f} seconds"
                 )
+                self._write_changed_ids(options.get("changed_ids"))
             except ApiException as e:
                 self.stderr.write(f"Exception when calling CFBD API: {e}\n")
+            except OfflineCacheError as e:
+                self.stderr.write(f"Offline import stopped: {e}\n")
+            except SourceError as e:
+                self.stderr.write(f"File import stopped: {e}\n")
             finally:
+                if pipeline:
+                    pipeline.close()
+                    self.stdout.write(f"Pipeline: {pipeline.stats.summary()}")
+                self.stdout.write(f"API client: {client.summary()}")
+                if cache:
+                    self.stdout.write(
+                        f"Response cache: {cache.hits} hits, "
+                        f"{cache.misses} misses"
+                    )
                 total_elapsed = time.perf_counter() - total_start
                 self.stdout.write(
                     f"Total import completed in {total_elapsed:.2f} seconds"
@@ -1,13 +1,64 @@
 """Management command to calculate Elo ratings for matches."""
 
 import argparse
+import resource
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import groupby
+from operator import attrgetter
+from typing import NamedTuple
 
+import numpy as np
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
 
+from core.bulk import BulkWriter, bulk_transaction
+from core.models.current_rating import TeamCurrentRating
 from core.models.elo import EloRating
+from core.models.enums import RatingSystem
 from core.models.match import Match
-from libs.constants import ELO_DECAY_DEFAULT, ELO_DEFAULT_RATING, ELO_K_FACTOR
-from libs.elo import update_ratings
+from core.models.rating_period import (
+    RatingPeriod,
+    digest_matches,
+    first_changed_period,
+)
+from core.models.team import Team
+from libs.checkpoint import CheckpointStore
+from libs.constants import (
+    ELO_DECAY_DEFAULT,
+    ELO_DEFAULT_RATING,
+    ELO_HOME_ADVANTAGE,
+    ELO_K_FACTOR,
+    ELO_SCORE_DIFFERENTIAL_BASE,
+)
+from libs.elo import update_ratings_batch
+
+# Matches rated between writes; each match produces two rating rows.
+ELO_CHUNK_SIZE = 5_000
+
+
+def peak_rss_mib() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class EloMatch(NamedTuple):
+    """Completed match as streamed from the database."""
+
+    season: int
+    week: int
+    id: int
+    start_date: datetime
+    home_team_id: int
+    away_team_id: int
+    home_score: int
+    away_score: int
+    neutral_site: bool
 
 
 class Command(BaseCommand):
@@ -28,90 +79,321 @@ class Command(BaseCommand):
                 "(0 for full reset, 1 for no decay)."
             ),
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=ELO_CHUNK_SIZE,
+            help=(
+                "Number of matches rated between database writes; each "
+                "season is also written as it ends."
+            ),
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Recompute only from the earliest week whose matches were "
+                "added or changed since the last run."
+            ),
+        )
+        parser.add_argument(
+            "--checkpoint",
+            action="store_true",
+            help="Save every team's rating at the end of each season.",
+        )
+        parser.add_argument(
+            "--checkpoint-dir",
+            default=None,
+            help=(
+                "Directory for season checkpoints "
+                "(default: the RATING_CHECKPOINT_DIR setting)."
+            ),
+        )
+        parser.add_argument(
+            "--resume-from",
+            type=int,
+            help=(
+                "Recompute from this season using the checkpoint saved at "
+                "the end of the previous season."
+            ),
+        )
 
-    def _decay_ratings(self, ratings: dict[int, float], decay: float) -> None:
+    @staticmethod
+    def _decayed(ratings: np.ndarray, decay: float) -> np.ndarray:
+        """Return ``ratings`` moved toward the baseline for a new season."""
+        if decay == 0:
+            return np.full_like(ratings, ELO_DEFAULT_RATING)
+        return ratings * decay + ELO_DEFAULT_RATING * (1 - decay)
+
+    def _decay_ratings(self, decay: float) -> None:
         """Adjust ratings toward the baseline when the season changes."""
-        for team_id, rating in ratings.items():
-            ratings[team_id] = (
-                ELO_DEFAULT_RATING
-                if decay == 0
-                else rating * decay + ELO_DEFAULT_RATING * (1 - decay)
-            )
+        self._ratings = self._decayed(self._ratings, decay)
 
     def handle(self, *args: str, **options: int | str | None) -> None:  # noqa: D401
         """Run the Elo rating calculation."""
         decay = float(options.get("decay", ELO_DECAY_DEFAULT))
         if not 0 <= decay <= 1:
             raise CommandError("decay must be between 0 and 1")
+        chunk_size = options.get("chunk_size", ELO_CHUNK_SIZE)
+        if chunk_size < 1:
+            raise CommandError("chunk size must be positive")
 
-        self.stdout.write("Clearing existing Elo ratings...")
-        EloRating.objects.all().delete()
+        resume_from = options.get("resume_from")
+        incremental = options.get("incremental", False)
+        if incremental and resume_from is not None:
+            raise CommandError(
+                "--incremental cannot be combined with --resume-from"
+            )
+        save_checkpoints = options.get("checkpoint", False)
+        checkpoints = CheckpointStore(
+            options.get("checkpoint_dir") or settings.RATING_CHECKPOINT_DIR,
+            "elo",
+            {
+                "k_factor": self.k_factor,
+                "decay": decay,
+                "default_rating": ELO_DEFAULT_RATING,
+                "home_advantage": ELO_HOME_ADVANTAGE,
+                "score_differential_base": ELO_SCORE_DIFFERENTIAL_BASE,
+            },
+        )
+        self._verbose = options.get("verbosity", 1) >= 1
+        self._names: dict[int, str] | None = None
+        self._team_ids: list[int] = []
+        self._index: dict[int, int] = {}
+        self._ratings = np.empty(0, dtype=np.float64)
 
-        self.stdout.write("Calculating Elo ratings...")
-        current_ratings: dict[int, float] = {}
-        rating_records: list[EloRating] = []
+        current_season: int | None = None
+        start: tuple[int, int] | None = None
+        if incremental:
+            start = first_changed_period(RatingSystem.ELO, self._match_stream())
+            if start is None:
+                self.stdout.write("Elo ratings are up to date.")
+                return
+            current_season = self._restore_ratings(*start, decay)
+            if current_season is None:
+                start = None
+        elif resume_from is not None:
+            current_season = self._load_checkpoint(checkpoints, resume_from)
+            start = (resume_from, 0)
 
-        matches = Match.objects.filter(completed=True).order_by(
-            "season", "week", "start_date", "id"
+        if start is None:
+            self.stdout.write("Clearing existing Elo ratings...")
+            EloRating.objects.all().delete()
+            RatingPeriod.objects.filter(system=RatingSystem.ELO).delete()
+        else:
+            week_label = f" week {start[1]}" if start[1] else ""
+            self.stdout.write(
+                f"Clearing Elo ratings from season {start[0]}{week_label}..."
+            )
+            EloRating.objects.filter(
+                Q(match__season__gt=start[0])
+                | Q(match__season=start[0], match__week__gte=start[1])
+            ).delete()
+            RatingPeriod.objects.filter(
+                Q(season__gt=start[0]) | Q(season=start[0], week__gte=start[1]),
+                system=RatingSystem.ELO,
+            ).delete()
+
+        self.stdout.write("Calculating Elo ratings...")
+        writer = BulkWriter(
+            EloRating,
+            ("team_id", "match_id", "rating_before", "rating_after"),
+            batch_size=2 * chunk_size,
         )
+        self._periods = BulkWriter(
+            RatingPeriod, ("system", "season", "week", "match_count", "digest")
+        )
+        started = time.perf_counter()
+        for season, season_matches in groupby(
+            self._match_stream(start), key=attrgetter("season")
+        ):
+            if current_season is not None and season != current_season:
+                if save_checkpoints:
+                    self._save_checkpoint(checkpoints, current_season)
+                self._decay_ratings(decay)
+            current_season = season
+            with bulk_transaction():
+                for _, week_matches in groupby(
+                    season_matches, key=attrgetter("week")
+                ):
+                    self._rate_week(list(week_matches), writer)
+                writer.flush()
+                self._periods.flush()
 
-        current_season: int | None = None
+        if save_checkpoints and current_season is not None:
+            self._save_checkpoint(checkpoints, current_season)
 
-        for match in matches:
-            if current_season is None:
-                current_season = match.season
-            elif match.season != current_season:
-                current_season = match.season
-                self._decay_ratings(current_ratings, decay)
+        TeamCurrentRating.objects.refresh(RatingSystem.ELO)
+        elapsed = time.perf_counter() - started
+        rate = writer.rows_written / elapsed if elapsed else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {writer.rows_written} Elo ratings in {elapsed:.1f}s "
+                f"({rate:,.0f} rows/s, peak RSS {peak_rss_mib():.0f} MiB)."
+            )
+        )
 
-            home_before = current_ratings.get(
-                match.home_team_id, ELO_DEFAULT_RATING
+    @staticmethod
+    def _match_stream(
+        start: tuple[int, int] | None = None,
+    ) -> Iterator[EloMatch]:
+        """Stream scored matches from ``start`` on in rating order."""
+        matches = Match.objects.filter(
+            completed=True, home_score__isnull=False, away_score__isnull=False
+        )
+        if start is not None:
+            matches = matches.filter(
+                Q(season__gt=start[0]) | Q(season=start[0], week__gte=start[1])
             )
-            away_before = current_ratings.get(
-                match.away_team_id, ELO_DEFAULT_RATING
+        return map(
+            EloMatch._make,
+            matches.order_by("season", "week", "start_date", "id")
+            .values_list(*EloMatch._fields)
+            .iterator(),
+        )
+
+    def _restore_ratings(
+        self, season: int, week: int, decay: float
+    ) -> int | None:
+        """
+        Seed ratings as they stood before ``season``/``week``.
+
+        Each team starts from its latest stored ``rating_after``, decayed
+        once for every later season up to the last stored one, as a full
+        run would have. Returns that season, or ``None`` when nothing is
+        stored before the given week.
+        """
+        rows = list(
+            EloRating.objects.filter(
+                Q(match__season__lt=season)
+                | Q(match__season=season, match__week__lt=week)
             )
+            .latest_by_team()
+            .order_by("team_id")
+            .values_list("team_id", "match__season", "rating_after")
+        )
+        if not rows:
+            return None
 
-            if (
-                match.home_score is None or match.away_score is None
-            ):  # pragma: no cover
-                # skip matches without scores
-                continue
-
-            home_after, away_after = update_ratings(
-                home_before,
-                away_before,
-                match.home_score,
-                match.away_score,
-                k_factor=self.k_factor,
-                neutral_site=match.neutral_site,
+        team_ids, team_seasons, ratings = zip(*rows, strict=True)
+        last_season = max(team_seasons)
+        seasons = list(
+            Match.objects.filter(
+                completed=True,
+                home_score__isnull=False,
+                away_score__isnull=False,
+                season__lte=last_season,
             )
+            .order_by("season")
+            .values_list("season", flat=True)
+            .distinct()
+        )
+        missed = len(seasons) - np.searchsorted(
+            seasons, team_seasons, side="right"
+        )
+        self._team_ids = list(team_ids)
+        self._index = {team_id: idx for idx, team_id in enumerate(team_ids)}
+        self._ratings = np.array(ratings, dtype=np.float64)
+        for applied in range(missed.max()):
+            stale = missed > applied
+            self._ratings[stale] = self._decayed(self._ratings[stale], decay)
+        return last_season
 
-            self.stdout.write(
-                f"{match.home_team.school}: "
-                f"{home_before:.2f} -> {home_after:.2f}, "
-                f"{match.away_team.school}: {away_before:.2f} -> "
-                f"{away_after:.2f}"
+    def _team_index(self, team_id: int) -> int:
+        """Return the dense index of ``team_id``, adding it if unseen."""
+        idx = self._index.get(team_id)
+        if idx is None:
+            idx = self._index[team_id] = len(self._team_ids)
+            self._team_ids.append(team_id)
+        return idx
+
+    def _team_name(self, team_id: int) -> str:
+        """Return the school of ``team_id``, loading every name once."""
+        if self._names is None:
+            self._names = dict(Team.objects.values_list("id", "school"))
+        return self._names[team_id]
+
+    def _rate_week(self, matches: list[EloMatch], writer: BulkWriter) -> None:
+        """Rate a week of ``matches`` and queue both teams' rating rows."""
+        home = [self._team_index(match.home_team_id) for match in matches]
+        away = [self._team_index(match.away_team_id) for match in matches]
+        added = len(self._team_ids) - len(self._ratings)
+        if added:
+            self._ratings = np.concatenate(
+                (self._ratings, np.full(added, float(ELO_DEFAULT_RATING)))
             )
 
-            rating_records.append(
-                EloRating(
-                    team_id=match.home_team_id,
-                    match_id=match.id,
-                    rating_before=home_before,
-                    rating_after=home_after,
-                )
+        results = update_ratings_batch(
+            self._ratings,
+            home,
+            away,
+            [match.home_score for match in matches],
+            [match.away_score for match in matches],
+            [match.neutral_site for match in matches],
+            k_factor=self.k_factor,
+        )
+
+        self._periods.add(
+            (
+                RatingSystem.ELO,
+                matches[0].season,
+                matches[0].week,
+                len(matches),
+                digest_matches(match[2:] for match in matches),
             )
-            rating_records.append(
-                EloRating(
-                    team_id=match.away_team_id,
-                    match_id=match.id,
-                    rating_before=away_before,
-                    rating_after=away_after,
+        )
+
+        for match, home_before, away_before, home_after, away_after in zip(
+            matches, *(values.tolist() for values in results), strict=True
+        ):
+            if self._verbose:
+                self.stdout.write(
+                    f"{self._team_name(match.home_team_id)}: "
+                    f"{home_before:.2f} -> {home_after:.2f}, "
+                    f"{self._team_name(match.away_team_id)}: "
+                    f"{away_before:.2f} -> {away_after:.2f}"
                 )
-            )
+            writer.add((match.home_team_id, match.id, home_before, home_after))
+            writer.add((match.away_team_id, match.id, away_before, away_after))
 
-            current_ratings[match.home_team_id] = home_after
-            current_ratings[match.away_team_id] = away_after
+    def _save_checkpoint(
+        self, checkpoints: CheckpointStore, season: int
+    ) -> None:
+        """Write the end-of-season ratings of ``season``."""
+        path = checkpoints.save(
+            season,
+            {
+                "team_ids": np.array(self._team_ids, dtype=np.int64),
+                "rating": self._ratings,
+            },
+        )
+        self.stdout.write(f"Saved checkpoint {path}.")
 
-        if rating_records:
-            EloRating.objects.bulk_create(rating_records, batch_size=500)
+    def _load_checkpoint(
+        self, checkpoints: CheckpointStore, season: int
+    ) -> int:
+        """Load the ratings at the end of the previous season and return it."""
+        prev_season = (
+            Match.objects.filter(completed=True, season__lt=season)
+            .order_by("-season")
+            .values_list("season", flat=True)
+            .first()
+        )
+        arrays = (
+            checkpoints.load(prev_season) if prev_season is not None else None
+        )
+        if arrays is None:
+            available = ", ".join(map(str, checkpoints.seasons()))
+            raise CommandError(
+                f"No checkpoint for the season before {season} in "
+                f"{checkpoints.directory} (available: {available or 'none'})"
+            )
+        self.stdout.write(
+            f"Resuming from the end-of-season {prev_season} checkpoint..."
+        )
+        self._team_ids = arrays["team_ids"].tolist()
+        self._ratings = arrays["rating"]
+        self._index = {
+            team_id: idx for idx, team_id in enumerate(self._team_ids)
+        }
+        return prev_season
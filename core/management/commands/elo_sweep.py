@@ -0,0 +1,271 @@
+"""Management command to tune Elo hyperparameters on match history."""
+
+import argparse
+import time
+from collections.abc import Iterable
+from itertools import groupby, product
+from operator import attrgetter
+from typing import NamedTuple
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from core.management.commands.elo import Command as EloCommand
+from core.management.commands.elo import EloMatch
+from core.models.match import Match
+from libs.constants import (
+    ELO_DECAY_DEFAULT,
+    ELO_DEFAULT_RATING,
+    ELO_HOME_ADVANTAGE,
+    ELO_K_FACTOR,
+    ELO_SCORE_DIFFERENTIAL_BASE,
+    PROBABILITY_EPSILON,
+)
+from libs.elo import sub_rounds
+
+
+class SweepParams(NamedTuple):
+    """One point of the Elo hyperparameter grid."""
+
+    k_factor: float
+    home_advantage: float
+    decay: float
+    base: float
+
+
+class SweepResult(NamedTuple):
+    """Predictive scores of one configuration."""
+
+    params: SweepParams
+    games: int
+    log_loss: float
+    brier: float
+
+
+class EloGrid:
+    """
+    Elo ratings of many configurations, advanced together.
+
+    ``ratings`` is a (configurations x teams) matrix; team columns are added
+    as teams first appear. Each game is predicted with the ratings as they
+    stood before it and the predictions of scored games are accumulated
+    per configuration. The power and logarithm use NumPy, so ratings can
+    differ from the ``elo`` command in the last bits.
+    """
+
+    def __init__(self, grid: list[SweepParams]) -> None:
+        """Start every configuration of ``grid`` from the default rating."""
+        self.grid = grid
+        k_factor, home_advantage, decay, base = np.array(
+            grid, dtype=np.float64
+        ).T.reshape(4, -1, 1)
+        self._k_factor = k_factor
+        self._home_advantage = home_advantage
+        self._decay = decay
+        self._log_base = np.log(base)
+        self.index: dict[int, int] = {}
+        self.ratings = np.empty((len(grid), 0), dtype=np.float64)
+        self.games = 0
+        self._log_loss = np.zeros(len(grid))
+        self._brier = np.zeros(len(grid))
+
+    def decay(self) -> None:
+        """Move every rating toward the baseline between seasons."""
+        self.ratings = self.ratings * self._decay + ELO_DEFAULT_RATING * (
+            1 - self._decay
+        )
+
+    def rate_week(self, matches: list[EloMatch], *, score: bool) -> None:
+        """Rate a week of ``matches``, scoring the predictions if asked."""
+        for match in matches:
+            for team_id in (match.home_team_id, match.away_team_id):
+                self.index.setdefault(team_id, len(self.index))
+        added = len(self.index) - self.ratings.shape[1]
+        if added:
+            self.ratings = np.hstack(
+                (
+                    self.ratings,
+                    np.full((len(self.grid), added), float(ELO_DEFAULT_RATING)),
+                )
+            )
+
+        home = np.array([self.index[m.home_team_id] for m in matches])
+        away = np.array([self.index[m.away_team_id] for m in matches])
+        diff = np.array([m.home_score - m.away_score for m in matches])
+        outcome = np.where(diff > 0, 1.0, np.where(diff < 0, 0.0, 0.5))
+        home_field = np.array([not m.neutral_site for m in matches])
+        log_margin = np.log(np.abs(diff) + 1)
+
+        rounds = sub_rounds(home, away)
+        for level in range(rounds.max() + 1):
+            games = np.flatnonzero(rounds == level)
+            h, a = home[games], away[games]
+            home_rating, away_rating = self.ratings[:, h], self.ratings[:, a]
+            advantage = self._home_advantage * home_field[games]
+            p = 1 / (
+                1 + 10 ** ((away_rating - (home_rating + advantage)) / 400)
+            )
+            if score:
+                self._score(p, outcome[games])
+            change = (self._k_factor * log_margin[games] / self._log_base) * (
+                outcome[games] - p
+            )
+            self.ratings[:, h] = home_rating + change
+            self.ratings[:, a] = away_rating - change
+
+    def _score(self, p: np.ndarray, outcome: np.ndarray) -> None:
+        """Add the log-loss and Brier score of predictions ``p``."""
+        p = np.clip(p, PROBABILITY_EPSILON, 1 - PROBABILITY_EPSILON)
+        self._log_loss -= (
+            outcome * np.log(p) + (1 - outcome) * np.log(1 - p)
+        ).sum(axis=1)
+        self._brier += np.square(p - outcome).sum(axis=1)
+        self.games += len(outcome)
+
+    def results(self) -> list[SweepResult]:
+        """Return the mean scores of every configuration."""
+        if not self.games:
+            return [
+                SweepResult(params, 0, np.nan, np.nan) for params in self.grid
+            ]
+        return [
+            SweepResult(params, self.games, log_loss, brier)
+            for params, log_loss, brier in zip(
+                self.grid,
+                (self._log_loss / self.games).tolist(),
+                (self._brier / self.games).tolist(),
+                strict=True,
+            )
+        ]
+
+
+def evaluate(
+    grid: list[SweepParams], matches: Iterable[EloMatch], score_from: int
+) -> EloGrid:
+    """Replay ``matches`` once for every configuration of ``grid``."""
+    ratings = EloGrid(grid)
+    seen_season = False
+    for season, season_matches in groupby(matches, key=attrgetter("season")):
+        if seen_season:
+            ratings.decay()
+        seen_season = True
+        for _, week_matches in groupby(season_matches, key=attrgetter("week")):
+            ratings.rate_week(list(week_matches), score=season >= score_from)
+    return ratings
+
+
+class Command(BaseCommand):
+    """Score a grid of Elo hyperparameters without writing ratings."""
+
+    help = (
+        "Evaluate Elo hyperparameter combinations by predictive log-loss "
+        "and Brier score in a single pass over the matches"
+    )
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--k-factor",
+            type=float,
+            nargs="+",
+            default=[ELO_K_FACTOR],
+            help="K-factor values to try.",
+        )
+        parser.add_argument(
+            "--home-advantage",
+            type=float,
+            nargs="+",
+            default=[ELO_HOME_ADVANTAGE],
+            help="Home-field advantage values, in rating points.",
+        )
+        parser.add_argument(
+            "--decay",
+            type=float,
+            nargs="+",
+            default=[ELO_DECAY_DEFAULT],
+            help="Fractions of a rating carried over between seasons.",
+        )
+        parser.add_argument(
+            "--base",
+            type=float,
+            nargs="+",
+            default=[ELO_SCORE_DIFFERENTIAL_BASE],
+            help="Logarithm bases scaling the score differential.",
+        )
+        parser.add_argument(
+            "--score-from",
+            type=int,
+            help=(
+                "First season whose games are scored; earlier seasons only "
+                "warm up the ratings. Defaults to the second season."
+            ),
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Number of ranked configurations to print.",
+        )
+
+    def handle(self, *args: str, **options: object) -> None:
+        """Run the hyperparameter sweep."""
+        k_factors = options.get("k_factor") or [ELO_K_FACTOR]
+        home_advantages = options.get("home_advantage") or [ELO_HOME_ADVANTAGE]
+        decays = options.get("decay") or [ELO_DECAY_DEFAULT]
+        bases = options.get("base") or [ELO_SCORE_DIFFERENTIAL_BASE]
+        top = options.get("top") or 20
+
+        if min(k_factors) <= 0:
+            raise CommandError("k-factor values must be positive")
+        if not all(0 <= decay <= 1 for decay in decays):
+            raise CommandError("decay values must be between 0 and 1")
+        if min(bases) <= 1:
+            raise CommandError("base values must be greater than 1")
+
+        seasons = list(
+            Match.objects.filter(completed=True)
+            .order_by("season")
+            .values_list("season", flat=True)
+            .distinct()
+        )
+        score_from = options.get("score_from")
+        if score_from is None:
+            score_from = seasons[1] if len(seasons) > 1 else None
+        if score_from is None or not any(s >= score_from for s in seasons):
+            raise CommandError("No completed matches to score")
+
+        grid = [
+            SweepParams(*values)
+            for values in product(k_factors, home_advantages, decays, bases)
+        ]
+        self.stdout.write(
+            f"Evaluating {len(grid)} configurations, scoring from season "
+            f"{score_from}..."
+        )
+
+        started = time.perf_counter()
+        ratings = evaluate(grid, EloCommand._match_stream(), score_from)
+        elapsed = time.perf_counter() - started
+
+        results = sorted(
+            ratings.results(),
+            key=lambda result: (result.log_loss, result.brier),
+        )
+        self.stdout.write(
+            f"{'Rank':>4}  {'K':>6}  {'Home':>6}  {'Decay':>6}  "
+            f"{'Base':>6}  {'Games':>6}  {'Log-loss':>8}  {'Brier':>7}"
+        )
+        for rank, result in enumerate(results[:top], start=1):
+            params = result.params
+            self.stdout.write(
+                f"{rank:>4}  {params.k_factor:>6.2f}  "
+                f"{params.home_advantage:>6.1f}  {params.decay:>6.3f}  "
+                f"{params.base:>6.2f}  {result.games:>6}  "
+                f"{result.log_loss:>8.5f}  {result.brier:>7.5f}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Evaluated {len(grid)} configurations on {ratings.games} "
+                f"scored games in {elapsed:.1f}s."
+            )
+        )
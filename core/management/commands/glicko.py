@@ -1,23 +1,72 @@
 """Management command to calculate Glicko ratings for each team."""
 
+import argparse
 import math
-from typing import Optional
+from itertools import groupby
+from operator import attrgetter
 
-from django.core.management.base import BaseCommand
-from django.db.models import Avg, F, QuerySet
-from django.db.models.functions import Abs
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
 
-from core.models.enums import DivisionClassification
+from core.bulk import BulkWriter, bulk_transaction
+from core.models.current_rating import TeamCurrentRating
+from core.models.enums import RatingSystem
 from core.models.glicko import GlickoRating
 from core.models.match import Match
+from core.models.rating_period import (
+    MATCH_DIGEST_FIELDS,
+    RatingPeriod,
+    digest_matches,
+    first_changed_period,
+)
 from core.models.team import Team
+from core.ratings import (
+    Edge,
+    MatchRow,
+    TeamMeta,
+    calculate_home_field_bonus,
+    calculate_margin_weight_cap,
+    process_match,
+    season_matches,
+    weighted_outcomes,
+)
+from libs.checkpoint import CheckpointStore
 from libs.constants import (
+    CONVERGENCE_TOLERANCE,
     DEFAULT_RATING,
     DEFAULT_RD,
+    DEFAULT_VOLATILITY,
     DIVISION_BASE_RATINGS,
     DIVISION_BASE_RDS,
+    HOME_FIELD_SCALE,
+    MARGIN_WEIGHT_CAP_MULTIPLIER,
+    TAU,
+)
+from libs.glicko2 import (
+    Player,
+    SolverStats,
+    inflate_rd,
+    update_ratings_batch,
+)
+from libs.rating_state import TeamRatingState
+
+# Columns written for each rating row, in the order of the row tuples.
+RATING_FIELDS = (
+    "team_id",
+    "season",
+    "week",
+    "classification",
+    "conference_id",
+    "previous_rating",
+    "previous_rd",
+    "previous_vol",
+    "rating",
+    "rd",
+    "vol",
+    "active",
 )
-from libs.glicko2 import Player
 
 
 class Command(BaseCommand):
@@ -25,104 +74,431 @@ class Command(BaseCommand):
 
     help = "Calculate Glicko ratings for each team in each week"
 
+    engine = "batch"
+    sparse = False
+    sparse_threshold: float | None = None
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--engine",
+            choices=["batch", "scalar"],
+            default="batch",
+            help=(
+                "Rate each week with the vectorized batch updater or the "
+                "reference per-team Player implementation."
+            ),
+        )
+        parser.add_argument(
+            "--from-season",
+            type=int,
+            help=(
+                "Keep ratings before this season and recompute from it, "
+                "starting from the stored ratings of the preceding week."
+            ),
+        )
+        parser.add_argument(
+            "--from-week",
+            type=int,
+            help="First week of --from-season to recompute.",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Recompute from the earliest week whose completed matches "
+                "changed since the last run."
+            ),
+        )
+        parser.add_argument(
+            "--sparse",
+            action="store_true",
+            help=(
+                "Store a rating row only for teams that played in the week "
+                "instead of every team rated in the season."
+            ),
+        )
+        parser.add_argument(
+            "--sparse-threshold",
+            type=float,
+            help=(
+                "With --sparse, also store idle teams whose rating or RD "
+                "moved more than this since their last stored row."
+            ),
+        )
+        parser.add_argument(
+            "--checkpoint",
+            action="store_true",
+            help="Save each team's state at the end of every season.",
+        )
+        parser.add_argument(
+            "--checkpoint-dir",
+            default=None,
+            help=(
+                "Directory for season checkpoints "
+                "(default: the RATING_CHECKPOINT_DIR setting)."
+            ),
+        )
+        parser.add_argument(
+            "--resume-from",
+            type=int,
+            help=(
+                "Recompute from this season using the checkpoint saved at "
+                "the end of the previous season."
+            ),
+        )
+
     def handle(self, *args: str, **options: int | str | None) -> None:
         """Run the Glicko rating calculation."""
-        self.stdout.write("Clearing existing ratings...")
-        GlickoRating.objects.all().delete()
+        self.engine = options.get("engine") or self.engine
+        from_season = options.get("from_season")
+        from_week = options.get("from_week")
+        incremental = options.get("incremental", False)
+        self.sparse = options.get("sparse", False)
+        self.sparse_threshold = options.get("sparse_threshold")
+        self._stored: dict[int, tuple[float, float]] = {}
+        self._season_totals: dict[int, list[tuple[float, int]]] = {}
+        self._ratings = BulkWriter(
+            GlickoRating, RATING_FIELDS, ignore_conflicts=True
+        )
+        resume_from = options.get("resume_from")
+        self._checkpoints = CheckpointStore(
+            options.get("checkpoint_dir") or settings.RATING_CHECKPOINT_DIR,
+            "glicko",
+            self._checkpoint_params(),
+        )
+
+        if from_week is not None and from_season is None:
+            raise CommandError("--from-week requires --from-season")
+        if incremental and from_season is not None:
+            raise CommandError(
+                "--incremental cannot be combined with --from-season"
+            )
+        if self.sparse_threshold is not None and not self.sparse:
+            raise CommandError("--sparse-threshold requires --sparse")
+        if resume_from is not None and (incremental or from_season):
+            raise CommandError(
+                "--resume-from cannot be combined with --from-season "
+                "or --incremental"
+            )
+
+        start: tuple[int, int] | None = None
+        if incremental:
+            start = self._find_first_changed_period()
+            if start is None:
+                self.stdout.write("Glicko ratings are up to date.")
+                return
+        elif from_season is not None:
+            start = (from_season, from_week or 0)
+
+        state = TeamRatingState()
+        season_active_teams: set[int] = set()
+        team_meta: TeamMeta = {}
+        if resume_from is not None:
+            state = self._load_checkpoint(resume_from)
+            start = (resume_from, 0)
+            restored = (season_active_teams, team_meta)
+        else:
+            restored = self._restore_state(state, *start) if start else None
+        if restored is None:
+            start = None
+            self.stdout.write("Clearing existing ratings...")
+            GlickoRating.objects.all().delete()
+            RatingPeriod.objects.filter(system=RatingSystem.GLICKO).delete()
+        else:
+            season_active_teams, team_meta = restored
+            week_label = f" week {start[1]}" if start[1] else ""
+            self.stdout.write(
+                f"Clearing ratings from season {start[0]}{week_label}..."
+            )
+            later = Q(season__gt=start[0]) | Q(
+                season=start[0], week__gte=start[1]
+            )
+            GlickoRating.objects.filter(later).delete()
+            RatingPeriod.objects.filter(
+                later, system=RatingSystem.GLICKO
+            ).delete()
+            if resume_from is None:
+                self._load_season_totals(start[0])
 
         self.stdout.write("Calculating Glicko ratings...")
 
-        players: dict[int, Player] = {}
-        seasons = list(
-            Match.objects.order_by("season")
-            .values_list("season", flat=True)
-            .distinct()
-        )
+        seasons = Match.objects.order_by("season")
+        if start:
+            seasons = seasons.filter(season__gte=start[0])
+        seasons = list(seasons.values_list("season", flat=True).distinct())
 
         last_active_teams: set[int] = set()
-        for season in seasons:
-            last_active_teams = self._process_season(season, players)
+        for season, matches, prev_matches in season_matches(seasons):
+            if start and season == start[0]:
+                last_active_teams = self._process_season(
+                    season,
+                    matches,
+                    prev_matches,
+                    state,
+                    start_week=start[1],
+                    season_active_teams=season_active_teams,
+                    team_meta=team_meta,
+                )
+            else:
+                last_active_teams = self._process_season(
+                    season, matches, prev_matches, state
+                )
+            if matches and options.get("checkpoint"):
+                self._save_checkpoint(season, state)
 
-        if players and seasons:
+        if state and seasons:
             Team.objects.bulk_update(
                 [
                     Team(id=team_id, active=(team_id in last_active_teams))
-                    for team_id in players
+                    for team_id in state.team_ids
                 ],
                 fields=["active"],
             )
+        TeamCurrentRating.objects.refresh(RatingSystem.GLICKO)
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    @staticmethod
-    def _get_player(
-        players: dict[int, Player],
-        team_id: int,
-        division: Optional[DivisionClassification],
-    ) -> Player:
-        """Retrieve or create a :class:`Player` for the given team."""
-        player = players.get(team_id)
-        if player is None:
-            rating = DIVISION_BASE_RATINGS.get(division, DEFAULT_RATING)
-            rd = DIVISION_BASE_RDS.get(division, DEFAULT_RD)
-            player = Player(rating=rating, rd=rd)
-            players[team_id] = player
-        return player
+    def _load_season_totals(self, season: int) -> None:
+        """Load the stored weekly totals of ``season`` and the one before."""
+        for row_season, rating_sum, team_count in RatingPeriod.objects.filter(
+            system=RatingSystem.GLICKO,
+            season__in=[season - 1, season],
+        ).values_list("season", "rating_sum", "team_count"):
+            self._season_totals.setdefault(row_season, []).append(
+                (rating_sum, team_count)
+            )
+
+    def _checkpoint_params(self) -> dict[str, object]:
+        """Return the parameters that determine the engine's state."""
+        return {
+            "engine": self.engine,
+            "tau": TAU,
+            "convergence_tolerance": CONVERGENCE_TOLERANCE,
+            "default_rating": DEFAULT_RATING,
+            "default_rd": DEFAULT_RD,
+            "default_volatility": DEFAULT_VOLATILITY,
+            "division_base_ratings": DIVISION_BASE_RATINGS,
+            "division_base_rds": DIVISION_BASE_RDS,
+            "margin_cap": MARGIN_WEIGHT_CAP_MULTIPLIER,
+            "home_scale": HOME_FIELD_SCALE,
+        }
+
+    def _save_checkpoint(self, season: int, state: TeamRatingState) -> None:
+        """Write the end-of-season state of ``season``."""
+        totals = self._season_totals.get(season, [])
+        stored = list(self._stored.items())
+        path = self._checkpoints.save(
+            season,
+            {
+                **state.to_arrays(),
+                "season_rating_sums": np.array(
+                    [rating_sum for rating_sum, _ in totals], dtype=np.float64
+                ),
+                "season_team_counts": np.array(
+                    [count for _, count in totals], dtype=np.int64
+                ),
+                "stored_team_ids": np.array(
+                    [team_id for team_id, _ in stored], dtype=np.int64
+                ),
+                "stored_values": np.array(
+                    [values for _, values in stored], dtype=np.float64
+                ).reshape(-1, 2),
+            },
+        )
+        self.stdout.write(f"  Saved checkpoint {path}.")
+
+    def _load_checkpoint(self, season: int) -> TeamRatingState:
+        """Return the state saved at the end of the season before ``season``."""
+        prev_season = (
+            Match.objects.filter(completed=True, season__lt=season)
+            .order_by("-season")
+            .values_list("season", flat=True)
+            .first()
+        )
+        arrays = (
+            self._checkpoints.load(prev_season)
+            if prev_season is not None
+            else None
+        )
+        if arrays is None:
+            available = ", ".join(map(str, self._checkpoints.seasons()))
+            raise CommandError(
+                f"No checkpoint for the season before {season} in "
+                f"{self._checkpoints.directory} "
+                f"(available: {available or 'none'})"
+            )
+
+        self.stdout.write(
+            f"Resuming from the end-of-season {prev_season} checkpoint..."
+        )
+        self._season_totals[prev_season] = list(
+            zip(
+                arrays["season_rating_sums"].tolist(),
+                arrays["season_team_counts"].tolist(),
+                strict=True,
+            )
+        )
+        self._stored = {
+            team_id: tuple(values)
+            for team_id, values in zip(
+                arrays["stored_team_ids"].tolist(),
+                arrays["stored_values"].tolist(),
+                strict=True,
+            )
+        }
+        return TeamRatingState.from_arrays(arrays)
+
+    def _season_average(self, season: int) -> float | None:
+        """Return the average rating of the teams rated in ``season``."""
+        totals = self._season_totals.get(season, [])
+        team_count = sum(count for _, count in totals)
+        if not team_count:
+            return None
+        return math.fsum(rating_sum for rating_sum, _ in totals) / team_count
+
+    def _find_first_changed_period(self) -> tuple[int, int] | None:
+        """Return the earliest season and week whose matches changed."""
+        return first_changed_period(
+            RatingSystem.GLICKO,
+            Match.objects.filter(completed=True).values_list(
+                "season", "week", *MATCH_DIGEST_FIELDS
+            ),
+        )
+
+    def _restore_state(
+        self, state: TeamRatingState, season: int, week: int
+    ) -> tuple[set[int], TeamMeta] | None:
+        """
+        Load team state as it stood before ``season``/``week``.
+
+        Each team is seeded from its latest stored rating and the period it
+        was stored for, so the RD inflation of any later periods it sat out
+        is applied when the team is next synced. Returns
+        the active teams and team metadata of ``season`` so far, or ``None``
+        when there is nothing stored to resume from.
+        """
+        earlier = GlickoRating.objects.filter(
+            Q(season__lt=season) | Q(season=season, week__lt=week)
+        )
+        preceding = (
+            earlier.order_by("-season", "-week")
+            .values_list("season", "week")
+            .first()
+        )
+        if preceding is None:
+            return None
+
+        periods = {
+            period: ordinal
+            for ordinal, period in enumerate(
+                RatingPeriod.objects.filter(system=RatingSystem.GLICKO)
+                .filter(
+                    Q(season__lt=preceding[0])
+                    | Q(season=preceding[0], week__lte=preceding[1])
+                )
+                .order_by("season", "week")
+                .values_list("season", "week")
+            )
+        }
+        rows = list(
+            GlickoRating.objects.as_of(*preceding)
+            .order_by("team_id")
+            .values_list(
+                "team_id",
+                "season",
+                "week",
+                "rating",
+                "rd",
+                "vol",
+                "classification",
+                "conference_id",
+            )
+        )
+        if any((row[1], row[2]) not in periods for row in rows):
+            self.stdout.write(
+                "Stored ratings predate period tracking; "
+                "recomputing from the first season."
+            )
+            return None
+
+        season_active_teams: set[int] = set()
+        team_meta: TeamMeta = {}
+        for team_id, row_season, row_week, rating, rd, vol, cls, conf in rows:
+            period = periods[(row_season, row_week)] + 1
+            state.add(team_id, rating, rd, vol, period=period)
+            self._stored[team_id] = (rating, rd)
+            if row_season == season:
+                season_active_teams.add(team_id)
+                team_meta[team_id] = (cls, conf)
+        state.period = periods[preceding] + 1
+
+        return season_active_teams, team_meta
 
     def _process_season(
-        self, season: int, players: dict[int, Player]
+        self,
+        season: int,
+        matches: list[MatchRow],
+        prev_matches: list[MatchRow],
+        state: TeamRatingState,
+        *,
+        start_week: int | None = None,
+        season_active_teams: set[int] | None = None,
+        team_meta: TeamMeta | None = None,
     ) -> set[int]:
-        """Process all matches for a single season."""
-        matches_qs = Match.objects.filter(season=season, completed=True)
-        if matches_qs.count() == 0:
+        """
+        Process all matches for a single season.
+
+        When resuming part way through a season, ``start_week`` is the first
+        week to process and ``season_active_teams``/``team_meta`` carry what
+        the earlier weeks established.
+        """
+        if not matches:
             self.stdout.write(
                 f"No matches found for season {season}. Skipping..."
             )
             return set()
 
-        prev_season = season - 1
-        prev_matches_qs = Match.objects.filter(
-            season=prev_season, completed=True
-        )
-        prev_season_avg_rating = GlickoRating.objects.filter(
-            season=prev_season
-        ).aggregate(avg_rating=Avg("rating"))["avg_rating"]
-
-        home_field_bonus = self._calculate_home_field_bonus(
-            prev_matches_qs, prev_season_avg_rating
+        home_field_bonus = calculate_home_field_bonus(
+            prev_matches, self._season_average(season - 1)
         )
-        margin_weight_cap = self._calculate_margin_weight_cap(prev_matches_qs)
+        margin_weight_cap = calculate_margin_weight_cap(prev_matches)
 
-        weeks = list(
-            matches_qs.order_by("week")
-            .values_list("week", flat=True)
-            .distinct()
-        )
+        weeks = [
+            (week, list(week_matches))
+            for week, week_matches in groupby(
+                (m for m in matches if m.week >= (start_week or 0)),
+                key=attrgetter("week"),
+            )
+        ]
         self.stdout.write(
             f"Processing season {season}... "
-            f"{matches_qs.count()} matches found across "
+            f"{len(matches)} matches found across "
             f"{len(weeks)} weeks."
         )
 
-        season_active_teams: set[int] = set()
-        team_meta: dict[int, tuple[Optional[str], Optional[int]]] = {}
-        for week in weeks:
-            week_matches = matches_qs.filter(week=week).order_by("start_date")
-            self.stdout.write(
-                f"  Processing week {week}... "
-                f"{week_matches.count()} matches found."
-            )
-            self._process_week(
-                season,
-                week,
-                week_matches,
-                players,
-                home_field_bonus,
-                margin_weight_cap,
-                season_active_teams,
-                team_meta,
-            )
+        season_active_teams = (
+            set() if season_active_teams is None else season_active_teams
+        )
+        team_meta = {} if team_meta is None else team_meta
+        with bulk_transaction():
+            for week, week_matches in weeks:
+                self.stdout.write(
+                    f"  Processing week {week}... "
+                    f"{len(week_matches)} matches found."
+                )
+                self._process_week(
+                    season,
+                    week,
+                    week_matches,
+                    state,
+                    home_field_bonus,
+                    margin_weight_cap,
+                    season_active_teams,
+                    team_meta,
+                )
+            self._ratings.flush()
 
         return season_active_teams
 
@@ -130,23 +506,23 @@ class Command(BaseCommand):
         self,
         season: int,
         week: int,
-        week_matches: QuerySet,
-        players: dict[int, Player],
+        week_matches: list[MatchRow],
+        state: TeamRatingState,
         home_field_bonus: float,
         margin_weight_cap: float,
         season_active_teams: set[int],
-        team_meta: dict[int, tuple[Optional[str], Optional[int]]],
+        team_meta: TeamMeta,
     ) -> None:
         """Process all matches for a given week."""
-        results: dict[int, list[tuple[float, float, float, float]]] = {}
-        week_meta: dict[int, tuple[Optional[str], Optional[int]]] = {}
+        edges: list[Edge] = []
+        week_meta: TeamMeta = {}
 
         for match in week_matches:
-            self._process_match(
+            process_match(
                 match,
-                players,
+                state,
                 home_field_bonus,
-                results,
+                edges,
                 season_active_teams,
                 week_meta,
             )
@@ -156,150 +532,180 @@ class Command(BaseCommand):
         self._update_ratings(
             season,
             week,
-            players,
-            results,
+            state,
+            edges,
             margin_weight_cap,
             team_meta,
             season_active_teams,
         )
+        rated = [state.index[team_id] for team_id in team_meta]
+        rating_sum = math.fsum(state.rating[rated].tolist())
+        self._season_totals.setdefault(season, []).append(
+            (rating_sum, len(rated))
+        )
+        RatingPeriod.objects.create(
+            system=RatingSystem.GLICKO,
+            season=season,
+            week=week,
+            match_count=len(week_matches),
+            digest=digest_matches(match[2:] for match in week_matches),
+            rating_sum=rating_sum,
+            team_count=len(rated),
+        )
 
-    def _process_match(
+    def _update_ratings(
         self,
-        match: Match,
-        players: dict[int, Player],
-        home_field_bonus: float,
-        results: dict[int, list[tuple[float, float, float, float]]],
+        season: int,
+        week: int,
+        state: TeamRatingState,
+        edges: list[Edge],
+        margin_weight_cap: float,
+        team_meta: TeamMeta,
         season_active_teams: set[int],
-        week_meta: dict[int, tuple[Optional[str], Optional[int]]],
     ) -> None:
-        """Record the result of a single match."""
-        home_division = (
-            DivisionClassification(match.home_classification)
-            if match.home_classification
-            else None
+        """
+        Update team ratings from match results.
+
+        Only the teams that played this week or already have a rating this
+        season are touched; every other team is left for
+        :meth:`TeamRatingState.sync` to catch up when it plays again. In
+        sparse mode idle teams only get a row when they moved more than
+        ``sparse_threshold`` since their last stored row.
+        """
+        arr = np.array(edges, dtype=np.float64).reshape(-1, 5)
+        rated = [state.index[team_id] for team_id in team_meta]
+        active = np.union1d(arr[:, 0].astype(np.intp), rated).astype(np.intp)
+        state.sync(active)
+
+        edge_team = np.searchsorted(active, arr[:, 0])
+        prev = (state.rating[active], state.rd[active], state.vol[active])
+        rate = (
+            self._rate_period_scalar
+            if self.engine == "scalar"
+            else self._rate_period_batch
         )
-        home_team = self._get_player(players, match.home_team_id, home_division)
+        new = rate(*prev, edge_team, arr[:, 1:], margin_weight_cap)
+        state.rating[active], state.rd[active], state.vol[active] = new
+        state.advance(active)
+
+        prev_rating, prev_rd, prev_vol = (a.tolist() for a in prev)
+        rating, rd, vol = (a.tolist() for a in new)
+        position = dict(zip(active.tolist(), range(len(active)), strict=True))
+        played = np.zeros(len(active), dtype=bool)
+        played[edge_team] = True
+        played = played.tolist()
+
+        for team_id, (classification, conference_id) in team_meta.items():
+            pos = position[state.index[team_id]]
+            if self.sparse:
+                if not played[pos] and not self._moved(
+                    team_id, rating[pos], rd[pos]
+                ):
+                    continue
+                self._stored[team_id] = (rating[pos], rd[pos])
+            self._ratings.add(
+                (
+                    team_id,
+                    season,
+                    week,
+                    classification,
+                    conference_id,
+                    prev_rating[pos],
+                    prev_rd[pos],
+                    prev_vol[pos],
+                    rating[pos],
+                    rd[pos],
+                    vol[pos],
+                    team_id in season_active_teams,
+                )
+            )
 
-        away_division = (
-            DivisionClassification(match.away_classification)
-            if match.away_classification
-            else None
+    def _moved(self, team_id: int, rating: float, rd: float) -> bool:
+        """Return whether an idle team drifted past the sparse threshold."""
+        if self.sparse_threshold is None:
+            return False
+        stored = self._stored.get(team_id)
+        return (
+            stored is None
+            or abs(rating - stored[0]) > self.sparse_threshold
+            or abs(rd - stored[1]) > self.sparse_threshold
         )
-        away_team = self._get_player(players, match.away_team_id, away_division)
-
-        season_active_teams.update([match.home_team_id, match.away_team_id])
 
-        week_meta[match.home_team_id] = (
-            match.home_classification,
-            match.home_conference_id,
+    def _rate_period_batch(
+        self,
+        rating: np.ndarray,
+        rd: np.ndarray,
+        vol: np.ndarray,
+        edge_team: np.ndarray,
+        games: np.ndarray,
+        margin_weight_cap: float,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Rate the active teams with :func:`update_ratings_batch`."""
+        opp_rating, opp_rd, log_margin, outcome = games.T
+
+        stats = SolverStats()
+        weighted = weighted_outcomes(
+            rating[edge_team],
+            opp_rating,
+            log_margin,
+            outcome,
+            margin_weight_cap,
         )
-        week_meta[match.away_team_id] = (
-            match.away_classification,
-            match.away_conference_id,
+        result = update_ratings_batch(
+            rating,
+            rd,
+            vol,
+            edge_team,
+            opp_rating,
+            opp_rd,
+            weighted,
+            stats=stats,
         )
-
-        home_team_outcome = 0.5
-        if match.home_score > match.away_score:
-            home_team_outcome = 1
-        elif match.home_score < match.away_score:
-            home_team_outcome = 0
-        away_team_outcome = 1 - home_team_outcome
-
-        margin = abs(match.home_score - match.away_score)
-        log_margin = math.log(margin + 1)
-
-        if match.neutral_site:
-            home_rating = home_team.rating
-            away_rating = away_team.rating
-        else:
-            home_rating = home_team.rating + home_field_bonus / 2
-            away_rating = away_team.rating - home_field_bonus / 2
-
-        results.setdefault(match.home_team_id, []).append(
-            (away_rating, away_team.rd, log_margin, home_team_outcome)
+        message = (
+            f"    Volatility solver: {stats.teams} teams, "
+            f"at most {stats.max_iterations} iterations, "
+            f"{stats.max_iter_hits} max-iteration hits."
         )
-        results.setdefault(match.away_team_id, []).append(
-            (home_rating, home_team.rd, log_margin, away_team_outcome)
+        self.stdout.write(
+            self.style.WARNING(message) if stats.max_iter_hits else message
         )
+        return result
 
-    def _update_ratings(
+    def _rate_period_scalar(
         self,
-        season: int,
-        week: int,
-        players: dict[int, Player],
-        results: dict[int, list[tuple[float, float, float, float]]],
+        rating: np.ndarray,
+        rd: np.ndarray,
+        vol: np.ndarray,
+        edge_team: np.ndarray,
+        games: np.ndarray,
         margin_weight_cap: float,
-        team_meta: dict[int, tuple[Optional[str], Optional[int]]],
-        season_active_teams: set[int],
-    ) -> None:
-        """Update player ratings from match results."""
-        ratings = []
-        for player_id, player in players.items():
-            before_rating = player.rating
-            before_rd = player.rd
-            before_vol = player.vol
-
-            recs = results.get(player_id, [])
-            if recs:
-                r_list = [r for r, _, _, _ in recs]
-                rd_list = [rd for _, rd, _, _ in recs]
-                log_cap = math.log(margin_weight_cap + 1)
-                o_list = []
-                for r, _, lm, o in recs:
-                    rating_diff = abs(before_rating - r)
-                    denom = rating_diff * 0.001 + 2.2
-                    max_factor = log_cap * 2.2 / denom
-                    factor = min(lm * 2.2 / denom, max_factor) / max_factor
-                    o_list.append(0.5 + (o - 0.5) * factor)
-                player.update_player(r_list, rd_list, o_list)
-            else:
-                player.did_not_compete()
-
-            classification, conference_id = team_meta.get(
-                player_id, (None, None)
-            )
-
-            ratings.append(
-                GlickoRating(
-                    team_id=player_id,
-                    season=season,
-                    week=week,
-                    classification=classification,
-                    conference_id=conference_id,
-                    previous_rating=before_rating,
-                    previous_rd=before_rd,
-                    previous_vol=before_vol,
-                    rating=player.rating,
-                    rd=player.rd,
-                    vol=player.vol,
-                    active=player_id in season_active_teams,
-                )
-            )
-
-        if ratings:
-            GlickoRating.objects.bulk_create(
-                ratings, batch_size=500, ignore_conflicts=True
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Rate the active teams one :class:`Player` at a time."""
+        results: dict[int, list[tuple[float, float, float, float]]] = {}
+        for idx, rec in zip(edge_team.tolist(), games.tolist(), strict=True):
+            results.setdefault(idx, []).append(tuple(rec))
+
+        rating, rd, vol = rating.copy(), rd.copy(), vol.copy()
+        idle = np.ones(len(rating), dtype=bool)
+        idle[list(results)] = False
+        rd[idle] = inflate_rd(rd[idle], vol[idle])
+
+        log_cap = math.log(margin_weight_cap + 1)
+        for idx, recs in results.items():
+            player = Player(rating=rating[idx], rd=rd[idx], vol=vol[idx])
+            r_list = [r for r, _, _, _ in recs]
+            rd_list = [d for _, d, _, _ in recs]
+            o_list = []
+            for r, _, lm, o in recs:
+                rating_diff = abs(player.rating - r)
+                denom = rating_diff * 0.001 + 2.2
+                max_factor = log_cap * 2.2 / denom
+                factor = min(lm * 2.2 / denom, max_factor) / max_factor
+                o_list.append(0.5 + (o - 0.5) * factor)
+            player.update_player(r_list, rd_list, o_list)
+            rating[idx], rd[idx], vol[idx] = (
+                player.rating,
+                player.rd,
+                player.vol,
             )
-
-    @staticmethod
-    def _calculate_home_field_bonus(
-        prev_matches_qs: QuerySet, prev_season_avg_rating: float
-    ) -> float:
-        """Calculate the home field advantage bonus."""
-        non_neutral_matches = prev_matches_qs.filter(neutral_site=False)
-        total_non_neutral_matches = non_neutral_matches.count()
-        if total_non_neutral_matches > 0:
-            home_wins = non_neutral_matches.filter(
-                home_score__gt=F("away_score")
-            ).count()
-            home_win_percent = home_wins / total_non_neutral_matches
-            return (home_win_percent - 0.5) * prev_season_avg_rating
-        return 0
-
-    @staticmethod
-    def _calculate_margin_weight_cap(prev_matches_qs: QuerySet) -> float:
-        """Calculate the margin of victory weight cap."""
-        prev_season_avg_margin = prev_matches_qs.aggregate(
-            avg_margin=Avg(Abs(F("home_score") - F("away_score")))
-        )["avg_margin"]
-        return prev_season_avg_margin * 1.5 if prev_season_avg_margin else 1.5
+        return rating, rd, vol
@@ -0,0 +1,318 @@
+"""Management command to tune Glicko hyperparameters on match history."""
+
+import argparse
+import math
+import os
+import time
+from itertools import groupby, product
+from operator import attrgetter
+from typing import NamedTuple
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models.match import Match
+from core.ratings import (
+    Edge,
+    MatchRow,
+    TeamMeta,
+    calculate_home_field_bonus,
+    calculate_margin_weight_cap,
+    process_match,
+    season_matches,
+    weighted_outcomes,
+)
+from core.workers import model_pool
+from libs.constants import (
+    HOME_FIELD_SCALE,
+    MARGIN_WEIGHT_CAP_MULTIPLIER,
+    PROBABILITY_EPSILON,
+    TAU,
+)
+from libs.glicko2 import update_ratings_batch, win_probability
+from libs.rating_state import TeamRatingState
+
+# Each season with its own and the previous season's completed matches.
+History = list[tuple[int, list[MatchRow], list[MatchRow]]]
+
+# Shared with pool workers by the initializer so the history is sent once
+# per process rather than once per configuration.
+_worker_context: dict[str, object] = {}
+
+
+class SweepParams(NamedTuple):
+    """One point of the hyperparameter grid."""
+
+    tau: float
+    margin_cap: float
+    home_scale: float
+
+
+class SweepResult(NamedTuple):
+    """Predictive scores of one configuration."""
+
+    params: SweepParams
+    games: int
+    log_loss: float
+    brier: float
+
+
+def evaluate(
+    params: SweepParams,
+    history: History,
+    score_from: int,
+    state: TeamRatingState | None = None,
+) -> SweepResult:
+    """
+    Replay ``history`` with ``params`` and score the weekly predictions.
+
+    Every game from ``score_from`` onward is predicted with the ratings as
+    they stood before its week was rated, then the week is rated exactly as
+    the ``glicko`` command would, without writing anything to the database.
+    """
+    state = TeamRatingState() if state is None else state
+    season_totals: dict[int, list[tuple[float, int]]] = {}
+    log_losses: list[float] = []
+    briers: list[float] = []
+
+    for season, matches, prev_matches in history:
+        if not matches:
+            continue
+        totals = season_totals.get(season - 1, [])
+        team_count = sum(count for _, count in totals)
+        prev_avg = (
+            math.fsum(rating_sum for rating_sum, _ in totals) / team_count
+            if team_count
+            else None
+        )
+        home_field_bonus = calculate_home_field_bonus(
+            prev_matches, prev_avg, params.home_scale
+        )
+        margin_weight_cap = calculate_margin_weight_cap(
+            prev_matches, params.margin_cap
+        )
+
+        season_active_teams: set[int] = set()
+        team_meta: TeamMeta = {}
+        for _, week_matches in groupby(matches, key=attrgetter("week")):
+            edges: list[Edge] = []
+            week_meta: TeamMeta = {}
+            for match in week_matches:
+                process_match(
+                    match,
+                    state,
+                    home_field_bonus,
+                    edges,
+                    season_active_teams,
+                    week_meta,
+                )
+            team_meta.update(week_meta)
+            games = np.array(edges, dtype=np.float64).reshape(-1, 5)
+
+            if season >= score_from:
+                log_loss, brier = _score_week(games)
+                log_losses.extend(log_loss.tolist())
+                briers.extend(brier.tolist())
+
+            rated = [state.index[team_id] for team_id in team_meta]
+            _rate_week(state, games, rated, margin_weight_cap, params.tau)
+            season_totals.setdefault(season, []).append(
+                (math.fsum(state.rating[rated].tolist()), len(rated))
+            )
+
+    if not log_losses:
+        return SweepResult(params, 0, math.nan, math.nan)
+    return SweepResult(
+        params,
+        len(log_losses),
+        math.fsum(log_losses) / len(log_losses),
+        math.fsum(briers) / len(briers),
+    )
+
+
+def _score_week(games: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the log-loss and Brier score of each home team's prediction."""
+    # Edges come in (home, away) pairs; each edge carries the opponent's
+    # home-adjusted rating and RD.
+    home, away = games[0::2], games[1::2]
+    p = win_probability(away[:, 1], away[:, 2], home[:, 1], home[:, 2])
+    p = np.clip(p, PROBABILITY_EPSILON, 1 - PROBABILITY_EPSILON)
+    outcome = home[:, 4]
+    log_loss = -(outcome * np.log(p) + (1 - outcome) * np.log(1 - p))
+    return log_loss, np.square(p - outcome)
+
+
+def _rate_week(
+    state: TeamRatingState,
+    games: np.ndarray,
+    rated: list[int],
+    margin_weight_cap: float,
+    tau: float,
+) -> None:
+    """Rate the teams that played or have a rating this season."""
+    active = np.union1d(games[:, 0].astype(np.intp), rated).astype(np.intp)
+    state.sync(active)
+    edge_team = np.searchsorted(active, games[:, 0])
+    rating, rd, vol = state.rating[active], state.rd[active], state.vol[active]
+    weighted = weighted_outcomes(
+        rating[edge_team],
+        games[:, 1],
+        games[:, 3],
+        games[:, 4],
+        margin_weight_cap,
+    )
+    state.rating[active], state.rd[active], state.vol[active] = (
+        update_ratings_batch(
+            rating,
+            rd,
+            vol,
+            edge_team,
+            games[:, 1],
+            games[:, 2],
+            weighted,
+            tau=tau,
+        )
+    )
+    state.advance(active)
+
+
+def _init_worker(history: History, score_from: int) -> None:
+    """Store the shared match history in a pool worker."""
+    _worker_context["history"] = history
+    _worker_context["score_from"] = score_from
+
+
+def _evaluate_in_worker(params: SweepParams) -> SweepResult:
+    """Evaluate ``params`` against the history stored by the initializer."""
+    return evaluate(
+        params, _worker_context["history"], _worker_context["score_from"]
+    )
+
+
+class Command(BaseCommand):
+    """Score a grid of Glicko hyperparameters without writing ratings."""
+
+    help = (
+        "Evaluate Glicko hyperparameter combinations by predictive log-loss "
+        "and Brier score"
+    )
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--tau",
+            type=float,
+            nargs="+",
+            default=[TAU],
+            help="Glicko-2 system constant values to try.",
+        )
+        parser.add_argument(
+            "--margin-cap",
+            type=float,
+            nargs="+",
+            default=[MARGIN_WEIGHT_CAP_MULTIPLIER],
+            help=(
+                "Margin weight cap multipliers, applied to the previous "
+                "season's average margin."
+            ),
+        )
+        parser.add_argument(
+            "--home-scale",
+            type=float,
+            nargs="+",
+            default=[HOME_FIELD_SCALE],
+            help="Scales applied to the home-field bonus.",
+        )
+        parser.add_argument(
+            "--score-from",
+            type=int,
+            help=(
+                "First season whose games are scored; earlier seasons only "
+                "warm up the ratings. Defaults to the second season."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Number of ranked configurations to print.",
+        )
+
+    def handle(self, *args: str, **options: object) -> None:
+        """Run the hyperparameter sweep."""
+        taus = options.get("tau") or [TAU]
+        margin_caps = options.get("margin_cap") or [
+            MARGIN_WEIGHT_CAP_MULTIPLIER
+        ]
+        home_scales = options.get("home_scale") or [HOME_FIELD_SCALE]
+        workers = options.get("workers") or 1
+        top = options.get("top") or 20
+
+        if min(taus) <= 0 or min(margin_caps) <= 0:
+            raise CommandError("tau and margin cap values must be positive")
+
+        seasons = list(
+            Match.objects.order_by("season")
+            .values_list("season", flat=True)
+            .distinct()
+        )
+        history = list(season_matches(seasons))
+        played = [season for season, matches, _ in history if matches]
+        score_from = options.get("score_from")
+        if score_from is None:
+            score_from = played[1] if len(played) > 1 else None
+        if score_from is None or not any(s >= score_from for s in played):
+            raise CommandError("No completed matches to score")
+
+        grid = [
+            SweepParams(*values)
+            for values in product(taus, margin_caps, home_scales)
+        ]
+        self.stdout.write(
+            f"Evaluating {len(grid)} configurations on "
+            f"{sum(len(m) for _, m, _ in history)} matches, scoring from "
+            f"season {score_from}..."
+        )
+
+        started = time.perf_counter()
+        results = self._run(grid, history, score_from, workers)
+        elapsed = time.perf_counter() - started
+
+        results.sort(key=lambda result: (result.log_loss, result.brier))
+        self.stdout.write(
+            f"{'Rank':>4}  {'Tau':>6}  {'Cap':>6}  {'Home':>6}  "
+            f"{'Games':>6}  {'Log-loss':>8}  {'Brier':>7}"
+        )
+        for rank, result in enumerate(results[:top], start=1):
+            params = result.params
+            self.stdout.write(
+                f"{rank:>4}  {params.tau:>6.3f}  {params.margin_cap:>6.3f}  "
+                f"{params.home_scale:>6.3f}  {result.games:>6}  "
+                f"{result.log_loss:>8.5f}  {result.brier:>7.5f}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Evaluated {len(grid)} configurations in {elapsed:.1f}s."
+            )
+        )
+
+    @staticmethod
+    def _run(
+        grid: list[SweepParams],
+        history: History,
+        score_from: int,
+        workers: int,
+    ) -> list[SweepResult]:
+        """Evaluate ``grid``, fanning out to a process pool when useful."""
+        workers = min(workers, len(grid))
+        if workers <= 1:
+            return [evaluate(params, history, score_from) for params in grid]
+
+        with model_pool(workers, _init_worker, history, score_from) as pool:
+            return list(pool.map(_evaluate_in_worker, grid))
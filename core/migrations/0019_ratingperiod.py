@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0018_match_home_away_team_diff"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RatingPeriod",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "system",
+                    models.CharField(
+                        choices=[("glicko", "Glicko"), ("elo", "Elo")],
+                        max_length=10,
+                    ),
+                ),
+                ("season", models.PositiveIntegerField()),
+                ("week", models.PositiveIntegerField()),
+                ("match_count", models.PositiveIntegerField(default=0)),
+                ("digest", models.CharField(max_length=64)),
+            ],
+            options={
+                "verbose_name": "rating period",
+                "verbose_name_plural": "rating periods",
+                "ordering": ["system", "season", "week"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("system", "season", "week"),
+                        name="unique_rating_period",
+                    )
+                ],
+            },
+        ),
+    ]
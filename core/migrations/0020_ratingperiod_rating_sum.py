@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0019_ratingperiod"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ratingperiod",
+            name="rating_sum",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="ratingperiod",
+            name="team_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0020_ratingperiod_rating_sum"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TeamCurrentRating",
+            fields=[
+                (
+                    "team",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="current_rating",
+                        serialize=False,
+                        to="core.team",
+                    ),
+                ),
+                ("elo", models.FloatField(blank=True, null=True)),
+                (
+                    "elo_rank",
+                    models.PositiveIntegerField(blank=True, null=True),
+                ),
+                ("glicko_rating", models.FloatField(blank=True, null=True)),
+                ("glicko_rd", models.FloatField(blank=True, null=True)),
+                ("glicko_vol", models.FloatField(blank=True, null=True)),
+                (
+                    "glicko_rank",
+                    models.PositiveIntegerField(blank=True, null=True),
+                ),
+                ("last_played", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "current team rating",
+                "verbose_name_plural": "current team ratings",
+                "ordering": ["team_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["glicko_rank"],
+                        name="core_teamcu_glicko__635328_idx",
+                    ),
+                    models.Index(
+                        fields=["elo_rank"],
+                        name="core_teamcu_elo_ran_930bb1_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
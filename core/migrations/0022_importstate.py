@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0021_teamcurrentrating"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("season", models.PositiveIntegerField(unique=True)),
+                ("imported_at", models.DateTimeField()),
+                ("payload_hash", models.CharField(max_length=64)),
+                ("game_count", models.PositiveIntegerField(default=0)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "import state",
+                "verbose_name_plural": "import states",
+                "ordering": ["season"],
+            },
+        ),
+    ]
@@ -1,9 +1,12 @@
 """Expose core data models for external use."""
 
 from .conference import Conference, DivisionClassification
+from .current_rating import TeamCurrentRating
 from .elo import EloRating
 from .glicko import GlickoRating
+from .import_state import ImportState
 from .match import Match
+from .rating_period import RatingPeriod
 from .team import Team, TeamAlternativeName, TeamLogo
 from .venue import Venue
 
@@ -17,4 +20,7 @@ __all__ = [
     "Match",
     "GlickoRating",
     "EloRating",
+    "RatingPeriod",
+    "TeamCurrentRating",
+    "ImportState",
 ]
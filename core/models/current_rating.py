@@ -0,0 +1,135 @@
+"""Denormalized snapshot of every team's latest ratings."""
+
+from datetime import datetime
+
+from django.db import models, transaction
+from django.db.models import Max
+
+from .elo import EloRating
+from .enums import RatingSystem
+from .glicko import GlickoRating
+from .match import Match
+from .team import Team
+
+
+class TeamCurrentRatingQuerySet(models.QuerySet):
+    """Custom ``QuerySet`` for :class:`TeamCurrentRating`."""
+
+    def ranked(
+        self, system: RatingSystem = RatingSystem.GLICKO
+    ) -> "TeamCurrentRatingQuerySet":
+        """Return the ranked teams of ``system`` in rank order."""
+        rank = f"{system}_rank"
+        return (
+            self.filter(**{f"{rank}__isnull": False})
+            .select_related("team")
+            .order_by(rank)
+        )
+
+    def refresh(self, system: RatingSystem) -> int:
+        """
+        Rebuild the ``system`` columns from the stored rating history.
+
+        Each team gets its latest rating; teams whose latest rating falls in
+        the most recent rated season are ranked by it. Columns of the other
+        system are left alone. Returns the number of teams with a rating.
+        """
+        if system == RatingSystem.ELO:
+            rows = EloRating.objects.latest_by_team().values_list(
+                "team_id", "match__season", "rating_after"
+            )
+            fields = ["elo"]
+        else:
+            newest = GlickoRating.objects.order_by("-season", "-week").first()
+            rows = (
+                GlickoRating.objects.as_of(
+                    newest.season, newest.week
+                ).values_list("team_id", "season", "rating", "rd", "vol")
+                if newest
+                else []
+            )
+            fields = ["glicko_rating", "glicko_rd", "glicko_vol"]
+        latest = {team_id: values for team_id, *values in rows}
+
+        season = max((values[0] for values in latest.values()), default=None)
+        ranked = sorted(
+            (-values[1], team_id)
+            for team_id, values in latest.items()
+            if values[0] == season
+        )
+        ranks = {team_id: rank for rank, (_, team_id) in enumerate(ranked, 1)}
+        last_played = self._last_played()
+
+        rank_field = f"{system}_rank"
+        with transaction.atomic(using=self.db):
+            self.update(**dict.fromkeys([*fields, rank_field]))
+            self.bulk_create(
+                [
+                    self.model(
+                        team_id=team_id,
+                        last_played=last_played.get(team_id),
+                        **dict(zip(fields, values[1:], strict=True)),
+                        **{rank_field: ranks.get(team_id)},
+                    )
+                    for team_id, values in latest.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["team"],
+                update_fields=[*fields, rank_field, "last_played"],
+            )
+        return len(latest)
+
+    @staticmethod
+    def _last_played() -> dict[int, datetime]:
+        """Return the kickoff of each team's latest completed match."""
+        completed = Match.objects.filter(completed=True).order_by()
+        last_played: dict[int, datetime] = {}
+        for side in ("home_team", "away_team"):
+            for team_id, start_date in completed.values_list(side).annotate(
+                Max("start_date")
+            ):
+                last_played[team_id] = max(
+                    start_date, last_played.get(team_id, start_date)
+                )
+        return last_played
+
+
+class TeamCurrentRating(models.Model):
+    """
+    Latest Elo and Glicko ratings of one team.
+
+    The rating commands refresh their own columns at the end of each run,
+    so current ratings and ranks can be read with one indexed query instead
+    of searching the rating history.
+    """
+
+    team = models.OneToOneField(
+        Team,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="current_rating",
+    )
+    elo = models.FloatField(null=True, blank=True)
+    elo_rank = models.PositiveIntegerField(null=True, blank=True)
+    glicko_rating = models.FloatField(null=True, blank=True)
+    glicko_rd = models.FloatField(null=True, blank=True)
+    glicko_vol = models.FloatField(null=True, blank=True)
+    glicko_rank = models.PositiveIntegerField(null=True, blank=True)
+    last_played = models.DateTimeField(null=True, blank=True)
+
+    objects = TeamCurrentRatingQuerySet.as_manager()
+
+    class Meta:
+        """Metadata for TeamCurrentRating model."""
+
+        ordering = ["team_id"]
+        verbose_name = "current team rating"
+        verbose_name_plural = "current team ratings"
+        indexes = [
+            models.Index(fields=["glicko_rank"]),
+            models.Index(fields=["elo_rank"]),
+        ]
+
+    def __str__(self) -> str:
+        """Return the ratings for display."""
+        return f"{self.team}: Elo {self.elo}, Glicko {self.glicko_rating}"
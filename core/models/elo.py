@@ -1,6 +1,7 @@
 """Elo rating model for tracking team performance."""
 
 from django.db import models
+from django.db.models.functions import RowNumber
 
 from libs.constants import DEFAULT_RATING
 
@@ -8,6 +9,25 @@ from .match import Match
 from .team import Team
 
 
+class EloRatingQuerySet(models.QuerySet):
+    """Custom ``QuerySet`` for :class:`EloRating`."""
+
+    def latest_by_team(self) -> "EloRatingQuerySet":
+        """Return each team's rating after its last match in the queryset."""
+        return self.annotate(
+            latest=models.Window(
+                RowNumber(),
+                partition_by=[models.F("team_id")],
+                order_by=[
+                    models.F("match__season").desc(),
+                    models.F("match__week").desc(),
+                    models.F("match__start_date").desc(),
+                    models.F("match_id").desc(),
+                ],
+            )
+        ).filter(latest=1)
+
+
 class EloRating(models.Model):
     """Elo rating for a team before and after a specific match."""
 
@@ -29,6 +49,8 @@ class EloRating(models.Model):
         db_persist=True,
     )
 
+    objects = EloRatingQuerySet.as_manager()
+
     class Meta:
         """Metadata for EloRating model."""
 
@@ -21,3 +21,10 @@ class SeasonType(models.TextChoices):
     ALLSTAR = "allstar", "Allstar"
     SPRING_REGULAR = "spring_regular", "Spring Regular"
     SPRING_POSTSEASON = "spring_postseason", "Spring Postseason"
+
+
+class RatingSystem(models.TextChoices):
+    """Enumeration for the rating systems computed from match results."""
+
+    GLICKO = "glicko", "Glicko"
+    ELO = "elo", "Elo"
@@ -1,6 +1,7 @@
 """Glicko rating model for tracking team performance."""
 
 from django.db import models
+from django.db.models.functions import RowNumber
 
 from libs.constants import DEFAULT_RATING, DEFAULT_RD, DEFAULT_VOLATILITY
 
@@ -9,6 +10,50 @@ from .enums import DivisionClassification
 from .team import Team
 
 
+class GlickoRatingQuerySet(models.QuerySet):
+    """Custom ``QuerySet`` for :class:`GlickoRating`."""
+
+    def as_of(self, season: int, week: int) -> "GlickoRatingQuerySet":
+        """Return each team's latest rating at or before ``season``/``week``."""
+        return (
+            self.filter(
+                models.Q(season__lt=season)
+                | models.Q(season=season, week__lte=week)
+            )
+            .annotate(
+                latest=models.Window(
+                    RowNumber(),
+                    partition_by=[models.F("team_id")],
+                    order_by=[
+                        models.F("season").desc(),
+                        models.F("week").desc(),
+                    ],
+                )
+            )
+            .filter(latest=1)
+        )
+
+    def for_week(self, season: int, week: int) -> "GlickoRatingQuerySet":
+        """
+        Return the rating table of ``season`` as it stood after ``week``.
+
+        Teams without a row for ``week`` (idle teams when ratings are stored
+        sparsely) are represented by their latest row of the season, with
+        ``week_change`` set to 0 since their rating did not move that week.
+        """
+        return (
+            self.filter(season=season)
+            .as_of(season, week)
+            .annotate(
+                week_change=models.Case(
+                    models.When(week=week, then=models.F("rating_change")),
+                    default=models.Value(0.0),
+                    output_field=models.FloatField(),
+                )
+            )
+        )
+
+
 class GlickoRating(models.Model):
     """Glicko rating for a team in a specific season and week."""
 
@@ -47,6 +92,8 @@ class GlickoRating(models.Model):
         db_persist=True,
     )
 
+    objects = GlickoRatingQuerySet.as_manager()
+
     class Meta:
         """Metadata for GlickoRating model."""
 
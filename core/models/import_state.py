@@ -0,0 +1,39 @@
+"""Watermarks of the games imported for each season."""
+
+from django.db import models
+
+
+class ImportState(models.Model):
+    """
+    What the last games import stored for one season.
+
+    ``cfbd_import --delta`` only fetches seasons that are not settled yet
+    and skips writing a season whose payload digest is unchanged.
+    """
+
+    season = models.PositiveIntegerField(unique=True)
+    imported_at = models.DateTimeField()
+    payload_hash = models.CharField(max_length=64)
+    game_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """Metadata for ImportState model."""
+
+        ordering = ["season"]
+        verbose_name = "import state"
+        verbose_name_plural = "import states"
+
+    def __str__(self) -> str:
+        """Return the season and its completed games for display."""
+        return (
+            f"{self.season}: {self.completed_count}/{self.game_count} "
+            "games completed"
+        )
+
+    def is_settled(self, current_season: int) -> bool:
+        """Return whether the season is over and every game completed."""
+        return (
+            self.season < current_season
+            and self.completed_count == self.game_count
+        )
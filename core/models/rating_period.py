@@ -0,0 +1,102 @@
+"""Fingerprints of the match data behind each computed rating period."""
+
+import hashlib
+from collections.abc import Iterable
+
+from django.db import models
+
+from core.models.enums import RatingSystem
+
+# Match fields that influence a rating calculation. Changing any of them
+# changes the digest of the period the match belongs to.
+MATCH_DIGEST_FIELDS = (
+    "id",
+    "start_date",
+    "neutral_site",
+    "home_team_id",
+    "home_classification",
+    "home_conference_id",
+    "home_score",
+    "away_team_id",
+    "away_classification",
+    "away_conference_id",
+    "away_score",
+)
+
+
+def digest_matches(rows: Iterable[tuple]) -> str:
+    """
+    Return a stable digest for a set of match rows.
+
+    Each row holds the values of :data:`MATCH_DIGEST_FIELDS` in order. Rows
+    are hashed by match id so the digest does not depend on query order.
+    """
+    digest = hashlib.sha256()
+    for row in sorted(rows, key=lambda row: row[0]):
+        digest.update(repr(tuple(row)).encode())
+    return digest.hexdigest()
+
+
+def first_changed_period(
+    system: str, rows: Iterable[tuple]
+) -> tuple[int, int] | None:
+    """
+    Return the earliest season and week of ``system`` whose matches changed.
+
+    ``rows`` hold the season and week of each match followed by the values
+    that are digested. Periods are compared with the stored
+    :class:`RatingPeriod` digests; periods that gained, changed or lost
+    matches all count.
+    """
+    current: dict[tuple[int, int], list[tuple]] = {}
+    for season, week, *row in rows:
+        current.setdefault((season, week), []).append(tuple(row))
+
+    stored = {
+        (season, week): digest
+        for season, week, digest in RatingPeriod.objects.filter(
+            system=system
+        ).values_list("season", "week", "digest")
+    }
+
+    for period in sorted(current.keys() | stored.keys()):
+        if digest_matches(current.get(period, [])) != stored.get(period):
+            return period
+    return None
+
+
+class RatingPeriod(models.Model):
+    """
+    Record of the completed matches that fed one rating period.
+
+    The rating commands store one row per processed season and week so a
+    later run can find the earliest period whose matches changed and
+    recompute only from there. ``rating_sum`` and ``team_count`` cover every
+    team rated in the season so far, whether or not a rating row was stored
+    for it, so season averages do not depend on how ratings are persisted.
+    """
+
+    system = models.CharField(max_length=10, choices=RatingSystem.choices)
+    season = models.PositiveIntegerField()
+    week = models.PositiveIntegerField()
+    match_count = models.PositiveIntegerField(default=0)
+    digest = models.CharField(max_length=64)
+    rating_sum = models.FloatField(default=0)
+    team_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """Metadata for RatingPeriod model."""
+
+        ordering = ["system", "season", "week"]
+        verbose_name = "rating period"
+        verbose_name_plural = "rating periods"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["system", "season", "week"],
+                name="unique_rating_period",
+            )
+        ]
+
+    def __str__(self) -> str:
+        """Return the period for display."""
+        return f"{self.get_system_display()} {self.season}-{self.week}"
@@ -1,5 +1,7 @@
 """Models for teams and related metadata."""
 
+from collections.abc import Callable
+
 from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
@@ -90,24 +92,30 @@ class Team(models.Model):
 
     def save(self, *args: object, **kwargs: object) -> None:
         """Generate a unique slug before saving."""
-        if (
-            not self.slug
-            or self.slug == ""
-            or slugify(self.school) not in self.slug
-        ):
-            base_slug = slugify(self.school)
-            slug = base_slug
-            counter = 1
-            while Team.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+        self.assign_slug(lambda slug: Team.objects.filter(slug=slug).exists())
         super().save(*args, **kwargs)
 
     def get_absolute_url(self) -> str:
         """Return the URL for this team's detail page."""
         return reverse("team-detail", args=[self.slug])
 
+    def assign_slug(self, is_taken: Callable[[str], bool]) -> None:
+        """
+        Give the team a slug unless its current one still fits its school.
+
+        The slug of the school is tried first, then numbered variants until
+        ``is_taken`` reports one as free.
+        """
+        if self.slug and slugify(self.school) in self.slug:
+            return
+        base_slug = slugify(self.school)
+        slug = base_slug
+        counter = 1
+        while is_taken(slug):
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        self.slug = slug
+
     @property
     def logo_bright(self) -> str | None:
         """Return the first logo URL if available."""
@@ -0,0 +1,197 @@
+"""Match history and per-week game edges shared by the Glicko commands."""
+
+import math
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import groupby
+from operator import attrgetter
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from core.models.enums import DivisionClassification
+from core.models.match import Match
+from core.models.rating_period import MATCH_DIGEST_FIELDS
+from libs.constants import (
+    DEFAULT_RATING,
+    DEFAULT_RD,
+    DIVISION_BASE_RATINGS,
+    DIVISION_BASE_RDS,
+    HOME_FIELD_SCALE,
+    MARGIN_WEIGHT_CAP_MULTIPLIER,
+)
+from libs.rating_state import TeamRatingState
+
+# One entry per team per game: (team index, opponent rating, opponent RD,
+# log margin, outcome).
+Edge = tuple[int, float, float, float, float]
+TeamMeta = dict[int, tuple[Optional[str], Optional[int]]]
+
+
+class MatchRow(NamedTuple):
+    """Completed match as streamed from the database."""
+
+    season: int
+    week: int
+    id: int
+    start_date: datetime
+    neutral_site: bool
+    home_team_id: int
+    home_classification: str
+    home_conference_id: Optional[int]
+    home_score: int
+    away_team_id: int
+    away_classification: str
+    away_conference_id: Optional[int]
+    away_score: int
+
+
+def season_matches(
+    seasons: list[int],
+) -> Iterator[tuple[int, list[MatchRow], list[MatchRow]]]:
+    """
+    Yield each season with its and the previous season's matches.
+
+    Completed matches are read in a single query, ordered by season,
+    week and kickoff, and only the two seasons in use are kept in memory.
+    """
+    if not seasons:
+        return
+    stream = map(
+        MatchRow._make,
+        Match.objects.filter(completed=True, season__gte=seasons[0] - 1)
+        .order_by("season", "week", "start_date", "id")
+        .values_list("season", "week", *MATCH_DIGEST_FIELDS)
+        .iterator(),
+    )
+    groups = groupby(stream, key=attrgetter("season"))
+    pending = next(groups, None)
+    recent: dict[int, list[MatchRow]] = {}
+    for season in seasons:
+        while pending is not None and pending[0] <= season:
+            recent[pending[0]] = list(pending[1])
+            pending = next(groups, None)
+        for old in [s for s in recent if s < season - 1]:
+            del recent[old]
+        yield season, recent.get(season, []), recent.get(season - 1, [])
+
+
+def get_team_index(
+    state: TeamRatingState,
+    team_id: int,
+    division: Optional[DivisionClassification],
+) -> int:
+    """Return the up-to-date state index of a team, adding it if needed."""
+    idx = state.index.get(team_id)
+    if idx is None:
+        rating = DIVISION_BASE_RATINGS.get(division, DEFAULT_RATING)
+        rd = DIVISION_BASE_RDS.get(division, DEFAULT_RD)
+        idx = state.add(team_id, rating, rd)
+    else:
+        state.sync([idx])
+    return idx
+
+
+def process_match(
+    match: MatchRow,
+    state: TeamRatingState,
+    home_field_bonus: float,
+    edges: list[Edge],
+    season_active_teams: set[int],
+    week_meta: TeamMeta,
+) -> None:
+    """Record the result of a single match."""
+    home_division = (
+        DivisionClassification(match.home_classification)
+        if match.home_classification
+        else None
+    )
+    home = get_team_index(state, match.home_team_id, home_division)
+
+    away_division = (
+        DivisionClassification(match.away_classification)
+        if match.away_classification
+        else None
+    )
+    away = get_team_index(state, match.away_team_id, away_division)
+
+    season_active_teams.update([match.home_team_id, match.away_team_id])
+
+    week_meta[match.home_team_id] = (
+        match.home_classification,
+        match.home_conference_id,
+    )
+    week_meta[match.away_team_id] = (
+        match.away_classification,
+        match.away_conference_id,
+    )
+
+    home_team_outcome = 0.5
+    if match.home_score > match.away_score:
+        home_team_outcome = 1
+    elif match.home_score < match.away_score:
+        home_team_outcome = 0
+    away_team_outcome = 1 - home_team_outcome
+
+    margin = abs(match.home_score - match.away_score)
+    log_margin = math.log(margin + 1)
+
+    rating = state.rating
+    rd = state.rd
+    if match.neutral_site:
+        home_rating = rating[home]
+        away_rating = rating[away]
+    else:
+        home_rating = rating[home] + home_field_bonus / 2
+        away_rating = rating[away] - home_field_bonus / 2
+
+    edges.append((home, away_rating, rd[away], log_margin, home_team_outcome))
+    edges.append((away, home_rating, rd[home], log_margin, away_team_outcome))
+
+
+def weighted_outcomes(
+    team_rating: np.ndarray,
+    opp_rating: np.ndarray,
+    log_margin: np.ndarray,
+    outcome: np.ndarray,
+    margin_weight_cap: float,
+) -> np.ndarray:
+    """Shrink outcomes toward 0.5 for narrow or mismatched results."""
+    log_cap = math.log(margin_weight_cap + 1)
+    denom = np.abs(team_rating - opp_rating) * 0.001 + 2.2
+    max_factor = log_cap * 2.2 / denom
+    factor = np.minimum(log_margin * 2.2 / denom, max_factor) / max_factor
+    return 0.5 + (outcome - 0.5) * factor
+
+
+def calculate_home_field_bonus(
+    prev_matches: list[MatchRow],
+    prev_season_avg_rating: float | None,
+    scale: float = HOME_FIELD_SCALE,
+) -> float:
+    """Calculate the home field advantage bonus."""
+    non_neutral_matches = [m for m in prev_matches if not m.neutral_site]
+    if non_neutral_matches:
+        home_wins = sum(
+            m.home_score > m.away_score for m in non_neutral_matches
+        )
+        home_win_percent = home_wins / len(non_neutral_matches)
+        return (home_win_percent - 0.5) * prev_season_avg_rating * scale
+    return 0
+
+
+def calculate_margin_weight_cap(
+    prev_matches: list[MatchRow],
+    multiplier: float = MARGIN_WEIGHT_CAP_MULTIPLIER,
+) -> float:
+    """Calculate the margin of victory weight cap."""
+    if not prev_matches:
+        return multiplier
+    prev_season_avg_margin = sum(
+        abs(m.home_score - m.away_score) for m in prev_matches
+    ) / len(prev_matches)
+    return (
+        prev_season_avg_margin * multiplier
+        if prev_season_avg_margin
+        else multiplier
+    )
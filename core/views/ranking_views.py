@@ -104,11 +104,9 @@ class RankingListView(ListView):
             self.seasons,
             self.weeks,
         ) = self.get_season_and_week(qs)
-        # Filter by chosen season and week
+        # Resolve each team's latest rating for the chosen season and week
         if self.season is not None:
-            qs = qs.filter(season=self.season)
-        if self.week is not None:
-            qs = qs.filter(week=self.week)
+            qs = qs.for_week(self.season, self.week)
 
         return qs.order_by("-rating")
 
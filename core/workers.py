@@ -0,0 +1,39 @@
+"""Process pools whose workers use the Django models."""
+
+import pickle
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+
+import django
+from django.db import connections
+
+
+def _setup_worker(initializer: str, payload: bytes) -> None:
+    """Set up Django, then call ``initializer`` with the pickled arguments."""
+    django.setup()
+    module, _, name = initializer.rpartition(".")
+    getattr(import_module(module), name)(*pickle.loads(payload))  # noqa: S301
+
+
+def model_pool(
+    workers: int, initializer: Callable[..., None], *initargs: object
+) -> ProcessPoolExecutor:
+    """
+    Return a pool of ``workers`` processes set up with ``initializer``.
+
+    The pool uses the platform's default start method. Workers started by
+    spawn import nothing of the project until Django is set up, so
+    ``initializer`` travels by name and ``initargs``, which may hold model
+    data, pickled. Open database connections are closed first so forked
+    workers do not share them.
+    """
+    connections.close_all()
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_setup_worker,
+        initargs=(
+            f"{initializer.__module__}.{initializer.__qualname__}",
+            pickle.dumps(initargs),
+        ),
+    )
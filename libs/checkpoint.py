@@ -0,0 +1,75 @@
+"""Season-boundary checkpoints of rating engine state."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Bump when the arrays stored in a checkpoint change meaning.
+CHECKPOINT_VERSION = 1
+
+
+def params_key(params: dict[str, object]) -> str:
+    """Return a short, stable hash of engine parameters."""
+    payload = json.dumps(
+        {"version": CHECKPOINT_VERSION, **params}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """
+    Checkpoints of one engine configuration, one ``.npz`` file per season.
+
+    Files live under ``directory/engine/<params hash>/`` so a change to any
+    engine parameter moves to a fresh directory and stale state is never
+    loaded. The parameters are written next to the checkpoints as
+    ``params.json`` for reference.
+    """
+
+    def __init__(
+        self, directory: Path | str, engine: str, params: dict[str, object]
+    ) -> None:
+        """Create a store for ``engine`` run with ``params``."""
+        self.params = params
+        self.key = params_key(params)
+        self.directory = Path(directory) / engine / self.key
+
+    def path(self, season: int) -> Path:
+        """Return the checkpoint file for the end of ``season``."""
+        return self.directory / f"{season}.npz"
+
+    def seasons(self) -> list[int]:
+        """Return the seasons that have a checkpoint."""
+        return sorted(
+            int(path.stem)
+            for path in self.directory.glob("*.npz")
+            if path.stem.isdigit()
+        )
+
+    def save(self, season: int, arrays: dict[str, np.ndarray]) -> Path:
+        """Atomically write the end-of-season ``arrays`` for ``season``."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        params_path = self.directory / "params.json"
+        if not params_path.exists():
+            params_path.write_text(
+                json.dumps(self.params, sort_keys=True, indent=2, default=str)
+            )
+
+        path = self.path(season)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, **arrays)
+        Path(tmp).replace(path)
+        return path
+
+    def load(self, season: int) -> dict[str, np.ndarray] | None:
+        """Return the arrays saved for ``season``, or ``None`` if missing."""
+        path = self.path(season)
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
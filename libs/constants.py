@@ -9,6 +9,12 @@ DEFAULT_VOLATILITY = 0.11
 GLICKO2_SCALER = 173.7178
 TAU = 0.9
 CONVERGENCE_TOLERANCE = 0.000001
+# Upper bound on bracketing and Illinois steps in the batch volatility solver
+VOLATILITY_MAX_ITERATIONS = 100
+# Margin weight cap as a multiple of the previous season's average margin
+MARGIN_WEIGHT_CAP_MULTIPLIER = 1.5
+# Scale applied to the home-field bonus derived from home win percentage
+HOME_FIELD_SCALE = 1.0
 
 # Elo constants
 ELO_DEFAULT_RATING = 1500
@@ -20,6 +26,10 @@ ELO_DECAY_DEFAULT = 0.75  # Fraction of a rating retained between seasons
 #                 * (actual - expected)
 ELO_SCORE_DIFFERENTIAL_BASE = 10
 
+# Hyperparameter sweeps clip predictions away from 0 and 1 so a single
+# confident miss cannot make the log-loss infinite.
+PROBABILITY_EPSILON = 1e-15
+
 # Base ratings and rating deviations for each division
 DIVISION_BASE_RATINGS = {
     DivisionClassification.FBS: 1500,
@@ -2,6 +2,8 @@
 
 import math
 
+import numpy as np
+
 from .constants import (
     ELO_HOME_ADVANTAGE,
     ELO_K_FACTOR,
@@ -53,3 +55,81 @@ def update_ratings(
     away_after = away_rating + k_factor * margin * (away_actual - expected_away)
 
     return home_after, away_after
+
+
+def sub_rounds(home: np.ndarray, away: np.ndarray) -> np.ndarray:
+    """
+    Return the sub-round of each game so no team plays twice in one.
+
+    Games keep their order: a game is placed one sub-round after the latest
+    earlier game of either of its teams, so every team's games are still
+    rated in sequence.
+    """
+    last: dict[int, int] = {}
+    rounds = []
+    for h, a in zip(home.tolist(), away.tolist(), strict=True):
+        level = max(last.get(h, -1), last.get(a, -1)) + 1
+        last[h] = last[a] = level
+        rounds.append(level)
+    return np.array(rounds, dtype=np.intp)
+
+
+def update_ratings_batch(
+    ratings: np.ndarray,
+    home: np.ndarray,
+    away: np.ndarray,
+    home_score: np.ndarray,
+    away_score: np.ndarray,
+    neutral_site: np.ndarray,
+    *,
+    k_factor: float = ELO_K_FACTOR,
+    base: float = ELO_SCORE_DIFFERENTIAL_BASE,
+    home_advantage: float = ELO_HOME_ADVANTAGE,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rate a round of games at once, updating ``ratings`` in place.
+
+    ``home`` and ``away`` index into ``ratings``. Teams that appear more
+    than once are split into sequential :func:`sub_rounds`, so the result
+    is bit-identical to calling :func:`update_ratings` game by game in
+    order. The power and logarithm go through Python's ``math`` rather
+    than NumPy, whose SIMD versions may differ in the last bit.
+
+    Returns the home and away ratings before and after each game.
+    """
+    home = np.asarray(home, dtype=np.intp)
+    away = np.asarray(away, dtype=np.intp)
+    diff = np.asarray(home_score) - np.asarray(away_score)
+    home_actual = np.where(diff > 0, 1.0, np.where(diff < 0, 0.0, 0.5))
+    advantage = np.where(neutral_site, 0.0, home_advantage)
+    margins = {
+        d: math.log(d + 1, base) for d in np.unique(np.abs(diff)).tolist()
+    }
+    margin = np.array(
+        [margins[d] for d in np.abs(diff).tolist()], dtype=np.float64
+    )
+
+    home_before = np.empty(len(home), dtype=np.float64)
+    away_before = np.empty(len(home), dtype=np.float64)
+    home_after = np.empty(len(home), dtype=np.float64)
+    away_after = np.empty(len(home), dtype=np.float64)
+    rounds = sub_rounds(home, away)
+    for level in range(rounds.max(initial=-1) + 1):
+        games = np.flatnonzero(rounds == level)
+        h, a = home[games], away[games]
+        home_rating, away_rating = ratings[h], ratings[a]
+        exponent = (away_rating - (home_rating + advantage[games])) / 400
+        expected_home = 1 / (
+            1 + np.array([10**x for x in exponent.tolist()], dtype=np.float64)
+        )
+        expected_away = 1 - expected_home
+        change = k_factor * margin[games]
+        home_before[games] = home_rating
+        away_before[games] = away_rating
+        home_after[games] = ratings[h] = home_rating + change * (
+            home_actual[games] - expected_home
+        )
+        away_after[games] = ratings[a] = away_rating + change * (
+            (1 - home_actual[games]) - expected_away
+        )
+    return home_before, away_before, home_after, away_after
@@ -23,6 +23,9 @@ SOFTWARE.
 """
 
 import math
+from dataclasses import dataclass
+
+import numpy as np
 
 from .constants import (
     CONVERGENCE_TOLERANCE,
@@ -31,12 +34,17 @@ from .constants import (
     DEFAULT_VOLATILITY,
     GLICKO2_SCALER,
     TAU,
+    VOLATILITY_MAX_ITERATIONS,
 )
 
+_PI_SQUARED = math.pi**2
+
 
 class Player:
     """Represents a competitor in the Glicko-2 rating system."""
 
+    __slots__ = ("__rating", "__rd", "vol", "_tau")
+
     def get_rating(self) -> float:
         """Return the player's rating."""
         return (self.__rating * GLICKO2_SCALER) + DEFAULT_RATING
@@ -78,7 +86,7 @@ class Player:
 
         preRatingRD() -> None
         """
-        self.__rd = math.sqrt(math.pow(self.__rd, 2) + math.pow(self.vol, 2))
+        self.__rd = math.sqrt(self.__rd * self.__rd + self.vol * self.vol)
 
     def update_player(
         self,
@@ -89,68 +97,71 @@ class Player:
         """
         Calculate the new rating and rating deviation of the player.
 
+        g(RD) and E are evaluated once per opponent and the sums for v and
+        delta are accumulated in the same pass.
+
         update_player(list[int], list[int], list[bool]) -> None
         """
-        # Convert the rating and rating deviation values for internal use.
-        rating_list = [
-            (x - DEFAULT_RATING) / GLICKO2_SCALER for x in rating_list
-        ]
-        rd_list = [x / GLICKO2_SCALER for x in rd_list]
-
-        v = self._v(rating_list, rd_list)
-        self.vol = self._new_vol(rating_list, rd_list, outcome_list, v)
-        self._pre_rating_rd()
+        mu = self.__rating
+        v_sum = 0.0
+        score_sum = 0.0
+        for rating, rd, outcome in zip(
+            rating_list, rd_list, outcome_list, strict=True
+        ):
+            # Convert the rating and rating deviation values for internal use.
+            phi = rd / GLICKO2_SCALER
+            g = 1 / math.sqrt(1 + 3 * phi * phi / _PI_SQUARED)
+            e = 1 / (
+                1
+                + math.exp(
+                    -g * (mu - (rating - DEFAULT_RATING) / GLICKO2_SCALER)
+                )
+            )
+            v_sum += g * g * e * (1 - e)
+            score_sum += g * (outcome - e)
 
-        self.__rd = 1 / math.sqrt((1 / math.pow(self.__rd, 2)) + (1 / v))
+        v = 1 / max(v_sum, 0.00001)
+        self.vol = self._new_vol(v * score_sum, v)
+        self._pre_rating_rd()
 
-        temp_sum = 0.0
-        for i in range(len(rating_list)):
-            temp_sum += self._g(rd_list[i]) * (
-                outcome_list[i] - self._e(rating_list[i], rd_list[i])
-            )
-        self.__rating += math.pow(self.__rd, 2) * temp_sum
+        self.__rd = 1 / math.sqrt(1 / (self.__rd * self.__rd) + 1 / v)
+        self.__rating += self.__rd * self.__rd * score_sum
 
     # step 5
-    def _new_vol(
-        self,
-        rating_list: list[float],
-        rd_list: list[float],
-        outcome_list: list[float],
-        v: float,
-    ) -> float:
+    def _new_vol(self, delta: float, v: float) -> float:
         """
         Calculate the new volatility as per the Glicko2 system.
 
         Updated for Feb 22, 2012 revision. -Leo
 
-        _newVol(list, list, list, float) -> float
+        _newVol(float, float) -> float
         """
         # step 1
-        a = math.log(self.vol**2)
+        a = math.log(self.vol * self.vol)
         eps = CONVERGENCE_TOLERANCE
         _a = a
 
         # step 2
-        b: float | None = None
-        delta = self._delta(rating_list, rd_list, outcome_list, v)
         tau = self._tau
-        if (delta**2) > ((self.__rd**2) + v):
-            b = math.log(delta**2 - self.__rd**2 - v)
+        delta2 = delta * delta
+        rd2 = self.__rd * self.__rd
+        if delta2 > rd2 + v:
+            b = math.log(delta2 - rd2 - v)
         else:
             k = 1
-            while self._f(a - k * math.sqrt(tau**2), delta, v, a) < 0:
+            while self._f(a - k * tau, delta2, v, a) < 0:
                 k = k + 1
-            b = a - k * math.sqrt(tau**2)
+            b = a - k * tau
 
         # step 3
-        f_a = self._f(_a, delta, v, a)
-        f_b = self._f(b, delta, v, a)
+        f_a = self._f(_a, delta2, v, a)
+        f_b = self._f(b, delta2, v, a)
 
         # step 4
         while math.fabs(b - _a) > eps:
             # a
             c = _a + ((_a - b) * f_a) / (f_b - f_a)
-            f_c = self._f(c, delta, v, a)
+            f_c = self._f(c, delta2, v, a)
             # b
             if f_c * f_b <= 0:
                 _a = b
@@ -164,62 +175,16 @@ class Player:
         # step 5
         return math.exp(_a / 2)
 
-    def _f(self, x: float, delta: float, v: float, a: float) -> float:
+    def _f(self, x: float, delta2: float, v: float, a: float) -> float:
         """Return the helper function used during volatility calculation."""
         ex = math.exp(x)
-        num1 = ex * (delta**2 - self.__rating**2 - v - ex)
-        denom1 = 2 * ((self.__rating**2 + v + ex) ** 2)
-        return (num1 / denom1) - ((x - a) / (self._tau**2))
-
-    def _delta(
-        self,
-        rating_list: list[float],
-        rd_list: list[float],
-        outcome_list: list[float],
-        v: float,
-    ) -> float:
-        """
-        Compute the delta function of the Glicko2 system.
-
-        _delta(list, list, list) -> float
-        """
-        temp_sum = 0.0
-        for i in range(len(rating_list)):
-            temp_sum += self._g(rd_list[i]) * (
-                outcome_list[i] - self._e(rating_list[i], rd_list[i])
-            )
-        return v * temp_sum
-
-    def _v(self, rating_list: list[float], rd_list: list[float]) -> float:
-        """
-        Compute the v function of the Glicko2 system.
-
-        _v(list[int], list[int]) -> float
-        """
-        temp_sum = 0.0
-        for i in range(len(rating_list)):
-            temp_e = self._e(rating_list[i], rd_list[i])
-            temp_sum += math.pow(self._g(rd_list[i]), 2) * temp_e * (1 - temp_e)
-        return 1 / max(temp_sum, 0.00001)
-
-    def _e(self, p2rating: float, p2rd: float) -> float:
-        """
-        Compute the Glicko E function.
-
-        _E(int) -> float
-        """
-        return 1 / (
-            1 + math.exp(-1 * self._g(p2rd) * (self.__rating - p2rating))
+        mu2 = self.__rating * self.__rating
+        num1 = ex * (delta2 - mu2 - v - ex)
+        denom = mu2 + v + ex
+        return (num1 / (2 * denom * denom)) - (
+            (x - a) / (self._tau * self._tau)
         )
 
-    def _g(self, rd: float) -> float:
-        """
-        Compute the Glicko2 g(RD) function.
-
-        _g() -> float
-        """
-        return 1 / math.sqrt(1 + 3 * math.pow(rd, 2) / math.pow(math.pi, 2))
-
     def did_not_compete(self) -> None:
         """
         Apply step 6 of the algorithm.
@@ -229,3 +194,220 @@ class Player:
         did_not_compete() -> None
         """
         self._pre_rating_rd()
+
+
+@dataclass
+class SolverStats:
+    """Convergence counters collected by :func:`solve_volatility`."""
+
+    teams: int = 0
+    max_iterations: int = 0
+    max_iter_hits: int = 0
+
+    def add(self, teams: int, iterations: int, max_iter_hits: int) -> None:
+        """Fold the outcome of one solve into the counters."""
+        self.teams += teams
+        self.max_iterations = max(self.max_iterations, iterations)
+        self.max_iter_hits += max_iter_hits
+
+
+def update_ratings_batch(
+    rating: np.ndarray,
+    rd: np.ndarray,
+    vol: np.ndarray,
+    edge_player: np.ndarray,
+    edge_rating: np.ndarray,
+    edge_rd: np.ndarray,
+    edge_outcome: np.ndarray,
+    *,
+    tau: float = TAU,
+    stats: SolverStats | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rate a whole rating period at once.
+
+    ``rating``, ``rd`` and ``vol`` hold the pre-period values of every
+    player. Each game is described by one edge per participant: the index of
+    the rated player in ``edge_player`` together with the opponent's rating,
+    rating deviation and the player's outcome. Players without edges are
+    treated as in :meth:`Player.did_not_compete`. Volatility solver counters
+    are added to ``stats`` when given.
+
+    Returns new ``(rating, rd, vol)`` arrays matching :class:`Player`.
+    """
+    rating = np.asarray(rating, dtype=np.float64)
+    rd = np.asarray(rd, dtype=np.float64)
+    vol = np.asarray(vol, dtype=np.float64)
+    edge_player = np.asarray(edge_player, dtype=np.intp)
+    count = len(rating)
+
+    # Convert the rating and rating deviation values for internal use.
+    mu = (rating - DEFAULT_RATING) / GLICKO2_SCALER
+    phi = rd / GLICKO2_SCALER
+    opp_mu = (np.asarray(edge_rating, dtype=np.float64) - DEFAULT_RATING) / (
+        GLICKO2_SCALER
+    )
+    opp_phi = np.asarray(edge_rd, dtype=np.float64) / GLICKO2_SCALER
+
+    g = 1 / np.sqrt(1 + 3 * opp_phi**2 / _PI_SQUARED)
+    e = 1 / (1 + np.exp(-g * (mu[edge_player] - opp_mu)))
+    v_sum = np.bincount(
+        edge_player, weights=g**2 * e * (1 - e), minlength=count
+    )
+    score_sum = np.bincount(
+        edge_player,
+        weights=g * (np.asarray(edge_outcome, dtype=np.float64) - e),
+        minlength=count,
+    )
+
+    played = np.bincount(edge_player, minlength=count) > 0
+    new_mu = mu.copy()
+    new_vol = vol.copy()
+    # Step 6 for everyone; players who competed overwrite it below.
+    new_phi = np.sqrt(phi**2 + vol**2)
+
+    if played.any():
+        v = 1 / np.maximum(v_sum[played], 0.00001)
+        delta = v * score_sum[played]
+        new_vol[played] = solve_volatility(
+            mu[played],
+            phi[played],
+            vol[played],
+            delta,
+            v,
+            tau=tau,
+            stats=stats,
+        )
+        phi_star = np.sqrt(phi[played] ** 2 + new_vol[played] ** 2)
+        new_phi[played] = 1 / np.sqrt(1 / phi_star**2 + 1 / v)
+        new_mu[played] = mu[played] + new_phi[played] ** 2 * score_sum[played]
+
+    return (
+        new_mu * GLICKO2_SCALER + DEFAULT_RATING,
+        new_phi * GLICKO2_SCALER,
+        new_vol,
+    )
+
+
+def inflate_rd(
+    rd: np.ndarray, vol: np.ndarray, periods: np.ndarray | int = 1
+) -> np.ndarray:
+    """
+    Apply step 6 to players who did not compete in a rating period.
+
+    Step 6 adds ``vol**2`` to ``phi**2`` once per idle period, so ``periods``
+    missed periods are applied in closed form as ``phi**2 + periods * vol**2``.
+    """
+    phi = np.asarray(rd, dtype=np.float64) / GLICKO2_SCALER
+    vol = np.asarray(vol, dtype=np.float64)
+    return np.sqrt(phi**2 + periods * vol**2) * GLICKO2_SCALER
+
+
+def win_probability(
+    rating: np.ndarray,
+    rd: np.ndarray,
+    opp_rating: np.ndarray,
+    opp_rd: np.ndarray,
+) -> np.ndarray:
+    """
+    Return the probability that each player beats their opponent.
+
+    This is the step-3 expected score with ``g`` taken over the combined
+    deviation of both players, so uncertainty on either side pulls the
+    prediction toward 0.5.
+    """
+    phi_sq = (np.square(rd) + np.square(opp_rd)) / GLICKO2_SCALER**2
+    g = 1 / np.sqrt(1 + 3 * phi_sq / _PI_SQUARED)
+    mu_diff = (np.asarray(rating) - np.asarray(opp_rating)) / GLICKO2_SCALER
+    return 1 / (1 + np.exp(-g * mu_diff))
+
+
+def solve_volatility(
+    mu: np.ndarray,
+    phi: np.ndarray,
+    vol: np.ndarray,
+    delta: np.ndarray,
+    v: np.ndarray,
+    *,
+    tau: float = TAU,
+    eps: float = CONVERGENCE_TOLERANCE,
+    max_iter: int = VOLATILITY_MAX_ITERATIONS,
+    stats: SolverStats | None = None,
+) -> np.ndarray:
+    """
+    Solve step 5 of Glicko-2 for many players simultaneously.
+
+    All inputs are on the internal Glicko-2 scale. The Illinois iteration of
+    :meth:`Player._new_vol` runs on every player at once; players drop out
+    of the working set as soon as their bracket is narrower than ``eps``.
+    The bracketing search of step 2 and the Illinois iteration are each
+    capped at ``max_iter`` steps. Players whose check still fails after the
+    last allowed step keep their current estimate and are counted once in
+    ``stats.max_iter_hits``. ``stats.max_iterations`` keeps the largest
+    number of steps, of both stages together, taken by any solve.
+    """
+    mu2 = np.asarray(mu, dtype=np.float64) ** 2
+    phi2 = np.asarray(phi, dtype=np.float64) ** 2
+    delta2 = np.asarray(delta, dtype=np.float64) ** 2
+    v = np.asarray(v, dtype=np.float64)
+    a = np.log(np.asarray(vol, dtype=np.float64) ** 2)
+    tau2 = tau**2
+
+    def f(x: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        # Mirrors ``Player._f``, which uses the rating (mu) where the
+        # Glicko-2 paper uses the rating deviation.
+        ex = np.exp(x)
+        num1 = ex * (delta2[idx] - mu2[idx] - v[idx] - ex)
+        denom1 = 2 * ((mu2[idx] + v[idx] + ex) ** 2)
+        return (num1 / denom1) - ((x - a[idx]) / tau2)
+
+    # step 2
+    upper = delta2 > phi2 + v
+    b = np.empty_like(a)
+    b[upper] = np.log(delta2[upper] - phi2[upper] - v[upper])
+    k = np.ones_like(a)
+    pending = np.flatnonzero(~upper)
+    pending = pending[f(a[pending] - tau, pending) < 0]
+    bracket_steps = 0
+    while pending.size and bracket_steps < max_iter:
+        bracket_steps += 1
+        k[pending] += 1
+        pending = pending[f(a[pending] - k[pending] * tau, pending) < 0]
+    b[~upper] = a[~upper] - k[~upper] * tau
+
+    # step 3
+    result = a.copy()
+    every = np.arange(len(a))
+    f_a = f(a, every)
+    f_b = f(b, every)
+
+    # step 4 on a working set that shrinks as players converge
+    live = np.flatnonzero(np.abs(b - a) > eps)
+    w_a, w_b = a[live], b[live]
+    w_fa, w_fb = f_a[live], f_b[live]
+    iterations = 0
+    while live.size and iterations < max_iter:
+        iterations += 1
+        c = w_a + ((w_a - w_b) * w_fa) / (w_fb - w_fa)
+        f_c = f(c, live)
+        swap = f_c * w_fb <= 0
+        w_a = np.where(swap, w_b, w_a)
+        w_fa = np.where(swap, w_fb, w_fa / 2.0)
+        w_b, w_fb = c, f_c
+
+        done = np.abs(w_b - w_a) <= eps
+        result[live[done]] = w_a[done]
+        keep = ~done
+        live, w_a, w_b = live[keep], w_a[keep], w_b[keep]
+        w_fa, w_fb = w_fa[keep], w_fb[keep]
+
+    result[live] = w_a
+    if stats is not None:
+        stats.add(
+            len(a),
+            bracket_steps + iterations,
+            np.union1d(pending, live).size,
+        )
+
+    # step 5
+    return np.exp(result / 2)
@@ -0,0 +1,173 @@
+"""Struct-of-arrays storage for per-team rating state."""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .constants import DEFAULT_RATING, DEFAULT_RD, DEFAULT_VOLATILITY
+from .glicko2 import inflate_rd
+
+
+class StateSnapshot(NamedTuple):
+    """Copy of a :class:`TeamRatingState` taken at a period boundary."""
+
+    size: int
+    period: int
+    rating: np.ndarray
+    rd: np.ndarray
+    vol: np.ndarray
+
+
+class TeamRatingState:
+    """
+    Rating, RD and volatility for every known team in contiguous arrays.
+
+    Teams are assigned a dense index in the order they are added. The
+    ``rating``, ``rd`` and ``vol`` properties return writable views of the
+    first ``len(state)`` entries so rating updates can be applied in place.
+
+    Idle teams are not touched every rating period. ``period`` counts the
+    periods closed with :meth:`advance` and each team remembers the period
+    its RD was last brought up to date; :meth:`sync` applies the missed
+    step-6 inflation in closed form before a team's values are read.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        """Create an empty store with room for ``capacity`` teams."""
+        self._size = 0
+        self.period = 0
+        self._rating = np.empty(capacity, dtype=np.float64)
+        self._rd = np.empty(capacity, dtype=np.float64)
+        self._vol = np.empty(capacity, dtype=np.float64)
+        self._last = np.empty(capacity, dtype=np.int64)
+        self.team_ids: list[int] = []
+        self.index: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of known teams."""
+        return self._size
+
+    def __contains__(self, team_id: object) -> bool:
+        """Return whether ``team_id`` has been added to the store."""
+        return team_id in self.index
+
+    @property
+    def rating(self) -> np.ndarray:
+        """Return the ratings of all known teams."""
+        return self._rating[: self._size]
+
+    @property
+    def rd(self) -> np.ndarray:
+        """Return the rating deviations of all known teams."""
+        return self._rd[: self._size]
+
+    @property
+    def vol(self) -> np.ndarray:
+        """Return the volatilities of all known teams."""
+        return self._vol[: self._size]
+
+    @property
+    def last_period(self) -> np.ndarray:
+        """Return the period each team's RD was last brought up to date."""
+        return self._last[: self._size]
+
+    def add(
+        self,
+        team_id: int,
+        rating: float = DEFAULT_RATING,
+        rd: float = DEFAULT_RD,
+        vol: float = DEFAULT_VOLATILITY,
+        period: int | None = None,
+    ) -> int:
+        """
+        Add a team with the given starting values and return its index.
+
+        ``period`` is the period the values are current for and defaults to
+        the current one; older values are inflated on the next :meth:`sync`.
+        """
+        if self._size == len(self._rating):
+            self._grow()
+        idx = self._size
+        self._rating[idx] = rating
+        self._rd[idx] = rd
+        self._vol[idx] = vol
+        self._last[idx] = self.period if period is None else period
+        self.team_ids.append(team_id)
+        self.index[team_id] = idx
+        self._size += 1
+        return idx
+
+    def sync(self, idx: np.ndarray | list[int] | None = None) -> None:
+        """Inflate the RD of teams ``idx`` (default all) for missed periods."""
+        if idx is None:
+            idx = np.arange(self._size)
+        missed = self.period - self._last[idx]
+        stale = missed > 0
+        if stale.any():
+            idx = np.asarray(idx)[stale]
+            self._rd[idx] = inflate_rd(
+                self._rd[idx], self._vol[idx], missed[stale]
+            )
+            self._last[idx] = self.period
+
+    def advance(self, idx: np.ndarray | list[int]) -> None:
+        """Close the current period; ``idx`` are the teams rated in it."""
+        self.period += 1
+        self._last[idx] = self.period
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Return the full state, including pending inflation, as arrays."""
+        return {
+            "team_ids": np.array(self.team_ids, dtype=np.int64),
+            "rating": self.rating.copy(),
+            "rd": self.rd.copy(),
+            "vol": self.vol.copy(),
+            "last_period": self.last_period.copy(),
+            "period": np.array(self.period, dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "TeamRatingState":
+        """Rebuild a store from the output of :meth:`to_arrays`."""
+        team_ids = arrays["team_ids"].tolist()
+        state = cls(capacity=len(team_ids))
+        state._size = len(team_ids)
+        state.period = int(arrays["period"])
+        state.rating[:] = arrays["rating"]
+        state.rd[:] = arrays["rd"]
+        state.vol[:] = arrays["vol"]
+        state.last_period[:] = arrays["last_period"]
+        state.team_ids = team_ids
+        state.index = {team_id: idx for idx, team_id in enumerate(team_ids)}
+        return state
+
+    def snapshot(self) -> StateSnapshot:
+        """Return a copy of the current state with every RD up to date."""
+        self.sync()
+        return StateSnapshot(
+            self._size,
+            self.period,
+            self.rating.copy(),
+            self.rd.copy(),
+            self.vol.copy(),
+        )
+
+    def restore(self, snapshot: StateSnapshot) -> None:
+        """Reset the store to ``snapshot``, forgetting teams added since."""
+        for team_id in self.team_ids[snapshot.size :]:
+            del self.index[team_id]
+        del self.team_ids[snapshot.size :]
+        self._size = snapshot.size
+        self.period = snapshot.period
+        self.rating[:] = snapshot.rating
+        self.rd[:] = snapshot.rd
+        self.vol[:] = snapshot.vol
+        self.last_period[:] = snapshot.period
+
+    def _grow(self) -> None:
+        """Double the capacity of the underlying arrays."""
+        capacity = max(2 * len(self._rating), 1)
+        for name in ("_rating", "_rd", "_vol", "_last"):
+            grown = np.empty(capacity, dtype=getattr(self, name).dtype)
+            grown[: self._size] = getattr(self, name)[: self._size]
+            setattr(self, name, grown)
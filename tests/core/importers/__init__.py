@@ -0,0 +1 @@
+"""Tests for the CFBD import helpers."""
@@ -0,0 +1,121 @@
+"""Tests for the CFBD response cache."""
+
+import tempfile
+import time
+from datetime import UTC, date, datetime
+from unittest import TestCase, mock
+
+import cfbd
+
+from core.importers.cache import (
+    CACHE_TTLS,
+    CachedApi,
+    OfflineCacheError,
+    ResponseCache,
+    current_season,
+)
+
+
+def _game(game_id: int, season: int) -> cfbd.Game:
+    fields = dict.fromkeys(cfbd.Game.__fields__)
+    fields.update(
+        id=game_id,
+        season=season,
+        week=1,
+        season_type=cfbd.SeasonType.REGULAR,
+        start_date=datetime(season, 9, 1, 19, 30, tzinfo=UTC),
+        start_time_tbd=False,
+        completed=True,
+        neutral_site=False,
+        conference_game=False,
+        home_id=1,
+        home_team="Georgia Tech",
+        home_classification=cfbd.DivisionClassification.FBS,
+        home_points=28,
+        home_line_scores=[7, 7, 7, 7],
+        away_id=2,
+        away_team="Georgia",
+        away_points=14,
+    )
+    return cfbd.Game(**fields)
+
+
+class ResponseCacheTests(TestCase):
+    """Behavior tests for :class:`ResponseCache` and :class:`CachedApi`."""
+
+    def setUp(self) -> None:
+        """Create a cache in a temporary directory with a fake clock."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.now = time.time()
+        self.cache = ResponseCache(self.directory, clock=self._clock)
+        self.games = {2000: [_game(1, 2000)], 2099: [_game(2, 2099)]}
+        self.api = mock.Mock()
+        self.api.get_games.side_effect = lambda year, season_type: self.games[
+            year
+        ]
+
+    def _clock(self) -> float:
+        return self.now
+
+    def _get_games(self, cache: ResponseCache, year: int) -> list:
+        return CachedApi(self.api, cache).get_games(
+            year=year, season_type=cfbd.SeasonType.BOTH
+        )
+
+    def test_current_season(self) -> None:
+        """Seasons stay current through the bowl games in January."""
+        self.assertEqual(current_season(date(2025, 1, 20)), 2024)
+        self.assertEqual(current_season(date(2025, 3, 1)), 2025)
+        self.assertGreaterEqual(current_season(), 2025)
+
+    def test_hit_rebuilds_the_stored_models(self) -> None:
+        """A second call is served from disk with equal models."""
+        self.now += 1e9
+        first = self._get_games(self.cache, 2000)
+        second = self._get_games(self.cache, 2000)
+        self.assertEqual(self.api.get_games.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(second[0].start_date, self.games[2000][0].start_date)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertIs(
+            CachedApi(self.api, self.cache).api_client, self.api.api_client
+        )
+
+    def test_current_season_expires(self) -> None:
+        """Current-season responses are fetched again after their TTL."""
+        self._get_games(self.cache, 2099)
+        self.now += CACHE_TTLS["get_games"] - 1
+        self._get_games(self.cache, 2099)
+        self.assertEqual(self.api.get_games.call_count, 1)
+        self.now += 2
+        self._get_games(self.cache, 2099)
+        self.assertEqual(self.api.get_games.call_count, 2)
+
+    def test_offline_replays_stale_and_rejects_missing(self) -> None:
+        """Offline every stored response is served and misses raise."""
+        self._get_games(self.cache, 2099)
+        self.now += 1e9
+        offline = ResponseCache(self.directory, offline=True, clock=self._clock)
+        self.assertEqual(self._get_games(offline, 2099), self.games[2099])
+        with self.assertRaises(OfflineCacheError):
+            self._get_games(offline, 2000)
+        self.assertEqual(self.api.get_games.call_count, 1)
+
+    def test_parameters_select_the_file(self) -> None:
+        """Different parameters are cached separately."""
+        params = {"year": 2000, "season_type": cfbd.SeasonType.BOTH}
+        path = self.cache.path("get_games", params)
+        self.assertEqual(
+            path, self.cache.path("get_games", dict(reversed(params.items())))
+        )
+        self.assertNotEqual(
+            path, self.cache.path("get_games", {**params, "year": 2001})
+        )
+        self.assertEqual(path.parent.name, "get_games")
+
+    def test_put_rejects_unknown_types(self) -> None:
+        """Only JSON values and dates can be stored."""
+        with self.assertRaises(TypeError):
+            self.cache.put("get_games", {}, [object()])
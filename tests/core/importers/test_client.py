@@ -0,0 +1,168 @@
+"""Tests for the rate-limited, retrying CFBD client."""
+
+import threading
+from types import SimpleNamespace
+from unittest import TestCase
+
+from cfbd.rest import ApiException
+
+from core.importers.client import ResilientClient, TokenBucket, retry_after
+
+
+class FakeClock:
+    """A clock that only moves when the code under test sleeps."""
+
+    def __init__(self) -> None:
+        """Start at zero with no sleeps."""
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Record ``seconds`` and advance the clock by them."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeApi:
+    """An API whose ``get_games`` fails with the statuses queued per year."""
+
+    def __init__(self, failures: dict[int, list[int]]) -> None:
+        """Fail each year's calls with ``failures[year]`` in turn."""
+        self.failures = failures
+        self.calls: list[int] = []
+        self.api_client = object()
+
+    def get_games(self, year: int) -> list[int]:
+        """Return ``[year]`` or raise the next injected error."""
+        self.calls.append(year)
+        statuses = self.failures.get(year)
+        if statuses:
+            raise ApiException(status=statuses.pop(0), reason="Injected")
+        return [year]
+
+
+class TokenBucketTests(TestCase):
+    """Behavior tests for :class:`TokenBucket`."""
+
+    def test_burst_then_rate(self) -> None:
+        """A full bucket allows ``burst`` calls, then one per interval."""
+        clock = FakeClock()
+        bucket = TokenBucket(2, burst=3, clock=clock, sleep=clock.sleep)
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(waits, [0, 0, 0, 0.5, 0.5])
+        self.assertEqual((bucket.waits, bucket.wait_seconds), (2, 1.0))
+        clock.now += 10
+        self.assertEqual(bucket.acquire(), 0)
+
+    def test_concurrent_callers_reserve_tokens(self) -> None:
+        """Callers waiting at once are spaced out by the rate."""
+        clock = FakeClock()
+        lock = threading.Lock()
+        bucket = TokenBucket(10, clock=clock, sleep=lambda seconds: None)
+        waits = []
+
+        def acquire() -> None:
+            wait = bucket.acquire()
+            with lock:
+                waits.append(wait)
+
+        threads = [threading.Thread(target=acquire) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+            sorted(round(wait, 6) for wait in waits), [0, 0.1, 0.2, 0.3]
+        )
+
+    def test_rate_must_be_positive(self) -> None:
+        """A bucket without a rate is rejected."""
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class ResilientClientTests(TestCase):
+    """Behavior tests for :class:`ResilientClient` on a fake API."""
+
+    def setUp(self) -> None:
+        """Create a client with a fake clock and no jitter."""
+        self.clock = FakeClock()
+        self.client = ResilientClient(
+            limiter=TokenBucket(
+                1, burst=1, clock=self.clock, sleep=self.clock.sleep
+            ),
+            retries=3,
+            backoff=1.0,
+            max_backoff=3.0,
+            sleep=self.clock.sleep,
+            jitter=lambda: 1.0,
+        )
+
+    def test_transient_errors_are_retried_with_backoff(self) -> None:
+        """429 and 5xx responses are retried with a capped backoff."""
+        api = FakeApi({2000: [429, 503, 500]})
+        wrapped = self.client.wrap(api)
+        self.assertEqual(wrapped.get_games(year=2000), [2000])
+        self.assertEqual(api.calls, [2000] * 4)
+        self.assertIs(wrapped.api_client, api.api_client)
+        self.assertEqual(self.clock.sleeps, [1.0, 2.0, 3.0])
+        self.assertEqual(
+            self.client.summary(),
+            "4 requests, 3 retries (6.00s backoff), 0 failures; "
+            "throttled 0 times for 0.00s",
+        )
+
+    def test_gives_up_after_retries(self) -> None:
+        """The last transient error is raised once retries run out."""
+        api = FakeApi({2000: [502] * 5})
+        with self.assertRaises(ApiException) as raised:
+            self.client.wrap(api).get_games(year=2000)
+        self.assertEqual(raised.exception.status, 502)
+        self.assertEqual(len(api.calls), 4)
+        self.assertEqual(self.client.failures, 1)
+
+    def test_client_errors_are_not_retried(self) -> None:
+        """Other statuses and exceptions fail at once."""
+        api = FakeApi({2000: [404]})
+        with self.assertRaises(ApiException):
+            self.client.wrap(api).get_games(year=2000)
+        self.assertEqual(api.calls, [2000])
+        with self.assertRaises(TypeError):
+            self.client.call(int, base="boom")
+        self.assertEqual(self.client.retried, 0)
+
+    def test_requests_are_throttled(self) -> None:
+        """Requests beyond the burst wait for the bucket."""
+        api = self.client.wrap(FakeApi({}))
+        for year in range(3):
+            api.get_games(year=year)
+        self.assertEqual(self.clock.sleeps, [1.0, 1.0])
+        self.assertIn("throttled 2 times for 2.00s", self.client.summary())
+
+    def test_retry_after_header_is_honoured(self) -> None:
+        """A longer ``Retry-After`` replaces the computed backoff."""
+        error = ApiException(
+            http_resp=SimpleNamespace(
+                status=429,
+                reason="Too Many Requests",
+                data=b"",
+                getheaders=lambda: {"Retry-After": "7"},
+            )
+        )
+        self.assertEqual(retry_after(error), 7.0)
+        self.assertEqual(retry_after(ApiException(status=429)), 0.0)
+        calls = iter([error])
+
+        def get_games() -> list:
+            for raised in calls:
+                raise raised
+            return []
+
+        client = ResilientClient(sleep=self.clock.sleep, jitter=lambda: 1.0)
+        self.assertEqual(client.call(get_games), [])
+        self.assertEqual(self.clock.sleeps, [7.0])
+        self.assertIn("throttled 0 times", client.summary())
@@ -0,0 +1,168 @@
+"""Tests for concurrent in-order fetching."""
+
+import threading
+import time
+from unittest import TestCase, mock
+
+from core.importers.fetch import (
+    FetchPipeline,
+    PipelineStats,
+    fetch_in_order,
+    pipeline_task,
+)
+
+
+class FetchInOrderTests(TestCase):
+    """Behavior tests for :func:`fetch_in_order`."""
+
+    def test_sequential_fetch_runs_on_caller_thread(self) -> None:
+        """Without concurrency every fetch runs on the calling thread."""
+        threads = set()
+
+        def fetch(key: int) -> int:
+            threads.add(threading.get_ident())
+            return key * 2
+
+        self.assertEqual(
+            list(fetch_in_order(fetch, [3, 1, 2])), [(3, 6), (1, 2), (2, 4)]
+        )
+        self.assertEqual(threads, {threading.get_ident()})
+
+    def test_concurrent_fetch_keeps_key_order(self) -> None:
+        """Fetches overlap but results are yielded in key order."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fetch(key: int) -> int:
+            if key < 3:
+                barrier.wait()
+            time.sleep((10 - key) / 1000)
+            return key
+
+        results = list(fetch_in_order(fetch, range(10), concurrency=3))
+        self.assertEqual(results, [(key, key) for key in range(10)])
+
+    def test_concurrent_fetch_bounds_lookahead(self) -> None:
+        """No more than twice ``concurrency`` keys are fetched ahead."""
+        started = []
+
+        def fetch(key: int) -> int:
+            started.append(key)
+            return key
+
+        results = fetch_in_order(fetch, range(20), concurrency=2)
+        next(results)
+        time.sleep(0.05)
+        self.assertLessEqual(len(started), 4)
+        results.close()
+
+    def test_error_is_raised_in_order_and_cancels_rest(self) -> None:
+        """A failed fetch raises at its key and later fetches are dropped."""
+        started = []
+        lock = threading.Lock()
+
+        def fetch(key: int) -> int:
+            with lock:
+                started.append(key)
+            if key == 1:
+                raise ValueError(key)
+            time.sleep(0.01)
+            return key
+
+        results = fetch_in_order(fetch, range(100), concurrency=2)
+        self.assertEqual(next(results), (0, 0))
+        with self.assertRaises(ValueError):
+            next(results)
+        self.assertLess(len(started), 10)
+
+    def test_lookahead_fetches_off_the_caller_thread(self) -> None:
+        """An explicit lookahead fetches on a worker and records stats."""
+        threads = set()
+
+        def fetch(key: int) -> int:
+            threads.add(threading.get_ident())
+            return key
+
+        stats = PipelineStats(queue_size=3)
+        results = list(
+            fetch_in_order(fetch, range(5), lookahead=3, stats=stats)
+        )
+        self.assertEqual(results, [(key, key) for key in range(5)])
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertEqual(stats.fetched, 5)
+        self.assertLessEqual(stats.max_depth, 3)
+        self.assertRegex(
+            stats.summary(),
+            r"^fetched 5 responses in .*queue depth mean [\d.]+, max \d/3$",
+        )
+
+    def test_empty_stats_summary(self) -> None:
+        """A summary without fetches reports zero rates."""
+        self.assertIn(
+            "fetched 0 responses", PipelineStats(queue_size=1).summary()
+        )
+
+
+class FetchPipelineTests(TestCase):
+    """Behavior tests for :class:`FetchPipeline`."""
+
+    def setUp(self) -> None:
+        """Create an API whose endpoints echo their parameters."""
+        self.api = mock.Mock()
+        self.api.get_games.side_effect = lambda year: [year]
+        self.api.get_venues.return_value = ["venue"]
+
+    def test_wrapped_calls_read_the_queue(self) -> None:
+        """Queued calls are answered in order without calling the API."""
+        pipeline = FetchPipeline(
+            [
+                pipeline_task(self.api, "get_venues"),
+                *(pipeline_task(self.api, "get_games", year=y) for y in (1, 2)),
+            ],
+            workers=2,
+            queue_size=2,
+        )
+        api = pipeline.wrap(self.api)
+        self.assertEqual(api.get_venues(), ["venue"])
+        self.assertEqual(api.get_games(year=1), [1])
+        self.assertEqual(api.get_games(year=2), [2])
+        pipeline.close()
+        self.assertEqual(self.api.get_games.call_count, 2)
+        self.assertEqual(pipeline.stats.fetched, 3)
+
+    def test_skipped_results_are_dropped(self) -> None:
+        """Taking a later key drops earlier results; unknown keys fetch."""
+        pipeline = FetchPipeline(
+            [pipeline_task(self.api, "get_games", year=y) for y in (1, 2, 3)]
+        )
+        api = pipeline.wrap(self.api)
+        self.assertEqual(api.get_games(year=2), [2])
+        self.assertEqual(api.get_games(year=1), [1])
+        self.assertEqual(api.get_games(year=3), [3])
+        self.assertEqual(api.get_games(year=4), [4])
+        pipeline.close()
+        self.assertEqual(self.api.get_games.call_count, 5)
+
+    def test_closed_pipeline_fetches_directly(self) -> None:
+        """After :meth:`FetchPipeline.close` calls go to the API."""
+        pipeline = FetchPipeline([pipeline_task(self.api, "get_games", year=1)])
+        pipeline.close()
+        self.assertEqual(pipeline.wrap(self.api).get_games(year=1), [1])
+
+    def test_failed_call_raises_when_taken(self) -> None:
+        """A failed fetch raises for its key only."""
+
+        def get_games(year: int) -> list[int]:
+            if year == 1:
+                raise ValueError(year)
+            return [year]
+
+        self.api.get_games.side_effect = get_games
+        pipeline = FetchPipeline(
+            [pipeline_task(self.api, "get_games", year=y) for y in (1, 2)],
+            workers=2,
+        )
+        api = pipeline.wrap(self.api)
+        with self.assertRaises(ValueError):
+            api.get_games(year=1)
+        self.assertEqual(api.get_games(year=2), [2])
+        pipeline.close()
@@ -0,0 +1,140 @@
+"""Tests for importing CFBD dumps from files."""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import cfbd
+
+from core.importers.source import DumpApi, SourceError, iter_records
+
+
+def _game(game_id: int, season: int) -> dict:
+    """Return a game record as the API serves it."""
+    return {
+        "id": game_id,
+        "season": season,
+        "week": 1,
+        "seasonType": "regular",
+        "startDate": f"{season}-09-01T19:30:00.000Z",
+        "startTimeTBD": False,
+        "completed": True,
+        "neutralSite": False,
+        "conferenceGame": False,
+        "homeId": 1,
+        "homeTeam": "Georgia Tech",
+        "homePoints": 28,
+        "awayId": 2,
+        "awayTeam": "Georgia",
+        "awayPoints": 14,
+    }
+
+
+class IterRecordsTests(TestCase):
+    """Behavior tests for :func:`iter_records`."""
+
+    def setUp(self) -> None:
+        """Create a temporary directory for dump files."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.records = [{"id": i, "name": f"Venue {i}" * i} for i in range(5)]
+
+    def test_json_array_is_read_in_chunks(self) -> None:
+        """Array elements spanning several reads are decoded whole."""
+        path = self.directory / "venues.json"
+        path.write_text(json.dumps(self.records, indent=2))
+        self.assertEqual(list(iter_records(path, chunk_size=7)), self.records)
+        path.write_text(" [ ] ")
+        self.assertEqual(list(iter_records(path)), [])
+
+    def test_jsonl_skips_blank_lines(self) -> None:
+        """Each non-blank line is one record."""
+        path = self.directory / "venues.jsonl"
+        path.write_text(
+            "\n".join(json.dumps(record) for record in self.records) + "\n\n"
+        )
+        self.assertEqual(list(iter_records(path)), self.records)
+
+    def test_malformed_arrays_raise(self) -> None:
+        """Non-array and truncated JSON dumps raise :class:`SourceError`."""
+        path = self.directory / "venues.json"
+        path.write_text('{"id": 1}')
+        with self.assertRaisesRegex(SourceError, "does not hold a JSON array"):
+            list(iter_records(path))
+        path.write_text(json.dumps(self.records)[:-10])
+        with self.assertRaisesRegex(SourceError, "venues.json: "):
+            list(iter_records(path, chunk_size=16))
+        path.write_text('[{"id":1,')
+        with self.assertRaises(SourceError):
+            list(iter_records(path))
+
+    def test_malformed_jsonl_line_raises(self) -> None:
+        """A bad JSONL line raises :class:`SourceError` naming the line."""
+        path = self.directory / "venues.jsonl"
+        path.write_text('{"id": 1}\n\n{"id": 2,\n')
+        records = iter_records(path)
+        self.assertEqual(next(records), {"id": 1})
+        with self.assertRaisesRegex(SourceError, "venues.jsonl, line 3: "):
+            next(records)
+
+
+class DumpApiTests(TestCase):
+    """Behavior tests for :class:`DumpApi`."""
+
+    def setUp(self) -> None:
+        """Create a dump directory with two seasons of games."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        games = self.directory / "games"
+        games.mkdir()
+        (games / "2022.jsonl").write_text(json.dumps(_game(1, 2022)))
+        (games / "2023.json").write_text(json.dumps([_game(2, 2023)]))
+        (games / "notes.json").write_text("[]")
+        (games / "2024.jsonc").write_text("")
+        self.api = DumpApi(self.directory)
+
+    def test_games_are_rebuilt_into_models(self) -> None:
+        """Season dumps in either format become :class:`cfbd.Game`."""
+        self.assertEqual(self.api.seasons(), [2022, 2023])
+        (game,) = self.api.get_games(year=2023, season_type="both")
+        self.assertIsInstance(game, cfbd.Game)
+        self.assertEqual(game.season_type, cfbd.SeasonType.REGULAR)
+        self.assertEqual(next(self.api.get_games(year=2022)).home_points, 28)
+
+    def test_records_are_streamed(self) -> None:
+        """Records are rebuilt as they are read, not loaded up front."""
+        (self.directory / "games" / "2022.jsonl").write_text(
+            json.dumps(_game(1, 2022)) + "\n{not json\n"
+        )
+        games = self.api.get_games(year=2022)
+        self.assertEqual(next(games).id, 1)
+        with self.assertRaises(SourceError):
+            next(games)
+
+    def test_missing_dump_raises(self) -> None:
+        """Reading a dump that does not exist raises :class:`SourceError`."""
+        with self.assertRaisesRegex(SourceError, "No games/2021 dump"):
+            self.api.get_games(year=2021)
+        with self.assertRaises(SourceError):
+            self.api.get_venues()
+
+    def test_reference_dumps(self) -> None:
+        """Venues, conferences and teams are read from their own dumps."""
+        (self.directory / "venues.json").write_text('[{"id": 1, "name": "X"}]')
+        (self.directory / "conferences.jsonl").write_text(
+            '{"id": 2, "name": "ACC", "shortName": "ACC"}'
+        )
+        (self.directory / "teams.json").write_text(
+            '[{"id": 3, "school": "GT", "location": {"id": 1}}]'
+        )
+        self.assertEqual(next(self.api.get_venues()).name, "X")
+        self.assertEqual(next(self.api.get_conferences()).short_name, "ACC")
+        teams = self.api.get_teams(conference=None, year=None)
+        self.assertEqual(next(teams).location.id, 1)
+        with self.assertRaises(SourceError):
+            self.api.get_teams(conference="ACC")
+        with self.assertRaises(SourceError):
+            self.api.get_teams(year=2023)
@@ -0,0 +1,125 @@
+"""Tests for the bulk upsert helper."""
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+
+from core.importers.upsert import UpsertCounts, sync_children, upsert
+from core.models.team import Team, TeamLogo
+from core.models.venue import Venue
+
+FIELDS = ("name", "city", "state", "capacity")
+
+
+def _venue(pk: int, name: str, capacity: int | None = None) -> Venue:
+    return Venue(
+        id=pk, name=name, city="Atlanta", state="GA", capacity=capacity
+    )
+
+
+def _stored() -> list[tuple]:
+    return list(Venue.objects.order_by("id").values_list("id", *FIELDS))
+
+
+class UpsertTests(TestCase):
+    """Behavior tests for :func:`upsert`."""
+
+    def test_counts_and_writes(self) -> None:
+        """New rows are inserted, changed rows updated, the rest skipped."""
+        self.assertEqual(upsert([], FIELDS), UpsertCounts(0, 0, 0))
+        self.assertEqual(
+            upsert([_venue(1, "A"), _venue(2, "B")], FIELDS),
+            UpsertCounts(2, 0, 0),
+        )
+
+        changed = []
+        with self.assertNumQueries(4):
+            counts = upsert(
+                [_venue(1, "A"), _venue(2, "B", 100), _venue(3, "C")],
+                FIELDS,
+                changed_pks=changed,
+            )
+        self.assertEqual(sorted(changed), [2, 3])
+        self.assertEqual(counts, UpsertCounts(1, 1, 1))
+        self.assertEqual(str(counts), "1 inserted, 1 updated, 1 unchanged")
+        self.assertEqual(
+            _stored(),
+            [
+                (1, "A", "Atlanta", "GA", None),
+                (2, "B", "Atlanta", "GA", 100),
+                (3, "C", "Atlanta", "GA", None),
+            ],
+        )
+
+        with self.assertNumQueries(1):
+            counts = upsert([_venue(1, "A"), _venue(3, "C")], FIELDS)
+        self.assertEqual(counts, UpsertCounts(0, 0, 2))
+        self.assertEqual(
+            counts.plus(UpsertCounts(1, 2, 3)), UpsertCounts(1, 2, 5)
+        )
+
+    def test_last_duplicate_wins(self) -> None:
+        """A repeated key is written once with its last values."""
+        counts = upsert([_venue(1, "A"), _venue(1, "B")], FIELDS)
+        self.assertEqual(counts, UpsertCounts(1, 0, 0))
+        self.assertEqual(Venue.objects.get().name, "B")
+
+    def test_fallback_without_conflict_target(self) -> None:
+        """Backends without conflict targets use bulk_update instead."""
+        upsert([_venue(pk, "old") for pk in range(1, 4)], FIELDS)
+        with mock.patch.object(
+            connection.features, "supports_update_conflicts_with_target", False
+        ):
+            counts = upsert(
+                [_venue(1, "old"), _venue(2, "new"), _venue(4, "D")], FIELDS
+            )
+        self.assertEqual(counts, UpsertCounts(1, 1, 1))
+        self.assertEqual(
+            [name for _, name, *_ in _stored()], ["old", "new", "old", "D"]
+        )
+
+    def test_reads_stored_rows_in_batches(self) -> None:
+        """Stored rows are read within the backend's parameter limit."""
+        upsert([_venue(pk, "old") for pk in range(1, 6)], FIELDS)
+        with (
+            mock.patch.object(connection.features, "max_query_params", 2),
+            self.assertNumQueries(3),
+        ):
+            counts = upsert([_venue(pk, "old") for pk in range(1, 6)], FIELDS)
+        self.assertEqual(counts, UpsertCounts(0, 0, 5))
+
+
+class SyncChildrenTests(TestCase):
+    """Behavior tests for :func:`sync_children`."""
+
+    def test_sync_adds_and_removes_rows(self) -> None:
+        """Listed parents match the payload; other parents are untouched."""
+        a, b = (
+            Team.objects.create(
+                school=school, color="#000000", alternate_color="#ffffff"
+            )
+            for school in ("A", "B")
+        )
+        TeamLogo.objects.bulk_create(
+            [
+                TeamLogo(team=a, url="x"),
+                TeamLogo(team=a, url="x"),
+                TeamLogo(team=a, url="y"),
+                TeamLogo(team=b, url="z"),
+            ]
+        )
+
+        with self.assertNumQueries(5):
+            added, removed = sync_children(
+                TeamLogo, "team", "url", {a.id: ["x", "w", "w"]}
+            )
+        self.assertEqual((added, removed), (1, 2))
+        self.assertEqual(
+            list(TeamLogo.objects.order_by("id").values_list("team", "url")),
+            [(a.id, "x"), (b.id, "z"), (a.id, "w")],
+        )
+        self.assertEqual(
+            sync_children(TeamLogo, "team", "url", {a.id: ["x", "w"]}),
+            (0, 0),
+        )
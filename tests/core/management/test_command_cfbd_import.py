@@ -1,21 +1,32 @@
 """Tests for the CFBD import management command."""
 
 import io
+import json
+import re
+import tempfile
+import threading
 from argparse import ArgumentParser
 from datetime import date, datetime
 from importlib import import_module
+from pathlib import Path
 from types import SimpleNamespace as Namespace
 from unittest.mock import MagicMock, patch
 
 import cfbd
 from cfbd.rest import ApiException
 from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
+from core.importers.cache import CachedApi
+from core.importers.client import ResilientApi, ResilientClient
+from core.importers.upsert import UpsertCounts
 from core.models.conference import Conference
+from core.models.import_state import ImportState
 from core.models.match import Match
-from core.models.team import Team
+from core.models.team import Team, TeamLogo
 from core.models.venue import Venue
 
 Command = import_module("core.management.commands.cfbd_import").Command
@@ -135,6 +146,11 @@ class ImportCommandTests(TestCase):
         self.assertIsNone(args.year)
         self.assertEqual(args.start_year, 1869)
         self.assertEqual(args.end_year, date.today().year)
+        self.assertEqual(args.concurrency, 1)
+        self.assertFalse(args.pipeline)
+        self.assertEqual((args.rate_limit, args.burst), (10.0, 5))
+        self.assertEqual((args.retries, args.backoff), (3, 1.0))
+        self.assertEqual(args.queue_size, 8)
 
     def test_import_venues(self) -> None:
         """``import_venues`` creates and updates :class:`Venue` records."""
@@ -197,6 +213,68 @@ class ImportCommandTests(TestCase):
         self.assertEqual(t1.logos.count(), 2)
         self.assertEqual(t1.alternative_names.count(), 2)
 
+    def test_import_teams_syncs_related_rows_and_slugs(self) -> None:
+        """Stale logos and names are removed and slugs stay unique."""
+        self._import_prerequisites()
+        teams = self._teams_payload()
+        api = self._ns(get_teams=lambda conference=None, year=None: teams)
+        counts = self.command.import_teams(api)
+        self.assertEqual(counts, UpsertCounts(3, 0, 0))
+
+        teams[0].logos = ["logo2", "logo3"]
+        teams[0].alternate_names = None
+        teams[1].school = "Georgia Tech"
+        teams[2].logos = ["logo4"]
+        counts = self.command.import_teams(api)
+        self.assertEqual(counts, UpsertCounts(0, 1, 2))
+        self.assertIn(
+            "logos: 2 added, 1 removed; alternative names: 0 added, 2 removed",
+            self.command.stdout.getvalue(),
+        )
+        t1, t2, t3 = Team.objects.order_by("id")
+        self.assertEqual(
+            list(t1.logos.order_by("id").values_list("url", flat=True)),
+            ["logo2", "logo3"],
+        )
+        self.assertEqual(t1.alternative_names.count(), 0)
+        self.assertEqual(
+            list(t3.logos.values_list("url", flat=True)), ["logo4"]
+        )
+        self.assertEqual(t1.slug, "georgia-tech")
+        self.assertEqual(t2.slug, "georgia-tech-1")
+
+    def test_import_teams_query_count_is_constant(self) -> None:
+        """The team import does not query once per team."""
+        self._import_prerequisites()
+
+        def payload(first: int, count: int) -> list[Namespace]:
+            return [
+                self._ns(
+                    id=team_id,
+                    school=f"School {team_id}",
+                    mascot=None,
+                    abbreviation=None,
+                    conference="ACC",
+                    classification="fbs",
+                    color="#000000",
+                    alternate_color="#FFFFFF",
+                    twitter=None,
+                    location=self._ns(id=1),
+                    logos=[f"logo{team_id}", f"dark{team_id}"],
+                    alternate_names=[f"Alt {team_id}"],
+                )
+                for team_id in range(first, first + count)
+            ]
+
+        queries = []
+        for teams in (payload(1, 2), payload(100, 40)):
+            api = self._ns(get_teams=MagicMock(return_value=teams))
+            with CaptureQueriesContext(connection) as captured:
+                self.command.import_teams(api)
+            queries.append(len(captured))
+        self.assertEqual(queries[0], queries[1])
+        self.assertEqual(TeamLogo.objects.count(), 84)
+
     def test_import_games(self) -> None:
         """``import_games`` creates and updates :class:`Match` records."""
         self._import_prerequisites()
@@ -250,7 +328,8 @@ class ImportCommandTests(TestCase):
             ]
         }
         api = self._ns(get_games=lambda year, season_type: games_by_year[year])
-        self.command.import_games(api, start_year=2023, end_year=2023)
+        counts = self.command.import_games(api, start_year=2023, end_year=2023)
+        self.assertEqual(counts, UpsertCounts(2, 0, 0))
 
         m1 = Match.objects.get(id=10)
         m2 = Match.objects.get(id=11)
@@ -268,11 +347,164 @@ class ImportCommandTests(TestCase):
         # Update score
         games_by_year[2023][0].home_points = 30
         games_by_year[2023][0].away_points = 20
-        self.command.import_games(api, start_year=2023, end_year=2023)
+        counts = self.command.import_games(api, start_year=2023, end_year=2023)
+        self.assertEqual(counts, UpsertCounts(0, 1, 1))
+        self.assertIn(
+            "Season 2023 games: 0 inserted, 1 updated, 1 unchanged.",
+            self.command.stdout.getvalue(),
+        )
         m1.refresh_from_db()
         self.assertEqual(m1.home_score, 30)
         self.assertEqual(m1.away_score, 20)
 
+    def test_import_games_concurrently_writes_in_season_order(self) -> None:
+        """Seasons fetched in parallel are still written in year order."""
+        self._import_prerequisites()
+        self._import_sample_teams()
+        writer = threading.get_ident()
+        fetchers = set()
+
+        def get_games(year: int, season_type: cfbd.SeasonType) -> list:
+            fetchers.add(threading.get_ident())
+            return [
+                self._ns(
+                    id=year,
+                    season=year,
+                    week=1,
+                    season_type=cfbd.SeasonType.REGULAR,
+                    start_date=datetime(year, 9, 1),
+                    completed=True,
+                    venue_id=1,
+                    neutral_site=False,
+                    attendance=None,
+                    home_id=1,
+                    home_classification=None,
+                    home_conference="ACC",
+                    home_points=21,
+                    home_team="Georgia Tech",
+                    away_id=2,
+                    away_classification=None,
+                    away_conference="ACC",
+                    away_points=7,
+                    away_team="Georgia",
+                )
+            ]
+
+        self.command.import_games(
+            self._ns(get_games=get_games),
+            start_year=2018,
+            end_year=2023,
+            concurrency=3,
+        )
+
+        self.assertNotIn(writer, fetchers)
+        self.assertEqual(
+            list(Match.objects.order_by("id").values_list("season", flat=True)),
+            list(range(2018, 2024)),
+        )
+        seasons = re.findall(
+            r"Match .*? \((\d+)\) imported", self.command.stdout.getvalue()
+        )
+        self.assertEqual(seasons, [str(year) for year in range(2018, 2024)])
+
+    def _game(
+        self, game_id: int, season: int, *, completed: bool = True
+    ) -> Namespace:
+        """Return a game payload between the first two sample teams."""
+        return self._ns(
+            id=game_id,
+            season=season,
+            week=1,
+            season_type=cfbd.SeasonType.REGULAR,
+            start_date=datetime(season, 9, 1),
+            completed=completed,
+            venue_id=1,
+            neutral_site=False,
+            attendance=None,
+            home_id=1,
+            home_classification=None,
+            home_conference="ACC",
+            home_points=21 if completed else None,
+            home_team="Georgia Tech",
+            away_id=2,
+            away_classification=None,
+            away_conference="ACC",
+            away_points=7 if completed else None,
+            away_team="Georgia",
+        )
+
+    def test_import_games_delta(self) -> None:
+        """Delta imports skip settled seasons and unchanged payloads."""
+        self._import_prerequisites()
+        self._import_sample_teams()
+        games_by_year = {
+            2022: [self._game(1, 2022)],
+            2023: [self._game(2, 2023), self._game(3, 2023, completed=False)],
+        }
+        api = self._ns(
+            get_games=MagicMock(
+                side_effect=lambda year, season_type: games_by_year[year]
+            )
+        )
+        self.command.import_games(api, start_year=2022, end_year=2023)
+        self.assertEqual(self.command.changed_match_ids, [1, 2, 3])
+        state = ImportState.objects.get(season=2023)
+        self.assertEqual((state.game_count, state.completed_count), (2, 1))
+
+        api.get_games.reset_mock()
+        counts = self.command.import_games(
+            api, start_year=2022, end_year=2023, delta=True
+        )
+        self.assertEqual(
+            [call.kwargs["year"] for call in api.get_games.call_args_list],
+            [2023],
+        )
+        self.assertEqual(counts, UpsertCounts(0, 0, 2))
+        self.assertEqual(self.command.changed_match_ids, [])
+        self.assertIn(
+            "Season 2023 games: payload unchanged, 2 skipped.",
+            self.command.stdout.getvalue(),
+        )
+
+        games_by_year[2023][1] = self._game(3, 2023)
+        counts = self.command.import_games(
+            api, start_year=2022, end_year=2023, delta=True
+        )
+        self.assertEqual(counts, UpsertCounts(0, 1, 1))
+        self.assertEqual(self.command.changed_match_ids, [3])
+        self.assertTrue(Match.objects.get(id=3).completed)
+        state.refresh_from_db()
+        self.assertEqual(state.completed_count, 2)
+
+    def test_import_games_skips_failed_seasons(self) -> None:
+        """A season that keeps failing is reported and the rest imported."""
+        self._import_prerequisites()
+        self._import_sample_teams()
+        client = ResilientClient(retries=2, sleep=lambda seconds: None)
+
+        def get_games(year: int, season_type: cfbd.SeasonType) -> list:
+            if year == 2022:
+                raise ApiException(status=503, reason="Service Unavailable")
+            return [self._game(year, year)]
+
+        api = client.wrap(self._ns(get_games=get_games))
+        counts = self.command.import_games(
+            api, start_year=2021, end_year=2023, concurrency=2
+        )
+
+        self.assertEqual(counts, UpsertCounts(2, 0, 0))
+        self.assertEqual(self.command.failed_seasons, [2022])
+        self.assertEqual(client.retried, 2)
+        self.assertEqual(
+            list(ImportState.objects.values_list("season", flat=True)),
+            [2021, 2023],
+        )
+        errors = self.command.stderr.getvalue()
+        self.assertIn(
+            "Season 2022 games failed: (503) Service Unavailable", errors
+        )
+        self.assertIn("Skipped 1 failed seasons: 2022", errors)
+
     @patch("core.management.commands.cfbd_import.load_dotenv")
     def test_handle_requires_api_key(self, mock_load_dotenv: MagicMock) -> None:
         """``handle`` raises :class:`CommandError` when API key is missing."""
@@ -352,4 +584,282 @@ class ImportCommandTests(TestCase):
         self.command.import_conferences.assert_called_once()
         self.command.import_teams.assert_called_once()
         self.command.import_games.assert_called_once()
+        self.assertEqual(
+            self.command.import_games.call_args.kwargs["concurrency"], 1
+        )
+        self.assertIn("0 matches changed.", self.command.stdout.getvalue())
         self.assertIn("Total import completed", self.command.stdout.getvalue())
+
+    @patch("core.management.commands.cfbd_import.cfbd.ApiClient")
+    def test_handle_concurrency(self, mock_client: MagicMock) -> None:
+        """``--concurrency`` is validated and sizes the connection pool."""
+        mock_client.return_value.__enter__.return_value = object()
+        mock_client.return_value.__exit__.return_value = False
+        self.command.import_venues = MagicMock()
+        self.command.import_conferences = MagicMock()
+        self.command.import_teams = MagicMock()
+        self.command.import_games = MagicMock()
+
+        with patch.dict("os.environ", {"CFBD_API_KEY": "token"}):
+            with self.assertRaises(CommandError):
+                self.command.handle(
+                    start_year=2023, end_year=2023, concurrency=0
+                )
+            self.command.handle(start_year=2023, end_year=2023, concurrency=64)
+
+        configuration = mock_client.call_args.args[0]
+        self.assertEqual(configuration.connection_pool_maxsize, 64)
+        self.assertEqual(
+            self.command.import_games.call_args.kwargs["concurrency"], 64
+        )
+
+    @patch("core.management.commands.cfbd_import.load_dotenv")
+    @patch("core.management.commands.cfbd_import.cfbd.ApiClient")
+    def test_handle_offline_uses_cache(
+        self, mock_client: MagicMock, mock_load_dotenv: MagicMock
+    ) -> None:
+        """Offline imports need no API key and report cache misses."""
+        mock_client.return_value.__enter__.return_value = object()
+        mock_client.return_value.__exit__.return_value = False
+        self.command.import_conferences = MagicMock()
+
+        with (
+            tempfile.TemporaryDirectory() as cache_dir,
+            patch.dict("os.environ", {}, clear=True),
+        ):
+            with self.assertRaises(CommandError):
+                self.command.handle(offline=True, no_cache=True)
+            self.command.handle(
+                offline=True, cache_dir=cache_dir, start_year=2023
+            )
+
+        self.command.import_conferences.assert_not_called()
+        self.assertIn("No cached get_venues", self.command.stderr.getvalue())
+        self.assertIn(
+            "Response cache: 0 hits, 1 misses", self.command.stdout.getvalue()
+        )
+
+    @patch("core.management.commands.cfbd_import.cfbd.ApiClient")
+    def test_handle_wraps_apis_in_cache(self, mock_client: MagicMock) -> None:
+        """API instances are cached unless ``--no-cache`` is given."""
+        mock_client.return_value.__enter__.return_value = object()
+        mock_client.return_value.__exit__.return_value = False
+        for name in ("venues", "conferences", "teams", "games"):
+            setattr(self.command, f"import_{name}", MagicMock())
+
+        with patch.dict("os.environ", {"CFBD_API_KEY": "token"}):
+            self.command.handle(start_year=2023, end_year=2023)
+            self.assertIsInstance(
+                self.command.import_games.call_args.args[0], CachedApi
+            )
+            self.command.handle(start_year=2023, end_year=2023, no_cache=True)
+            api = self.command.import_games.call_args.args[0]
+            self.assertIsInstance(api, ResilientApi)
+            self.assertIsInstance(api.api, cfbd.GamesApi)
+            self.assertIsNotNone(api.client.limiter)
+            self.command.handle(
+                start_year=2023, end_year=2023, no_cache=True, rate_limit=0
+            )
+            api = self.command.import_games.call_args.args[0]
+            self.assertIsNone(api.client.limiter)
+            with self.assertRaises(CommandError):
+                self.command.handle(retries=-1)
+        self.assertIn("API client: 0 requests", self.command.stdout.getvalue())
+
+    @patch("core.management.commands.cfbd_import.cfbd.ApiClient")
+    def test_handle_writes_changed_ids(self, mock_client: MagicMock) -> None:
+        """``--changed-ids`` receives the ids of the changed matches."""
+        mock_client.return_value.__enter__.return_value = object()
+        mock_client.return_value.__exit__.return_value = False
+        for name in ("venues", "conferences", "teams"):
+            setattr(self.command, f"import_{name}", MagicMock())
+
+        def import_games(*args: object, **kwargs: object) -> None:
+            self.command.changed_match_ids = [5, 3, 5]
+
+        self.command.import_games = MagicMock(side_effect=import_games)
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            patch.dict("os.environ", {"CFBD_API_KEY": "token"}),
+        ):
+            path = Path(directory) / "changed.json"
+            self.command.handle(
+                start_year=2023, end_year=2023, changed_ids=str(path)
+            )
+            self.assertEqual(json.loads(path.read_text()), [3, 5])
+        self.assertIn("2 matches changed.", self.command.stdout.getvalue())
+
+    @patch("core.management.commands.cfbd_import.cfbd.ApiClient")
+    @patch("core.management.commands.cfbd_import.cfbd.GamesApi")
+    @patch("core.management.commands.cfbd_import.cfbd.TeamsApi")
+    @patch("core.management.commands.cfbd_import.cfbd.ConferencesApi")
+    @patch("core.management.commands.cfbd_import.cfbd.VenuesApi")
+    def test_handle_pipeline(
+        self,
+        mock_venues_api: MagicMock,
+        mock_conferences_api: MagicMock,
+        mock_teams_api: MagicMock,
+        mock_games_api: MagicMock,
+        mock_client: MagicMock,
+    ) -> None:
+        """``--pipeline`` fetches every response ahead of the writes."""
+        mock_client.return_value.__enter__.return_value = object()
+        mock_client.return_value.__exit__.return_value = False
+        mock_venues_api.return_value.get_venues.return_value = [
+            self._sample_venue()
+        ]
+        mock_conferences_api.return_value.get_conferences.return_value = [
+            self._sample_conference()
+        ]
+        mock_teams_api.return_value.get_teams.return_value = (
+            self._teams_payload()
+        )
+        get_games = mock_games_api.return_value.get_games
+        get_games.side_effect = lambda year, season_type: [
+            self._game(year, year, completed=True)
+        ]
+
+        with patch.dict("os.environ", {"CFBD_API_KEY": "token"}):
+            with self.assertRaises(CommandError):
+                self.command.handle(pipeline=True, queue_size=0)
+            self.command.handle(
+                start_year=2022,
+                end_year=2023,
+                no_cache=True,
+                pipeline=True,
+                concurrency=2,
+                queue_size=2,
+            )
+
+        self.assertEqual(
+            [call.kwargs["year"] for call in get_games.call_args_list],
+            [2022, 2023],
+        )
+        self.assertEqual(Team.objects.count(), 3)
+        self.assertEqual(Match.objects.count(), 2)
+        output = self.command.stdout.getvalue()
+        self.assertIn("Pipeline: fetched 5 responses", output)
+        self.assertRegex(output, r"queue depth mean [\d.]+, max [0-2]/2")
+
+    @patch("core.management.commands.cfbd_import.load_dotenv")
+    def test_handle_imports_from_source(
+        self, mock_load_dotenv: MagicMock
+    ) -> None:
+        """``--source`` rebuilds the database from dumps without the API."""
+        game = {
+            "id": 1,
+            "season": 2022,
+            "week": 1,
+            "seasonType": "regular",
+            "startDate": "2022-09-01T19:30:00.000Z",
+            "startTimeTBD": False,
+            "completed": True,
+            "neutralSite": False,
+            "conferenceGame": True,
+            "venueId": 1,
+            "homeId": 1,
+            "homeTeam": "Georgia Tech",
+            "homeConference": "ACC",
+            "homePoints": 21,
+            "awayId": 2,
+            "awayTeam": "Georgia",
+            "awayConference": "ACC",
+            "awayPoints": 7,
+        }
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            patch.dict("os.environ", {}, clear=True),
+        ):
+            source = Path(directory)
+            venue = vars(self._sample_venue())
+            venue["countryCode"] = venue.pop("country_code")
+            venue["constructionYear"] = venue.pop("construction_year")
+            venue["elevation"] = str(venue["elevation"])
+            (source / "venues.json").write_text(json.dumps([venue]))
+            with self.assertRaises(CommandError):
+                self.command.handle(source=directory, year=2023)
+            with self.assertRaises(CommandError):
+                self.command.handle(source=directory, conference="ACC")
+            with self.assertRaises(CommandError):
+                self.command.handle(source=directory, offline=True)
+
+            self.command.handle(
+                source=directory, start_year=2000, end_year=2030
+            )
+            self.assertIn(
+                "File import stopped: No conferences dump",
+                self.command.stderr.getvalue(),
+            )
+            (source / "conferences.jsonl").write_text('{"id": 1,')
+            self.command.handle(
+                source=directory, start_year=2000, end_year=2030
+            )
+            self.assertIn(
+                "conferences.jsonl, line 1: ", self.command.stderr.getvalue()
+            )
+
+            (source / "games").mkdir()
+            (source / "games" / "2022.jsonl").write_text(json.dumps(game))
+            # 2021 is missing from the dump and must be skipped.
+            (source / "games" / "2020.json").write_text(
+                json.dumps([{**game, "id": 2, "season": 2020}])
+            )
+            (source / "conferences.jsonl").write_text(
+                json.dumps(
+                    {
+                        "id": 1,
+                        "name": "Atlantic Coast",
+                        "shortName": "ACC",
+                        "abbreviation": "ACC",
+                        "classification": "fbs",
+                    }
+                )
+            )
+            (source / "teams.jsonl").write_text(
+                "\n".join(
+                    json.dumps(
+                        {
+                            "id": team_id,
+                            "school": school,
+                            "conference": "ACC",
+                            "abbreviation": school[:4].upper(),
+                            "classification": "fbs",
+                            "color": "#000000",
+                            "alternateColor": "#FFFFFF",
+                            "location": {"id": 1},
+                            "logos": [],
+                        }
+                    )
+                    for team_id, school in ((1, "Georgia Tech"), (2, "Georgia"))
+                )
+            )
+            self.command.handle(
+                source=directory,
+                start_year=1869,
+                end_year=2030,
+                concurrency=2,
+            )
+            self.command.handle(
+                source=directory,
+                start_year=2020,
+                end_year=2022,
+                pipeline=True,
+            )
+
+        self.assertEqual(
+            list(Match.objects.values_list("id", "season", "home_score")),
+            [(1, 2022, 21), (2, 2020, 21)],
+        )
+        self.assertEqual(
+            Match.objects.get(id=1).home_conference.name, "Atlantic Coast"
+        )
+        self.assertEqual(
+            list(ImportState.objects.values_list("season", flat=True)),
+            [2020, 2022],
+        )
+        self.assertNotIn(
+            "File import stopped: No games", self.command.stderr.getvalue()
+        )
+        output = self.command.stdout.getvalue()
+        self.assertIn("API client: 0 requests", output)
+        self.assertIn("Pipeline: fetched 5 responses", output)
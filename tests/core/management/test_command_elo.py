@@ -3,15 +3,22 @@
 import argparse
 import io
 import math
+import tempfile
+from unittest import mock
 
 from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from core.management.commands.elo import Command
+from core.bulk import BulkWriter
+from core.management.commands.elo import Command, peak_rss_mib
+from core.models.current_rating import TeamCurrentRating
 from core.models.elo import EloRating
-from core.models.enums import SeasonType
+from core.models.enums import RatingSystem, SeasonType
 from core.models.match import Match
+from core.models.rating_period import RatingPeriod
 from core.models.team import Team
 from libs.constants import (
     ELO_DECAY_DEFAULT,
@@ -122,6 +129,9 @@ class EloCommandTests(TestCase):
         self.assertAlmostEqual(a_ratings[0].rating_after, a_after1, places=2)
         self.assertAlmostEqual(a_ratings[1].rating_before, a_after1, places=2)
         self.assertAlmostEqual(a_ratings[1].rating_after, a_after2, places=2)
+        current = TeamCurrentRating.objects.get(team=a)
+        self.assertAlmostEqual(current.elo, a_after2, places=2)
+        self.assertEqual(current.elo_rank, 2)
 
         output = self.command.stdout.getvalue()
         self.assertIn(
@@ -139,6 +149,86 @@ class EloCommandTests(TestCase):
             output,
         )
 
+    def test_handle_queries_do_not_grow_with_matches(self) -> None:
+        """Matches are streamed and team names are read once."""
+        teams = [self._team(name) for name in "ABCD"]
+
+        def run(**options: int) -> int:
+            with CaptureQueriesContext(connection) as queries:
+                self.command.handle(**options)
+            return len(queries)
+
+        self._match(
+            season=2024,
+            week=1,
+            home=teams[0],
+            away=teams[1],
+            home_score=7,
+            away_score=3,
+        )
+        one_match = run()
+        for week, (home, away) in enumerate([(1, 2), (2, 3), (3, 0)], 2):
+            self._match(
+                season=2024,
+                week=week,
+                home=teams[home],
+                away=teams[away],
+                home_score=10,
+                away_score=14,
+            )
+        self.assertEqual(run(), one_match)
+        self.assertIn("D: ", self.command.stdout.getvalue())
+
+        self.command.stdout = io.StringIO()
+        self.assertEqual(run(verbosity=0), one_match - 1)
+        self.assertNotIn("->", self.command.stdout.getvalue())
+        self.assertEqual(EloRating.objects.count(), 8)
+
+    def test_handle_chunk_size_streams_writes(self) -> None:
+        """Small chunks write the same rows and report throughput."""
+        a, b = self._team("A"), self._team("B")
+        for week in (1, 2, 3):
+            self._match(
+                season=2024,
+                week=week,
+                home=a,
+                away=b,
+                home_score=7 * week,
+                away_score=10,
+            )
+        self.command.handle()
+        full = list(
+            EloRating.objects.order_by("match_id", "team_id").values_list(
+                "rating_before", "rating_after"
+            )
+        )
+
+        with mock.patch.object(
+            BulkWriter, "flush", autospec=True, side_effect=BulkWriter.flush
+        ) as flush:
+            self.command.handle(chunk_size=1)
+        rating_flushes = [
+            call
+            for call in flush.call_args_list
+            if call.args[0].model is EloRating
+        ]
+        self.assertEqual(len(rating_flushes), 4)
+        self.assertEqual(
+            list(
+                EloRating.objects.order_by("match_id", "team_id").values_list(
+                    "rating_before", "rating_after"
+                )
+            ),
+            full,
+        )
+        output = self.command.stdout.getvalue()
+        self.assertIn("Wrote 6 Elo ratings in", output)
+        self.assertIn("rows/s, peak RSS", output)
+        self.assertGreater(peak_rss_mib(), 0)
+
+        with self.assertRaises(CommandError):
+            self.command.handle(chunk_size=0)
+
     def test_handle_decays_between_seasons(self) -> None:
         """Ratings move toward the baseline between seasons."""
         a = self._team("A")
@@ -408,3 +498,176 @@ class EloCommandTests(TestCase):
 
         self.assertAlmostEqual(home_rating.rating_after, home_after, places=2)
         self.assertAlmostEqual(away_rating.rating_after, away_after, places=2)
+
+    # incremental recomputation ---------------------------------------------
+    def _create_history(self) -> list[Team]:
+        teams = [self._team(name) for name in "ABCD"]
+        for season, week, home, away, hs, as_ in [
+            (2021, 1, 0, 1, 21, 7),
+            (2021, 2, 2, 0, 14, 10),
+            (2022, 1, 0, 1, 3, 28),
+            (2022, 1, 3, 0, 20, 17),
+            (2023, 1, 1, 0, 24, 24),
+            (2023, 2, 2, 3, 35, 34),
+            (2023, 2, 0, 1, 9, 6),
+        ]:
+            self._match(
+                season=season,
+                week=week,
+                home=teams[home],
+                away=teams[away],
+                home_score=hs,
+                away_score=as_,
+            )
+        return teams
+
+    def test_incremental_recomputes_from_changed_week(self) -> None:
+        """
+        Only weeks from the first changed match onward are recomputed.
+
+        Team C last played two seasons before the change and D one, so
+        seeding has to decay them a different number of times.
+        """
+        teams = self._create_history()
+        self.command.handle(decay=0.6)
+        untouched = [
+            row
+            for row in self._elo_rows()
+            if Match.objects.get(id=row[1]).season < 2023
+        ]
+
+        match = Match.objects.get(season=2023, week=2, home_team=teams[2])
+        match.home_score = 3
+        match.save()
+        self._match(
+            season=2023,
+            week=3,
+            home=teams[3],
+            away=teams[1],
+            home_score=14,
+            away_score=0,
+        )
+
+        self.command.handle(incremental=True, decay=0.6)
+        self.assertIn(
+            "Clearing Elo ratings from season 2023 week 2",
+            self.command.stdout.getvalue(),
+        )
+        incremental = self._elo_rows()
+        self.assertEqual(incremental[: len(untouched)], untouched)
+
+        self.command.handle(decay=0.6)
+        self.assertEqual(incremental, self._elo_rows())
+
+    def test_incremental_new_season(self) -> None:
+        """A new season decays the ratings stored at the end of the last."""
+        teams = self._create_history()
+        self.command.handle()
+        self._match(
+            season=2024,
+            week=1,
+            home=teams[2],
+            away=teams[3],
+            home_score=28,
+            away_score=27,
+        )
+        self.command.handle(incremental=True)
+        self.assertIn(
+            "Clearing Elo ratings from season 2024 week 1",
+            self.command.stdout.getvalue(),
+        )
+        incremental = self._elo_rows()
+
+        self.command.handle()
+        self.assertEqual(incremental, self._elo_rows())
+
+    def test_incremental_up_to_date(self) -> None:
+        """Without match changes the incremental mode does nothing."""
+        self._create_history()
+        self.command.handle()
+        before = self._elo_rows()
+
+        self.command.handle(incremental=True)
+        self.assertIn(
+            "Elo ratings are up to date", self.command.stdout.getvalue()
+        )
+        self.assertEqual(self._elo_rows(), before)
+
+    def test_incremental_without_history_rebuilds(self) -> None:
+        """With nothing stored before the change the mode rebuilds."""
+        self._create_history()
+        self.command.handle(incremental=True)
+        self.assertIn(
+            "Clearing existing Elo ratings", self.command.stdout.getvalue()
+        )
+        self.assertEqual(
+            RatingPeriod.objects.filter(system=RatingSystem.ELO).count(), 5
+        )
+        with self.assertRaises(CommandError):
+            self.command.handle(incremental=True, resume_from=2023)
+
+    # checkpoints ------------------------------------------------------------
+    def _checkpoint_dir(self) -> str:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return tmp.name
+
+    def _elo_rows(self) -> list[tuple]:
+        return list(
+            EloRating.objects.order_by("match_id", "team_id").values_list(
+                "team_id", "match_id", "rating_before", "rating_after"
+            )
+        )
+
+    def test_resume_from_checkpoint_matches_full_run(self) -> None:
+        """Resuming from a season checkpoint reproduces a full run."""
+        a, b, c = self._team("A"), self._team("B"), self._team("C")
+        for season, home, away, hs, as_ in [
+            (2022, a, b, 21, 7),
+            (2023, b, c, 14, 10),
+            (2023, c, a, 3, 28),
+            (2024, a, c, 17, 20),
+            (2024, b, a, 10, 10),
+        ]:
+            self._match(
+                season=season,
+                week=1,
+                home=home,
+                away=away,
+                home_score=hs,
+                away_score=as_,
+            )
+        directory = self._checkpoint_dir()
+
+        self.command.handle(checkpoint=True, checkpoint_dir=directory)
+        full = self._elo_rows()
+        self.assertEqual(self.command.stdout.getvalue().count("Saved"), 3)
+
+        self.command.handle(resume_from=2024, checkpoint_dir=directory)
+        self.assertIn(
+            "Resuming from the end-of-season 2023 checkpoint",
+            self.command.stdout.getvalue(),
+        )
+        self.assertEqual(self._elo_rows(), full)
+
+    def test_resume_without_checkpoint_raises(self) -> None:
+        """Resuming needs a checkpoint saved with the same parameters."""
+        a, b = self._team("A"), self._team("B")
+        for season in (2023, 2024):
+            self._match(
+                season=season,
+                week=1,
+                home=a,
+                away=b,
+                home_score=7,
+                away_score=3,
+            )
+        directory = self._checkpoint_dir()
+        self.command.handle(checkpoint=True, checkpoint_dir=directory)
+
+        with self.assertRaises(CommandError):
+            self.command.handle(
+                resume_from=2024, checkpoint_dir=directory, decay=0.5
+            )
+        with self.assertRaises(CommandError):
+            self.command.handle(resume_from=2023, checkpoint_dir=directory)
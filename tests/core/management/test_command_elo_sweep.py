@@ -0,0 +1,154 @@
+"""Tests for the elo_sweep management command."""
+
+import argparse
+import io
+import math
+from importlib import import_module
+
+from django.core.management.base import CommandError, OutputWrapper
+from django.test import TestCase
+from django.utils import timezone
+
+from core.management.commands.elo_sweep import SweepParams, evaluate
+from core.models.elo import EloRating
+from core.models.enums import SeasonType
+from core.models.match import Match
+from core.models.team import Team
+from libs.constants import (
+    ELO_DECAY_DEFAULT,
+    ELO_HOME_ADVANTAGE,
+    ELO_K_FACTOR,
+    ELO_SCORE_DIFFERENTIAL_BASE,
+)
+
+Command = import_module("core.management.commands.elo_sweep").Command
+EloCommand = import_module("core.management.commands.elo").Command
+
+DEFAULTS = SweepParams(
+    ELO_K_FACTOR,
+    ELO_HOME_ADVANTAGE,
+    ELO_DECAY_DEFAULT,
+    ELO_SCORE_DIFFERENTIAL_BASE,
+)
+
+
+class EloSweepCommandTests(TestCase):
+    """Behavior tests for the elo_sweep command."""
+
+    def setUp(self) -> None:
+        """Create a command instance with captured output."""
+        self.command = Command()
+        self.command.stdout = io.StringIO()
+        self.command.stderr = io.StringIO()
+
+    def _create_history(self) -> None:
+        teams = [
+            Team.objects.create(
+                school=name, color="#fff", alternate_color="#000"
+            )
+            for name in "ABCDE"
+        ]
+        fixtures = [
+            (2023, 1, 0, 1, 35, 3, False),
+            (2023, 1, 2, 3, 10, 13, True),
+            (2023, 1, 0, 4, 21, 20, False),
+            (2023, 2, 1, 2, 21, 21, False),
+            (2023, 2, 4, 0, 24, 10, False),
+            (2024, 1, 0, 4, 7, 42, False),
+            (2024, 1, 3, 1, 17, 14, False),
+            (2024, 2, 4, 2, 28, 27, True),
+            (2024, 3, 0, 3, 31, 30, False),
+        ]
+        for season, week, home, away, hs, as_, neutral in fixtures:
+            Match.objects.create(
+                season=season,
+                week=week,
+                season_type=SeasonType.REGULAR,
+                start_date=timezone.now(),
+                completed=True,
+                neutral_site=neutral,
+                home_team=teams[home],
+                away_team=teams[away],
+                home_score=hs,
+                away_score=as_,
+            )
+
+    def _matches(self) -> list:
+        return list(EloCommand._match_stream())
+
+    def test_add_arguments_defaults(self) -> None:
+        """Without options the grid holds only the current settings."""
+        parser = argparse.ArgumentParser()
+        self.command.add_arguments(parser)
+        args = parser.parse_args([])
+        self.assertEqual(args.k_factor, [ELO_K_FACTOR])
+        self.assertEqual(args.home_advantage, [ELO_HOME_ADVANTAGE])
+        self.assertEqual(args.decay, [ELO_DECAY_DEFAULT])
+        self.assertEqual(args.base, [ELO_SCORE_DIFFERENTIAL_BASE])
+        self.assertIsNone(args.score_from)
+
+    def test_evaluate_replays_like_elo_command(self) -> None:
+        """With default parameters the final ratings match the command."""
+        self._create_history()
+        elo = EloCommand()
+        elo.stdout = io.StringIO()
+        elo.handle()
+
+        ratings = evaluate([DEFAULTS], self._matches(), 2024)
+        self.assertEqual(ratings.games, 4)
+        last = {}
+        for rating in EloRating.objects.order_by("match_id"):
+            last[rating.team_id] = rating.rating_after
+        for team_id, rating in last.items():
+            self.assertAlmostEqual(
+                ratings.ratings[0, ratings.index[team_id]], rating, places=9
+            )
+
+    def test_configurations_are_independent(self) -> None:
+        """Evaluating a grid matches evaluating each point alone."""
+        self._create_history()
+        grid = [DEFAULTS, SweepParams(20, 0, 0, 2.5), SweepParams(50, 80, 1, 5)]
+        together = evaluate(grid, self._matches(), 2023).results()
+        for params, result in zip(grid, together, strict=True):
+            (alone,) = evaluate([params], self._matches(), 2023).results()
+            self.assertEqual(result.games, 9)
+            self.assertAlmostEqual(result.log_loss, alone.log_loss, places=12)
+            self.assertAlmostEqual(result.brier, alone.brier, places=12)
+
+    def test_evaluate_without_scored_games(self) -> None:
+        """Configurations with nothing to score report NaN."""
+        self._create_history()
+        (result,) = evaluate([DEFAULTS], self._matches(), 2030).results()
+        self.assertEqual(result.games, 0)
+        self.assertTrue(math.isnan(result.log_loss))
+
+    def test_handle_prints_ranked_table(self) -> None:
+        """``handle`` ranks every configuration by log-loss."""
+        self._create_history()
+        buffer = io.StringIO()
+        self.command.stdout = OutputWrapper(buffer)
+        self.command.handle(k_factor=[16, 32], decay=[0.5, 1.0], top=3)
+        output = buffer.getvalue()
+        self.assertIn("Evaluating 4 configurations", output)
+        self.assertIn("scoring from season 2024", output)
+        self.assertIn("Evaluated 4 configurations on 4 scored games", output)
+        lines = [line.split() for line in output.splitlines()]
+        ranked = [line for line in lines if line[0] in {"1", "2", "3", "4"}]
+        self.assertEqual([line[0] for line in ranked], ["1", "2", "3"])
+        losses = [float(line[6]) for line in ranked]
+        self.assertEqual(losses, sorted(losses))
+        self.assertEqual(EloRating.objects.count(), 0)
+
+    def test_handle_rejects_bad_input(self) -> None:
+        """Invalid parameters and missing games raise errors."""
+        with self.assertRaises(CommandError):
+            self.command.handle(k_factor=[0.0])
+        with self.assertRaises(CommandError):
+            self.command.handle(decay=[1.5])
+        with self.assertRaises(CommandError):
+            self.command.handle(base=[1.0])
+        with self.assertRaises(CommandError):
+            self.command.handle()
+        self._create_history()
+        with self.assertRaises(CommandError):
+            self.command.handle(score_from=2030)
@@ -1,15 +1,25 @@
 """Tests for the glicko management command."""
 
+import argparse
 import io
+import tempfile
 from importlib import import_module
 
+from django.core.management.base import CommandError
 from django.test import TestCase
 from django.utils import timezone
 
-from core.models.enums import DivisionClassification, SeasonType
+from core.models.current_rating import TeamCurrentRating
+from core.models.enums import (
+    DivisionClassification,
+    RatingSystem,
+    SeasonType,
+)
 from core.models.glicko import GlickoRating
 from core.models.match import Match
+from core.models.rating_period import RatingPeriod
 from core.models.team import Team
+from libs.rating_state import TeamRatingState
 
 Command = import_module("core.management.commands.glicko").Command
 
@@ -32,71 +42,36 @@ class GlickoCommandTests(TestCase):
             classification=DivisionClassification.FBS,
         )
 
-    # _get_player ----------------------------------------------------------
-    def test_get_player_creates_and_reuses(self) -> None:
-        """``_get_player`` creates a new player and reuses existing ones."""
-        players: dict[int, object] = {}
-        player = self.command._get_player(
-            players, 1, DivisionClassification.FCS
-        )
-        self.assertEqual(player.rating, 1300)  # FCS base rating
-        self.assertIs(players[1], player)
-        again = self.command._get_player(players, 1, None)
-        self.assertIs(player, again)
-
     # _process_season ------------------------------------------------------
     def test_process_season_no_matches(self) -> None:
         """Season with no matches returns an empty set and logs message."""
-        players: dict[int, object] = {}
-        active = self.command._process_season(2025, players)
+        active = self.command._process_season(2025, [], [], TeamRatingState())
         self.assertEqual(active, set())
         self.assertIn("No matches found", self.command.stdout.getvalue())
 
-    # _calculate_* helpers -------------------------------------------------
-    def test_calculate_bonus_and_cap(self) -> None:
-        """Helper methods return expected bonus and cap values."""
-        t1 = self._team("A")
-        t2 = self._team("B")
-        Match.objects.create(
-            season=2023,
-            week=1,
-            season_type=SeasonType.REGULAR,
-            start_date=timezone.now(),
-            completed=True,
-            neutral_site=False,
-            home_team=t1,
-            home_classification=DivisionClassification.FBS,
-            away_team=t2,
-            away_classification=DivisionClassification.FBS,
-            home_score=20,
-            away_score=10,
-        )
-        qs = Match.objects.filter(season=2023)
-        bonus = self.command._calculate_home_field_bonus(qs, 1500)
-        cap = self.command._calculate_margin_weight_cap(qs)
-        self.assertEqual(bonus, 750)
-        self.assertEqual(cap, 15)
-
-    def test_calculate_bonus_and_cap_no_matches(self) -> None:
-        """When no matches exist, bonus is 0 and cap defaults to 1.5."""
-        qs = Match.objects.none()
-        self.assertEqual(self.command._calculate_home_field_bonus(qs, 1500), 0)
-        self.assertEqual(self.command._calculate_margin_weight_cap(qs), 1.5)
-
     # _update_ratings ------------------------------------------------------
     def test_update_ratings_empty(self) -> None:
-        """No players results in no created ratings."""
+        """No known teams results in no created ratings."""
         self.command._update_ratings(
             season=2024,
             week=1,
-            players={},
-            results={},
+            state=TeamRatingState(),
+            edges=[],
             margin_weight_cap=1.5,
             team_meta={},
             season_active_teams=set(),
         )
         self.assertEqual(GlickoRating.objects.count(), 0)
 
+    def test_add_arguments_defines_engine_option(self) -> None:
+        """``add_arguments`` adds an ``engine`` option defaulting to batch."""
+        parser = argparse.ArgumentParser()
+        self.command.add_arguments(parser)
+        self.assertEqual(parser.parse_args([]).engine, "batch")
+        self.assertEqual(
+            parser.parse_args(["--engine", "scalar"]).engine, "scalar"
+        )
+
     # handle ---------------------------------------------------------------
     def test_handle_no_matches(self) -> None:
         """Running handle with no data should not create ratings."""
@@ -180,3 +155,291 @@ class GlickoCommandTests(TestCase):
         self.assertFalse(b.active)
         self.assertTrue(c.active)
         self.assertTrue(d.active)
+        self.assertEqual(
+            TeamCurrentRating.objects.ranked().count(),
+            GlickoRating.objects.filter(season=2024)
+            .values("team")
+            .distinct()
+            .count(),
+        )
+        self.assertIn(
+            "Volatility solver: 3 teams", self.command.stdout.getvalue()
+        )
+
+    def _create_history(self) -> list[Team]:
+        """Create two seasons of matches, with one team idle in 2024."""
+        teams = [self._team(name) for name in "ABCDEF"]
+        now = timezone.now()
+        fixtures = [
+            (2023, 1, 0, 1, 35, 3, False),
+            (2023, 1, 2, 3, 10, 13, True),
+            (2023, 2, 1, 2, 21, 21, False),
+            (2023, 2, 5, 0, 24, 10, False),
+            (2024, 1, 0, 4, 7, 42, False),
+            (2024, 1, 3, 1, 17, 14, False),
+            (2024, 2, 4, 2, 28, 27, True),
+            (2024, 3, 0, 3, 31, 30, False),
+        ]
+        for season, week, home, away, hs, as_, neutral in fixtures:
+            Match.objects.create(
+                season=season,
+                week=week,
+                season_type=SeasonType.REGULAR,
+                start_date=now,
+                completed=True,
+                neutral_site=neutral,
+                home_team=teams[home],
+                home_classification=DivisionClassification.FBS,
+                away_team=teams[away],
+                away_classification=DivisionClassification.FCS,
+                home_score=hs,
+                away_score=as_,
+            )
+        return teams
+
+    def _ratings(self) -> list[tuple]:
+        """Return every stored rating in a stable order."""
+        return list(
+            GlickoRating.objects.order_by(
+                "season", "week", "team_id"
+            ).values_list(
+                "team_id",
+                "season",
+                "week",
+                "classification",
+                "active",
+                "previous_rating",
+                "previous_rd",
+                "rating",
+                "rd",
+                "vol",
+            )
+        )
+
+    def test_handle_scalar_engine_matches_batch(self) -> None:
+        """Both engines produce the same ratings for every team and week."""
+        self._create_history()
+
+        self.command.handle()
+        batch = self._ratings()
+        self.command.handle(engine="scalar")
+        scalar = self._ratings()
+
+        self.assertEqual(len(batch), len(scalar))
+        for got, want in zip(batch, scalar, strict=True):
+            self.assertEqual(got[:5], want[:5])
+            for g, w in zip(got[5:], want[5:], strict=True):
+                self.assertAlmostEqual(g, w, places=9)
+
+    # incremental recomputation ---------------------------------------------
+    def test_add_arguments_defines_incremental_options(self) -> None:
+        """Incremental options default to a full recomputation."""
+        parser = argparse.ArgumentParser()
+        self.command.add_arguments(parser)
+        args = parser.parse_args([])
+        self.assertIsNone(args.from_season)
+        self.assertIsNone(args.from_week)
+        self.assertFalse(args.incremental)
+
+    def test_handle_rejects_conflicting_options(self) -> None:
+        """Invalid option combinations raise ``CommandError``."""
+        with self.assertRaises(CommandError):
+            self.command.handle(from_week=2)
+        with self.assertRaises(CommandError):
+            self.command.handle(incremental=True, from_season=2024)
+        with self.assertRaises(CommandError):
+            self.command.handle(sparse_threshold=1.0)
+        with self.assertRaises(CommandError):
+            self.command.handle(resume_from=2024, incremental=True)
+
+    def test_from_season_matches_full_replay(self) -> None:
+        """Resuming part way through history reproduces a full replay."""
+        self._create_history()
+        self.command.handle()
+        full = self._ratings()
+
+        self.command.handle(from_season=2024, from_week=2)
+        self.assertIn(
+            "Clearing ratings from season 2024 week 2",
+            self.command.stdout.getvalue(),
+        )
+        self.assertEqual(self._ratings(), full)
+
+        self.command.handle(from_season=2024)
+        self.assertIn(
+            "Clearing ratings from season 2024...",
+            self.command.stdout.getvalue(),
+        )
+        self.assertEqual(self._ratings(), full)
+
+    def test_incremental_recomputes_from_changed_week(self) -> None:
+        """Only weeks from the first changed match onward are recomputed."""
+        teams = self._create_history()
+        self.command.handle()
+        untouched = [r for r in self._ratings() if r[1] == 2023]
+
+        match = Match.objects.get(season=2024, week=2)
+        match.home_score = 3
+        match.save()
+        Match.objects.create(
+            season=2024,
+            week=3,
+            season_type=SeasonType.REGULAR,
+            start_date=timezone.now(),
+            completed=True,
+            home_team=teams[5],
+            away_team=teams[1],
+            home_score=14,
+            away_score=0,
+        )
+
+        self.command.handle(incremental=True)
+        self.assertIn(
+            "Clearing ratings from season 2024 week 2",
+            self.command.stdout.getvalue(),
+        )
+        incremental = self._ratings()
+        self.assertEqual([r for r in incremental if r[1] == 2023], untouched)
+
+        self.command.handle()
+        self.assertEqual(incremental, self._ratings())
+
+    def test_incremental_up_to_date(self) -> None:
+        """Without match changes the incremental mode does nothing."""
+        self._create_history()
+        self.command.handle()
+        before = self._ratings()
+
+        self.command.handle(incremental=True)
+        self.assertIn(
+            "Glicko ratings are up to date", self.command.stdout.getvalue()
+        )
+        self.assertEqual(self._ratings(), before)
+
+    def test_incremental_without_history_rebuilds(self) -> None:
+        """With nothing stored the incremental mode runs a full rebuild."""
+        self._create_history()
+        self.command.handle(incremental=True)
+        self.assertIn(
+            "Clearing existing ratings", self.command.stdout.getvalue()
+        )
+        self.assertEqual(
+            RatingPeriod.objects.filter(system=RatingSystem.GLICKO).count(), 5
+        )
+
+    def test_resume_requires_period_tracking(self) -> None:
+        """Ratings stored without periods force a full recomputation."""
+        self._create_history()
+        self.command.handle()
+        full = self._ratings()
+        RatingPeriod.objects.all().delete()
+
+        self.command.handle(from_season=2024, from_week=2)
+        self.assertIn("predate period tracking", self.command.stdout.getvalue())
+        self.assertEqual(self._ratings(), full)
+
+    # sparse storage ---------------------------------------------------------
+    def test_sparse_stores_only_teams_that_played(self) -> None:
+        """Sparse rows are the played subset of the dense rows."""
+        self._create_history()
+        self.command.handle()
+        dense = self._ratings()
+
+        self.command.handle(sparse=True)
+        sparse = self._ratings()
+        self.assertLess(len(sparse), len(dense))
+        self.assertTrue(set(sparse) <= set(dense))
+        played = {
+            (team_id, season, week)
+            for season, week, home, away in Match.objects.values_list(
+                "season", "week", "home_team_id", "away_team_id"
+            )
+            for team_id in (home, away)
+        }
+        self.assertEqual({r[:3] for r in sparse}, played)
+
+        for season, week in [(2023, 2), (2024, 3)]:
+            self.assertEqual(
+                GlickoRating.objects.for_week(season, week).count(),
+                len([r for r in dense if r[1:3] == (season, week)]),
+            )
+
+    def test_sparse_threshold_stores_drifting_idle_teams(self) -> None:
+        """Idle teams are stored once their RD drifts past the threshold."""
+        self._create_history()
+        self.command.handle()
+        dense = self._ratings()
+
+        self.command.handle(sparse=True, sparse_threshold=0.0)
+        self.assertEqual(self._ratings(), dense)
+
+        self.command.handle(sparse=True, sparse_threshold=1000.0)
+        self.assertLess(len(self._ratings()), len(dense))
+
+    def test_sparse_resume_matches_full_replay(self) -> None:
+        """Resuming from sparse rows reproduces a full sparse replay."""
+        self._create_history()
+        self.command.handle(sparse=True)
+        full = self._ratings()
+
+        self.command.handle(sparse=True, from_season=2024, from_week=2)
+        resumed = self._ratings()
+        self.assertEqual(len(resumed), len(full))
+        for got, want in zip(resumed, full, strict=True):
+            self.assertEqual(got[:5], want[:5])
+            for g, w in zip(got[5:], want[5:], strict=True):
+                self.assertAlmostEqual(g, w, places=9)
+
+    def test_moved_without_stored_row(self) -> None:
+        """A team with no stored row always counts as moved."""
+        self.command._stored = {}
+        self.command.sparse_threshold = 5.0
+        self.assertTrue(self.command._moved(1, 1500, 50))
+        self.command._stored[1] = (1500, 50)
+        self.assertFalse(self.command._moved(1, 1504, 54))
+        self.assertTrue(self.command._moved(1, 1500, 56))
+
+    # checkpoints ------------------------------------------------------------
+    def _checkpoint_dir(self) -> str:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return tmp.name
+
+    def test_resume_from_checkpoint_matches_full_replay(self) -> None:
+        """Resuming from a season checkpoint reproduces a full replay."""
+        self._create_history()
+        directory = self._checkpoint_dir()
+        self.command.handle(checkpoint=True, checkpoint_dir=directory)
+        dense = self._ratings()
+        self.command.handle(
+            sparse=True, checkpoint=True, checkpoint_dir=directory
+        )
+        full = self._ratings()
+        self.assertIn("Saved checkpoint", self.command.stdout.getvalue())
+
+        self.command.handle(
+            sparse=True, resume_from=2024, checkpoint_dir=directory
+        )
+        self.assertIn(
+            "Resuming from the end-of-season 2023 checkpoint",
+            self.command.stdout.getvalue(),
+        )
+        self.assertEqual(self._ratings(), full)
+
+        GlickoRating.objects.all().delete()
+        RatingPeriod.objects.all().delete()
+        self.command.handle(resume_from=2024, checkpoint_dir=directory)
+        self.assertEqual(self._ratings(), [r for r in dense if r[1] == 2024])
+
+    def test_resume_without_checkpoint_raises(self) -> None:
+        """A missing checkpoint is reported instead of replaying history."""
+        self._create_history()
+        directory = self._checkpoint_dir()
+        with self.assertRaises(CommandError) as ctx:
+            self.command.handle(resume_from=2024, checkpoint_dir=directory)
+        self.assertIn("available: none", str(ctx.exception))
+
+        self.command.handle(checkpoint=True, checkpoint_dir=directory)
+        with self.assertRaises(CommandError) as ctx:
+            self.command.handle(resume_from=2023, checkpoint_dir=directory)
+        self.assertIn("available: 2023, 2024", str(ctx.exception))
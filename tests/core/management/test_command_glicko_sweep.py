@@ -0,0 +1,163 @@
+"""Tests for the glicko_sweep management command."""
+
+import argparse
+import io
+import math
+from importlib import import_module
+
+from django.core.management.base import CommandError, OutputWrapper
+from django.test import TestCase
+from django.utils import timezone
+
+from core.management.commands.glicko_sweep import (
+    SweepParams,
+    _evaluate_in_worker,
+    _init_worker,
+    evaluate,
+)
+from core.models.enums import DivisionClassification, SeasonType
+from core.models.glicko import GlickoRating
+from core.models.match import Match
+from core.models.team import Team
+from core.ratings import season_matches
+from libs.constants import HOME_FIELD_SCALE, MARGIN_WEIGHT_CAP_MULTIPLIER, TAU
+from libs.rating_state import TeamRatingState
+
+Command = import_module("core.management.commands.glicko_sweep").Command
+GlickoCommand = import_module("core.management.commands.glicko").Command
+
+DEFAULTS = SweepParams(TAU, MARGIN_WEIGHT_CAP_MULTIPLIER, HOME_FIELD_SCALE)
+
+
+class GlickoSweepCommandTests(TestCase):
+    """Behavior tests for the glicko_sweep command."""
+
+    def setUp(self) -> None:
+        """Create a command instance with captured output."""
+        self.command = Command()
+        self.command.stdout = io.StringIO()
+        self.command.stderr = io.StringIO()
+
+    def _create_history(self) -> None:
+        teams = [
+            Team.objects.create(
+                school=name,
+                color="#fff",
+                alternate_color="#000",
+                classification=DivisionClassification.FBS,
+            )
+            for name in "ABCDE"
+        ]
+        fixtures = [
+            (2023, 1, 0, 1, 35, 3, False),
+            (2023, 1, 2, 3, 10, 13, True),
+            (2023, 2, 1, 2, 21, 21, False),
+            (2023, 2, 4, 0, 24, 10, False),
+            (2024, 1, 0, 4, 7, 42, False),
+            (2024, 1, 3, 1, 17, 14, False),
+            (2024, 2, 4, 2, 28, 27, True),
+            (2024, 3, 0, 3, 31, 30, False),
+        ]
+        for season, week, home, away, hs, as_, neutral in fixtures:
+            Match.objects.create(
+                season=season,
+                week=week,
+                season_type=SeasonType.REGULAR,
+                start_date=timezone.now(),
+                completed=True,
+                neutral_site=neutral,
+                home_team=teams[home],
+                home_classification=DivisionClassification.FBS,
+                away_team=teams[away],
+                away_classification=DivisionClassification.FCS,
+                home_score=hs,
+                away_score=as_,
+            )
+
+    def _history(self) -> list:
+        return list(season_matches([2023, 2024]))
+
+    def test_add_arguments_defaults(self) -> None:
+        """Without options the grid holds only the current settings."""
+        parser = argparse.ArgumentParser()
+        self.command.add_arguments(parser)
+        args = parser.parse_args([])
+        self.assertEqual(args.tau, [TAU])
+        self.assertEqual(args.margin_cap, [MARGIN_WEIGHT_CAP_MULTIPLIER])
+        self.assertEqual(args.home_scale, [HOME_FIELD_SCALE])
+        self.assertIsNone(args.score_from)
+        self.assertGreaterEqual(args.workers, 1)
+
+    def test_evaluate_replays_like_glicko_command(self) -> None:
+        """With default parameters the replay matches stored ratings."""
+        self._create_history()
+        glicko = GlickoCommand()
+        glicko.stdout = io.StringIO()
+        glicko.handle()
+
+        state = TeamRatingState()
+        result = evaluate(DEFAULTS, self._history(), 2024, state)
+        self.assertEqual(result.games, 4)
+        self.assertGreater(result.log_loss, 0)
+        self.assertGreater(result.brier, 0)
+
+        for rating in GlickoRating.objects.filter(season=2024, week=3):
+            idx = state.index[rating.team_id]
+            self.assertAlmostEqual(state.rating[idx], rating.rating, places=9)
+            self.assertAlmostEqual(state.rd[idx], rating.rd, places=9)
+
+    def test_evaluate_without_scored_games(self) -> None:
+        """Configurations with nothing to score report NaN."""
+        self._create_history()
+        result = evaluate(DEFAULTS, [(2022, [], []), *self._history()], 2030)
+        self.assertEqual(result.games, 0)
+        self.assertTrue(math.isnan(result.log_loss))
+
+    def test_worker_uses_shared_history(self) -> None:
+        """Pool workers evaluate against the history set by the initializer."""
+        self._create_history()
+        history = self._history()
+        _init_worker(history, 2024)
+        self.assertEqual(
+            _evaluate_in_worker(DEFAULTS), evaluate(DEFAULTS, history, 2024)
+        )
+
+    def test_parallel_matches_serial(self) -> None:
+        """The process pool returns the same scores as a serial run."""
+        self._create_history()
+        history = self._history()
+        grid = [DEFAULTS, SweepParams(0.5, 1.0, 0.5)]
+        self.assertEqual(
+            self.command._run(grid, history, 2024, 2),
+            self.command._run(grid, history, 2024, 1),
+        )
+
+    def test_handle_prints_ranked_table(self) -> None:
+        """``handle`` ranks every configuration by log-loss."""
+        self._create_history()
+        buffer = io.StringIO()
+        self.command.stdout = OutputWrapper(buffer)
+        self.command.handle(
+            tau=[0.5, 0.9], margin_cap=[1.5], home_scale=[1.0], workers=1
+        )
+        output = buffer.getvalue()
+        self.assertIn("Evaluating 2 configurations on 8 matches", output)
+        self.assertIn("scoring from season 2024", output)
+        self.assertIn("Evaluated 2 configurations", output)
+        lines = [line.split() for line in output.splitlines()]
+        ranked = [line for line in lines if line[0] in {"1", "2"}]
+        self.assertEqual(len(ranked), 2)
+        self.assertEqual({line[1] for line in ranked}, {"0.500", "0.900"})
+        losses = [float(line[5]) for line in ranked]
+        self.assertEqual(losses, sorted(losses))
+        self.assertEqual(GlickoRating.objects.count(), 0)
+
+    def test_handle_rejects_bad_input(self) -> None:
+        """Non-positive parameters and missing games raise errors."""
+        with self.assertRaises(CommandError):
+            self.command.handle(tau=[0.0])
+        with self.assertRaises(CommandError):
+            self.command.handle()
+        self._create_history()
+        with self.assertRaises(CommandError):
+            self.command.handle(score_from=2030)
@@ -0,0 +1,123 @@
+"""Tests for the :class:`TeamCurrentRating` model."""
+
+from datetime import UTC, datetime
+
+from django.test import TestCase
+
+from core.models.current_rating import TeamCurrentRating
+from core.models.elo import EloRating
+from core.models.enums import RatingSystem, SeasonType
+from core.models.glicko import GlickoRating
+from core.models.match import Match
+from core.models.team import Team
+
+
+class TeamCurrentRatingModelTests(TestCase):
+    """Behavior tests for :class:`TeamCurrentRating`."""
+
+    def setUp(self) -> None:
+        """Create three teams and a short match history."""
+        self.a, self.b, self.c = (
+            Team.objects.create(
+                school=school, color="#ffffff", alternate_color="#000000"
+            )
+            for school in ("A", "B", "C")
+        )
+        self.matches = [
+            self._match(2023, 1, self.a, self.c, day=2),
+            self._match(2024, 1, self.a, self.b, day=3),
+            self._match(2024, 2, self.b, self.a, day=10),
+        ]
+
+    def _match(
+        self, season: int, week: int, home: Team, away: Team, *, day: int
+    ) -> Match:
+        return Match.objects.create(
+            season=season,
+            week=week,
+            season_type=SeasonType.REGULAR,
+            start_date=datetime(season, 9, day, tzinfo=UTC),
+            completed=True,
+            home_team=home,
+            away_team=away,
+            home_score=10,
+            away_score=7,
+        )
+
+    def _current(self, team: Team) -> TeamCurrentRating:
+        return TeamCurrentRating.objects.get(team=team)
+
+    def test_refresh_elo(self) -> None:
+        """The latest Elo of every team is stored and this season ranked."""
+        for match, team, rating in [
+            (self.matches[0], self.a, 1510),
+            (self.matches[0], self.c, 1490),
+            (self.matches[1], self.a, 1520),
+            (self.matches[1], self.b, 1480),
+            (self.matches[2], self.a, 1505),
+            (self.matches[2], self.b, 1495),
+        ]:
+            EloRating.objects.create(
+                team=team, match=match, rating_after=rating
+            )
+
+        self.assertEqual(TeamCurrentRating.objects.refresh(RatingSystem.ELO), 3)
+        a, b, c = (self._current(team) for team in (self.a, self.b, self.c))
+        self.assertEqual((a.elo, a.elo_rank), (1505, 1))
+        self.assertEqual((b.elo, b.elo_rank), (1495, 2))
+        self.assertEqual((c.elo, c.elo_rank), (1490, None))
+        self.assertEqual(a.last_played, datetime(2024, 9, 10, tzinfo=UTC))
+        self.assertEqual(c.last_played, datetime(2023, 9, 2, tzinfo=UTC))
+        self.assertIsNone(a.glicko_rating)
+        self.assertEqual(str(a), "A: Elo 1505.0, Glicko None")
+
+        EloRating.objects.filter(team=self.c).delete()
+        TeamCurrentRating.objects.refresh(RatingSystem.ELO)
+        self.assertIsNone(self._current(self.c).elo)
+
+    def test_refresh_glicko_keeps_elo(self) -> None:
+        """Refreshing Glicko fills its columns and leaves Elo alone."""
+        TeamCurrentRating.objects.create(team=self.a, elo=1600, elo_rank=1)
+        self.assertEqual(
+            TeamCurrentRating.objects.refresh(RatingSystem.GLICKO), 0
+        )
+        for team, season, week, rating in [
+            (self.a, 2024, 1, 1550),
+            (self.b, 2024, 1, 1450),
+            (self.b, 2024, 2, 1560),
+            (self.c, 2023, 1, 1700),
+        ]:
+            GlickoRating.objects.create(
+                team=team,
+                season=season,
+                week=week,
+                rating=rating,
+                rd=50,
+                vol=0.06,
+            )
+
+        TeamCurrentRating.objects.refresh(RatingSystem.GLICKO)
+        a, b = self._current(self.a), self._current(self.b)
+        self.assertEqual((a.elo, a.elo_rank), (1600, 1))
+        self.assertEqual((a.glicko_rating, a.glicko_rank), (1550, 2))
+        self.assertEqual((b.glicko_rating, b.glicko_rd), (1560, 50))
+        self.assertEqual(b.glicko_rank, 1)
+        self.assertIsNone(self._current(self.c).glicko_rank)
+
+    def test_ranked_reads_in_one_query(self) -> None:
+        """``ranked`` returns ranked teams in order with their team."""
+        TeamCurrentRating.objects.create(team=self.a, elo_rank=2, glicko_rank=1)
+        TeamCurrentRating.objects.create(team=self.b, elo_rank=1)
+        TeamCurrentRating.objects.create(team=self.c)
+        with self.assertNumQueries(1):
+            schools = [
+                current.team.school
+                for current in TeamCurrentRating.objects.ranked(
+                    RatingSystem.ELO
+                )
+            ]
+        self.assertEqual(schools, ["B", "A"])
+        self.assertEqual(
+            [current.team for current in TeamCurrentRating.objects.ranked()],
+            [self.a],
+        )
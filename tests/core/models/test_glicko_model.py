@@ -48,3 +48,28 @@ class GlickoRatingModelTests(TestCase):
         )
         rating.refresh_from_db()
         self.assertEqual(rating.rating_change, 50.0)
+
+    def test_as_of_returns_latest_rating_per_team(self) -> None:
+        """``as_of`` picks each team's most recent row up to the period."""
+        first = self._create_team("First")
+        second = self._create_team("Second")
+        for team, season, week, rating in [
+            (first, 2023, 5, 1510),
+            (first, 2024, 1, 1520),
+            (first, 2024, 3, 1530),
+            (second, 2023, 2, 1490),
+        ]:
+            GlickoRating.objects.create(
+                team=team,
+                season=season,
+                week=week,
+                rating=rating,
+                rd=50,
+                vol=0.06,
+            )
+
+        latest = dict(
+            GlickoRating.objects.as_of(2024, 2).values_list("team_id", "rating")
+        )
+        self.assertEqual(latest, {first.id: 1520, second.id: 1490})
+        self.assertEqual(GlickoRating.objects.as_of(2022, 9).count(), 0)
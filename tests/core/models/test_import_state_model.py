@@ -0,0 +1,25 @@
+"""Tests for the :class:`ImportState` model."""
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models.import_state import ImportState
+
+
+class ImportStateModelTests(TestCase):
+    """Behavior tests for :class:`ImportState`."""
+
+    def test_str_and_settled(self) -> None:
+        """A past season with every game completed is settled."""
+        state = ImportState.objects.create(
+            season=2023,
+            imported_at=timezone.now(),
+            payload_hash="x",
+            game_count=3,
+            completed_count=2,
+        )
+        self.assertEqual(str(state), "2023: 2/3 games completed")
+        self.assertFalse(state.is_settled(2024))
+        state.completed_count = 3
+        self.assertTrue(state.is_settled(2024))
+        self.assertFalse(state.is_settled(2023))
@@ -0,0 +1,42 @@
+"""Tests for the :class:`RatingPeriod` model and match digests."""
+
+from datetime import UTC, datetime
+
+from django.test import TestCase
+
+from core.models.enums import RatingSystem
+from core.models.rating_period import RatingPeriod, digest_matches
+
+
+class RatingPeriodModelTests(TestCase):
+    """Behavior tests for :class:`RatingPeriod`."""
+
+    def test_str_includes_system_and_period(self) -> None:
+        """``__str__`` shows the system label, season and week."""
+        period = RatingPeriod.objects.create(
+            system=RatingSystem.GLICKO, season=2024, week=3, digest="x"
+        )
+        self.assertEqual(str(period), "Glicko 2024-3")
+
+
+class DigestMatchesTests(TestCase):
+    """Tests for :func:`digest_matches`."""
+
+    def _row(self, match_id: int, home_score: int) -> tuple:
+        start = datetime(2024, 9, 1, tzinfo=UTC)
+        return (match_id, start, False, 1, "fbs", None, home_score, 2, "", 3, 7)
+
+    def test_digest_ignores_row_order(self) -> None:
+        """The same matches in any order produce the same digest."""
+        rows = [self._row(1, 14), self._row(2, 21)]
+        self.assertEqual(digest_matches(rows), digest_matches(rows[::-1]))
+
+    def test_digest_changes_with_scores(self) -> None:
+        """Changing a score changes the digest."""
+        self.assertNotEqual(
+            digest_matches([self._row(1, 14)]),
+            digest_matches([self._row(1, 17)]),
+        )
+        self.assertNotEqual(
+            digest_matches([]), digest_matches([self._row(1, 0)])
+        )
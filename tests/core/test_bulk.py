@@ -0,0 +1,172 @@
+"""Tests for the bulk rating writer."""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import IntegrityError, connection
+from django.test import TestCase, TransactionTestCase
+
+from core.bulk import BulkWriter, bulk_transaction
+from core.models.enums import RatingSystem
+from core.models.rating_period import RatingPeriod
+
+FIELDS = ("system", "season", "week", "digest", "match_count")
+
+
+def _periods() -> list[tuple]:
+    return list(
+        RatingPeriod.objects.order_by("season", "week").values_list(*FIELDS)
+    )
+
+
+class BulkWriterTests(TestCase):
+    """Behavior tests for :class:`BulkWriter`."""
+
+    def test_flush_writes_buffered_rows(self) -> None:
+        """Rows are written on flush and counted."""
+        writer = BulkWriter(RatingPeriod, FIELDS)
+        writer.extend(
+            [(RatingSystem.ELO, 2024, 1, "a", 3), ("elo", 2024, 2, "b", 4)]
+        )
+        self.assertEqual(RatingPeriod.objects.count(), 0)
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual(writer.flush(), 0)
+        self.assertEqual(writer.rows_written, 2)
+        self.assertEqual(
+            _periods(), [("elo", 2024, 1, "a", 3), ("elo", 2024, 2, "b", 4)]
+        )
+        self.assertEqual(RatingPeriod.objects.get(week=1).rating_sum, 0)
+
+    def test_add_flushes_full_batches(self) -> None:
+        """A full buffer is written without waiting for ``flush``."""
+        writer = BulkWriter(RatingPeriod, FIELDS, batch_size=2)
+        for week in range(1, 6):
+            writer.add(("elo", 2024, week, "x", 0))
+        self.assertEqual(RatingPeriod.objects.count(), 4)
+        writer.flush()
+        self.assertEqual(RatingPeriod.objects.count(), 5)
+
+    def test_conflicts(self) -> None:
+        """Duplicates fail unless conflicts are ignored."""
+        RatingPeriod.objects.create(
+            system="elo", season=2024, week=1, digest="old"
+        )
+        rows = [("elo", 2024, 1, "new", 1), ("elo", 2024, 2, "new", 1)]
+        writer = BulkWriter(RatingPeriod, FIELDS, ignore_conflicts=True)
+        writer.extend(rows)
+        writer.flush()
+        self.assertEqual(
+            _periods(), [("elo", 2024, 1, "old", 0), ("elo", 2024, 2, "new", 1)]
+        )
+
+        writer = BulkWriter(RatingPeriod, FIELDS)
+        writer.extend(rows)
+        with self.assertRaises(IntegrityError), bulk_transaction():
+            writer.flush()
+
+    def test_other_backends_use_bulk_create(self) -> None:
+        """Backends without a fast path go through ``bulk_create``."""
+        RatingPeriod.objects.create(
+            system="elo", season=2024, week=1, digest="old"
+        )
+        writer = BulkWriter(RatingPeriod, FIELDS, ignore_conflicts=True)
+        writer.extend([("elo", 2024, 1, "new", 1), ("elo", 2024, 2, "b", 1)])
+        with mock.patch.object(connection, "vendor", "mysql"):
+            writer.flush()
+        self.assertEqual(
+            _periods(), [("elo", 2024, 1, "old", 0), ("elo", 2024, 2, "b", 1)]
+        )
+
+
+class CopyTests(TestCase):
+    """Tests for the PostgreSQL ``COPY`` path on a fake psycopg cursor."""
+
+    COLUMNS = (
+        '"system", "season", "week", "digest", "match_count", '
+        '"rating_sum", "team_count"'
+    )
+
+    def _flush(self, **kwargs: object) -> tuple[list[str], list[tuple]]:
+        """Flush two rows through ``COPY``; return the SQL and copied rows."""
+        statements: list[str] = []
+        copied: list[tuple] = []
+
+        @contextmanager
+        def copy(sql: str) -> object:
+            statements.append(sql)
+            yield SimpleNamespace(write_row=copied.append)
+
+        cursor = mock.MagicMock()
+        cursor.execute.side_effect = statements.append
+        cursor.cursor.copy = copy
+        fake = mock.MagicMock(
+            vendor="postgresql", Database=SimpleNamespace(__name__="psycopg")
+        )
+        fake.ops.quote_name = lambda name: f'"{name}"'
+        fake.cursor.return_value.__enter__.return_value = cursor
+
+        writer = BulkWriter(RatingPeriod, FIELDS, **kwargs)
+        writer.extend([("elo", 2024, 1, "a", 3), ("elo", 2024, 2, "b", 4)])
+        with mock.patch("core.bulk.connections", {"default": fake}):
+            self.assertEqual(writer.flush(), 2)
+        return statements, copied
+
+    def test_copy_into_table(self) -> None:
+        """Rows and model defaults are copied straight into the table."""
+        statements, copied = self._flush()
+        self.assertEqual(
+            statements,
+            [f'COPY "core_ratingperiod" ({self.COLUMNS}) FROM STDIN'],
+        )
+        self.assertEqual(
+            copied,
+            [("elo", 2024, 1, "a", 3, 0, 0), ("elo", 2024, 2, "b", 4, 0, 0)],
+        )
+
+    def test_copy_ignoring_conflicts_uses_temp_table(self) -> None:
+        """Conflicts are skipped by moving rows over from ``pg_temp``."""
+        statements, copied = self._flush(ignore_conflicts=True)
+        temp = 'pg_temp."core_ratingperiod_bulk"'
+        self.assertEqual(
+            statements,
+            [
+                f"DROP TABLE IF EXISTS {temp}",
+                f"CREATE TEMPORARY TABLE {temp} AS "  # noqa: S608
+                f"SELECT {self.COLUMNS} "
+                'FROM "core_ratingperiod" WITH NO DATA',
+                f"COPY {temp} ({self.COLUMNS}) FROM STDIN",
+                f'INSERT INTO "core_ratingperiod" ({self.COLUMNS}) '  # noqa: S608
+                f"SELECT {self.COLUMNS} FROM {temp} ON CONFLICT DO NOTHING",
+                f"DROP TABLE {temp}",
+            ],
+        )
+        self.assertEqual(len(copied), 2)
+        self.assertEqual(copied[1], ("elo", 2024, 2, "b", 4, 0, 0))
+
+
+class BulkTransactionTests(TransactionTestCase):
+    """Tests for :func:`bulk_transaction` outside a test transaction."""
+
+    def _synchronous(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            return cursor.fetchone()[0]
+
+    def test_relaxes_sync_and_rolls_back_on_error(self) -> None:
+        """Writes are atomic and the sync setting is restored afterwards."""
+        before = self._synchronous()
+        writer = BulkWriter(RatingPeriod, FIELDS)
+        with bulk_transaction():
+            self.assertEqual(self._synchronous(), 0)
+            writer.add(("elo", 2024, 1, "a", 0))
+            writer.flush()
+        self.assertEqual(self._synchronous(), before)
+        self.assertEqual(RatingPeriod.objects.count(), 1)
+
+        with self.assertRaises(ValueError), bulk_transaction():
+            writer.add(("elo", 2024, 2, "b", 0))
+            writer.flush()
+            raise ValueError
+        self.assertEqual(RatingPeriod.objects.count(), 1)
+        self.assertEqual(self._synchronous(), before)
@@ -0,0 +1,98 @@
+"""Tests for the helpers shared by the Glicko commands."""
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models.enums import DivisionClassification, SeasonType
+from core.models.match import Match
+from core.models.team import Team
+from core.ratings import (
+    calculate_home_field_bonus,
+    calculate_margin_weight_cap,
+    get_team_index,
+    season_matches,
+)
+from libs.rating_state import TeamRatingState
+
+
+class RatingHelperTests(TestCase):
+    """Behavior tests for :mod:`core.ratings`."""
+
+    def _team(self, name: str) -> Team:
+        return Team.objects.create(
+            school=name,
+            color="#fff",
+            alternate_color="#000",
+            classification=DivisionClassification.FBS,
+        )
+
+    def test_get_team_index_creates_and_reuses(self) -> None:
+        """``get_team_index`` adds a team once and then reuses its index."""
+        state = TeamRatingState()
+        idx = get_team_index(state, 1, DivisionClassification.FCS)
+        self.assertEqual(state.rating[idx], 1300)  # FCS base rating
+        self.assertEqual(state.team_ids, [1])
+        again = get_team_index(state, 1, None)
+        self.assertEqual(idx, again)
+        self.assertEqual(len(state), 1)
+
+    def test_season_matches_groups_completed_matches(self) -> None:
+        """Each season is paired with its and the previous season's games."""
+        a = self._team("A")
+        b = self._team("B")
+        for season, completed in [
+            (2020, True),
+            (2021, True),
+            (2022, False),
+            (2023, True),
+        ]:
+            Match.objects.create(
+                season=season,
+                week=1,
+                season_type=SeasonType.REGULAR,
+                start_date=timezone.now(),
+                completed=completed,
+                home_team=a,
+                away_team=b,
+                home_score=7,
+                away_score=3,
+            )
+
+        grouped = [
+            (season, len(matches), len(prev_matches))
+            for season, matches, prev_matches in season_matches(
+                [2021, 2022, 2023]
+            )
+        ]
+        self.assertEqual(grouped, [(2021, 1, 1), (2022, 0, 1), (2023, 1, 0)])
+        self.assertEqual(list(season_matches([])), [])
+
+    def test_calculate_bonus_and_cap(self) -> None:
+        """The helpers return the expected bonus and cap values."""
+        t1 = self._team("A")
+        t2 = self._team("B")
+        Match.objects.create(
+            season=2023,
+            week=1,
+            season_type=SeasonType.REGULAR,
+            start_date=timezone.now(),
+            completed=True,
+            neutral_site=False,
+            home_team=t1,
+            home_classification=DivisionClassification.FBS,
+            away_team=t2,
+            away_classification=DivisionClassification.FBS,
+            home_score=20,
+            away_score=10,
+        )
+        matches = list(season_matches([2024]))[0][2]
+        self.assertEqual(len(matches), 1)
+        bonus = calculate_home_field_bonus(matches, 1500)
+        cap = calculate_margin_weight_cap(matches)
+        self.assertEqual(bonus, 750)
+        self.assertEqual(cap, 15)
+
+    def test_calculate_bonus_and_cap_no_matches(self) -> None:
+        """When no matches exist, bonus is 0 and cap defaults to 1.5."""
+        self.assertEqual(calculate_home_field_bonus([], 1500), 0)
+        self.assertEqual(calculate_margin_weight_cap([]), 1.5)
@@ -0,0 +1,31 @@
+"""Tests for the Django-aware process pools."""
+
+import pickle
+from unittest import TestCase
+
+from core.workers import _setup_worker, model_pool
+
+received: list[tuple] = []
+
+
+def record(*args: object) -> None:
+    """Remember the arguments a worker was set up with."""
+    received.append(args)
+
+
+class ModelPoolTests(TestCase):
+    """Behavior tests for :func:`model_pool`."""
+
+    def setUp(self) -> None:
+        """Forget the arguments of earlier tests."""
+        received.clear()
+
+    def test_initializer_travels_by_name(self) -> None:
+        """Workers resolve the initializer and unpickle its arguments."""
+        _setup_worker(f"{__name__}.record", pickle.dumps((1, "a")))
+        self.assertEqual(received, [(1, "a")])
+
+    def test_pool_runs_tasks(self) -> None:
+        """The pool starts with the default context and runs tasks."""
+        with model_pool(2, record, 1) as pool:
+            self.assertEqual(list(pool.map(abs, [-1, 2])), [1, 2])
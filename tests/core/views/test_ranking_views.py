@@ -97,9 +97,17 @@ class RankingListViewTests(TestCase):
         self.assertEqual(response.context["week"], 2)
         self.assertEqual(response.context["weeks"], [1, 2])
         ratings = list(response.context["ratings"])
-        self.assertEqual(len(ratings), 1)
-        self.assertEqual(ratings[0].season, 2023)
-        self.assertEqual(ratings[0].week, 2)
+        self.assertEqual(len(ratings), 2)
+        self.assertEqual(ratings[0].team, self.team1)
+        self.assertEqual(ratings[0].week, 1)
+        self.assertEqual(ratings[0].week_change, 0)
+        self.assertEqual(ratings[1].season, 2023)
+        self.assertEqual(ratings[1].week, 2)
+        self.assertEqual(ratings[1].week_change, 1400 - 1500)
+
+        response = self.client.get(f"{self.url}?season=2023&week=1")
+        ratings = list(response.context["ratings"])
+        self.assertEqual([r.team for r in ratings], [self.team1])
 
     def test_invalid_query_defaults_to_latest(self) -> None:
         """Invalid query params should fall back to latest season and week."""
@@ -0,0 +1,80 @@
+"""Tests for the season checkpoint store."""
+
+import json
+import os
+import tempfile
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+import numpy as np
+from django.test import TestCase
+
+from libs.checkpoint import CheckpointStore, params_key
+
+django.setup()
+
+
+class ParamsKeyTests(TestCase):
+    """Tests for :func:`params_key`."""
+
+    def test_key_is_stable_and_order_independent(self) -> None:
+        """The same parameters hash to the same key in any order."""
+        self.assertEqual(
+            params_key({"tau": 0.9, "k": 32}), params_key({"k": 32, "tau": 0.9})
+        )
+        self.assertEqual(len(params_key({})), 16)
+
+    def test_key_changes_with_parameters(self) -> None:
+        """Any change to a parameter produces a different key."""
+        self.assertNotEqual(params_key({"tau": 0.9}), params_key({"tau": 0.5}))
+
+
+class CheckpointStoreTests(TestCase):
+    """Tests for :class:`CheckpointStore`."""
+
+    def setUp(self) -> None:
+        """Create a store in a temporary directory."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.store = CheckpointStore(self.root, "glicko", {"tau": 0.9})
+
+    def test_save_and_load_round_trip(self) -> None:
+        """Saved arrays load back unchanged."""
+        arrays = {
+            "team_ids": np.array([3, 1], dtype=np.int64),
+            "rating": np.array([1510.5, 1490.25]),
+        }
+        path = self.store.save(2023, arrays)
+        self.assertEqual(path, self.store.path(2023))
+        self.assertEqual(path.parent.parent.name, "glicko")
+
+        loaded = self.store.load(2023)
+        self.assertEqual(set(loaded), {"team_ids", "rating"})
+        np.testing.assert_array_equal(loaded["team_ids"], arrays["team_ids"])
+        np.testing.assert_array_equal(loaded["rating"], arrays["rating"])
+
+        params = json.loads((self.store.directory / "params.json").read_text())
+        self.assertEqual(params, {"tau": 0.9})
+        self.assertEqual(
+            [p.suffix for p in self.store.directory.iterdir()].count(".tmp"), 0
+        )
+
+    def test_missing_checkpoint(self) -> None:
+        """Unknown seasons load as ``None`` and are not listed."""
+        self.assertIsNone(self.store.load(1999))
+        self.assertEqual(self.store.seasons(), [])
+
+    def test_seasons_lists_saved_checkpoints(self) -> None:
+        """``seasons`` lists saved seasons in order."""
+        for season in (2024, 2022):
+            self.store.save(season, {"rating": np.zeros(1)})
+        self.assertEqual(self.store.seasons(), [2022, 2024])
+
+    def test_parameters_select_separate_directories(self) -> None:
+        """Stores with different parameters never share checkpoints."""
+        self.store.save(2023, {"rating": np.zeros(1)})
+        other = CheckpointStore(self.root, "glicko", {"tau": 0.5})
+        self.assertNotEqual(other.directory, self.store.directory)
+        self.assertIsNone(other.load(2023))
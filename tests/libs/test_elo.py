@@ -5,9 +5,15 @@ import os
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 import django
+import numpy as np
 from django.test import TestCase
 
-from libs.elo import expected_score, update_ratings
+from libs.elo import (
+    expected_score,
+    sub_rounds,
+    update_ratings,
+    update_ratings_batch,
+)
 
 django.setup()
 
@@ -33,3 +39,45 @@ class EloHelpersTest(TestCase):
         home_after, away_after = update_ratings(1500, 1500, 21, 21)
         self.assertEqual(home_after, 1500)
         self.assertEqual(away_after, 1500)
+
+    def test_sub_rounds_split_repeated_teams(self) -> None:
+        """A team's second game moves to the next sub-round."""
+        rounds = sub_rounds(
+            np.array([0, 2, 1, 3, 4]), np.array([1, 3, 4, 0, 5])
+        )
+        self.assertEqual(rounds.tolist(), [0, 0, 1, 1, 2])
+        self.assertEqual(sub_rounds(np.array([]), np.array([])).size, 0)
+
+    def test_update_ratings_batch_matches_sequential_updates(self) -> None:
+        """Batches reproduce game-by-game updates bit for bit."""
+        rng = np.random.default_rng(7)
+        count = 200
+        home = rng.integers(0, 40, count)
+        away = (home + rng.integers(1, 40, count)) % 40
+        home_score = rng.integers(0, 50, count)
+        away_score = rng.integers(0, 50, count)
+        neutral = rng.random(count) < 0.2
+        start = 1500 + rng.normal(0, 100, 40)
+
+        expected = start.tolist()
+        rows = []
+        for h, a, hs, as_, n in zip(
+            home.tolist(),
+            away.tolist(),
+            home_score.tolist(),
+            away_score.tolist(),
+            neutral.tolist(),
+            strict=True,
+        ):
+            before = (expected[h], expected[a])
+            expected[h], expected[a] = update_ratings(
+                *before, hs, as_, k_factor=20, neutral_site=n
+            )
+            rows.append((*before, expected[h], expected[a]))
+
+        ratings = start.copy()
+        result = update_ratings_batch(
+            ratings, home, away, home_score, away_score, neutral, k_factor=20
+        )
+        self.assertEqual(ratings.tolist(), expected)
+        self.assertEqual(list(zip(*(r.tolist() for r in result))), rows)
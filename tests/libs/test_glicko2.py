@@ -1,15 +1,24 @@
-"""Tests for the Glicko-2 rating algorithm implementation."""
+"""Tests for the Glicko-2 rating helpers."""
 
 import math
 import os
 
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
 import django
+import numpy as np
 from django.test import TestCase
 
-from libs.constants import GLICKO2_SCALER
-from libs.glicko2 import Player
+from libs.glicko2 import (
+    GLICKO2_SCALER,
+    Player,
+    SolverStats,
+    inflate_rd,
+    solve_volatility,
+    update_ratings_batch,
+    win_probability,
+)
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 django.setup()
 
 
@@ -42,12 +51,31 @@ class Glicko2Test(TestCase):
         )
         self.assertAlmostEqual(p.rd, expected_rd, places=12)
 
+    def _delta_v(
+        self,
+        scaled_ratings: list[float],
+        scaled_rds: list[float],
+        outcome_list: list[float],
+    ) -> tuple[float, float]:
+        """Return ``delta`` and ``v`` for a player rated 1500."""
+        v_sum = 0.0
+        score_sum = 0.0
+        for mu, phi, outcome in zip(
+            scaled_ratings, scaled_rds, outcome_list, strict=True
+        ):
+            g = 1 / math.sqrt(1 + 3 * phi**2 / math.pi**2)
+            e = 1 / (1 + math.exp(g * mu))
+            v_sum += g**2 * e * (1 - e)
+            score_sum += g * (outcome - e)
+        v = 1 / v_sum
+        return v * score_sum, v
+
     def test_new_vol(self) -> None:
         """``_new_vol`` returns the expected post-match volatility."""
-        v = self.player._v(self.scaled_ratings, self.scaled_rds)
-        new_vol = self.player._new_vol(
-            self.scaled_ratings, self.scaled_rds, self.outcome_list, v
+        delta, v = self._delta_v(
+            self.scaled_ratings, self.scaled_rds, self.outcome_list
         )
+        new_vol = self.player._new_vol(delta, v)
 
         # Volatility converges to a known value for this match history
         self.assertAlmostEqual(new_vol, 0.05999342315486217)
@@ -62,14 +90,11 @@ class Glicko2Test(TestCase):
         # Scale inputs for the internal Glicko-2 representation
         scaled_ratings = [(x - 1500) / GLICKO2_SCALER for x in rating_list]
         scaled_rds = [x / GLICKO2_SCALER for x in rd_list]
-        v = p._v(scaled_ratings, scaled_rds)
+        delta, v = self._delta_v(scaled_ratings, scaled_rds, outcome_list)
 
         # With a massive upset loss, ``delta`` is large enough to trigger
         # the ``delta**2 > rd**2 + v`` branch in step 2.
-        self.assertAlmostEqual(
-            p._new_vol(scaled_ratings, scaled_rds, outcome_list, v),
-            0.06001325617796023,
-        )
+        self.assertAlmostEqual(p._new_vol(delta, v), 0.06001325617796023)
 
     def test_new_vol_expands_bounds(self) -> None:
         """``_new_vol`` expands the search interval when ``f`` is negative."""
@@ -79,18 +104,18 @@ class Glicko2Test(TestCase):
                 super().__init__(*args, **kwargs)
                 self._first = True
 
-            def _f(self, x: float, delta: float, v: float, a: float) -> float:
+            def _f(self, x: float, delta2: float, v: float, a: float) -> float:
                 if self._first:
                     # Force the initial check negative so the loop executes
                     self._first = False
-                    return -abs(super()._f(x, delta, v, a)) - 1
-                return super()._f(x, delta, v, a)
+                    return -abs(super()._f(x, delta2, v, a)) - 1
+                return super()._f(x, delta2, v, a)
 
         p = LoopPlayer(rating=1500, rd=200, vol=0.06, tau=0.5)
-        v = p._v(self.scaled_ratings, self.scaled_rds)
-        new_vol = p._new_vol(
-            self.scaled_ratings, self.scaled_rds, self.outcome_list, v
+        delta, v = self._delta_v(
+            self.scaled_ratings, self.scaled_rds, self.outcome_list
         )
+        new_vol = p._new_vol(delta, v)
 
         # Forcing the loop still converges to the known post-match volatility.
         self.assertAlmostEqual(new_vol, 0.05999342315486217, places=9)
@@ -116,3 +141,275 @@ class Glicko2Test(TestCase):
             math.sqrt((50 / GLICKO2_SCALER) ** 2 + 0.06**2) * GLICKO2_SCALER
         )
         self.assertAlmostEqual(p.rd, expected_rd, places=12)
+
+
+class PlayerTests(TestCase):
+    """Regression tests for :class:`libs.glicko2.Player`."""
+
+    def test_update_player_matches_reference_values(self) -> None:
+        """``update_player`` reproduces Glickman's worked example."""
+        player = Player(rating=1500, rd=200, vol=0.06)
+        player.update_player([1400, 1550, 1700], [30, 100, 300], [1, 0, 0])
+        self.assertAlmostEqual(player.rating, 1464.0507026438718, places=9)
+        self.assertAlmostEqual(player.rd, 151.5164564678803, places=9)
+        self.assertAlmostEqual(player.vol, 0.05997869993495424, places=12)
+
+    def test_update_player_brackets_volatility(self) -> None:
+        """Lopsided ratings take the iterative volatility bracketing branch."""
+        player = Player(rating=2400, rd=60, vol=0.11, tau=0.3)
+        player.update_player([1000, 1100], [300, 50], [0.6, 1])
+        self.assertAlmostEqual(player.rating, 2393.451463958339, places=9)
+        self.assertAlmostEqual(player.rd, 62.960787968610454, places=9)
+        self.assertAlmostEqual(player.vol, 0.11000214746513405, places=12)
+
+    def test_update_player_extends_bracket(self) -> None:
+        """Extreme volatility widens the bracket over several steps."""
+        player = Player(rating=1500, rd=30, vol=10, tau=3)
+        player.update_player([1500] * 4, [30] * 4, [1, 0, 1, 0])
+        self.assertEqual(player.rating, 1500)
+        self.assertAlmostEqual(player.rd, 152.52876414216112, places=9)
+        self.assertAlmostEqual(player.vol, 1.7991343877844284, places=12)
+
+    def test_player_uses_slots(self) -> None:
+        """Players carry no per-instance ``__dict__``."""
+        player = Player()
+        self.assertFalse(hasattr(player, "__dict__"))
+        with self.assertRaises(AttributeError):
+            player.extra = 1
+
+    def test_did_not_compete_inflates_rd(self) -> None:
+        """Idle players keep their rating while their RD grows."""
+        player = Player(rating=1300, rd=150, vol=0.11)
+        player.did_not_compete()
+        self.assertEqual(player.rating, 1300)
+        self.assertAlmostEqual(player.rd, 151.21227554615322, places=9)
+        self.assertEqual(player.vol, 0.11)
+
+    def test_inflate_rd_over_many_periods(self) -> None:
+        """Several idle periods equal repeated single-period inflation."""
+        rd = np.array([150.0, 40.0])
+        vol = np.array([0.11, 0.06])
+        stepped = rd
+        for _ in range(4):
+            stepped = inflate_rd(stepped, vol)
+        np.testing.assert_allclose(inflate_rd(rd, vol, 4), stepped, rtol=1e-12)
+        np.testing.assert_allclose(
+            inflate_rd(rd, vol, np.array([0, 4])), [150.0, stepped[1]]
+        )
+
+
+class UpdateRatingsBatchTests(TestCase):
+    """Parity tests for :func:`libs.glicko2.update_ratings_batch`."""
+
+    def _scalar(
+        self,
+        rating: np.ndarray,
+        rd: np.ndarray,
+        vol: np.ndarray,
+        edges: list[tuple[int, float, float, float]],
+        tau: float,
+    ) -> np.ndarray:
+        """Rate the period one :class:`Player` at a time."""
+        out = []
+        for i in range(len(rating)):
+            player = Player(rating=rating[i], rd=rd[i], vol=vol[i], tau=tau)
+            recs = [e for e in edges if e[0] == i]
+            if recs:
+                player.update_player(
+                    [r for _, r, _, _ in recs],
+                    [d for _, _, d, _ in recs],
+                    [o for _, _, _, o in recs],
+                )
+            else:
+                player.did_not_compete()
+            out.append((player.rating, player.rd, player.vol))
+        return np.array(out)
+
+    def _assert_parity(
+        self,
+        rating: np.ndarray,
+        rd: np.ndarray,
+        vol: np.ndarray,
+        edges: list[tuple[int, float, float, float]],
+        tau: float = 0.9,
+    ) -> None:
+        expected = self._scalar(rating, rd, vol, edges, tau)
+        player, opp_rating, opp_rd, outcome = (
+            np.array(col) for col in zip(*edges, strict=True)
+        )
+        actual = update_ratings_batch(
+            rating, rd, vol, player, opp_rating, opp_rd, outcome, tau=tau
+        )
+        np.testing.assert_allclose(
+            np.column_stack(actual), expected, rtol=1e-10, atol=1e-9
+        )
+
+    def test_matches_scalar_player_on_random_week(self) -> None:
+        """A realistic week of games rates identically to ``Player``."""
+        rng = np.random.default_rng(1869)
+        teams = 300
+        rating = rng.normal(1400, 250, teams)
+        rd = rng.uniform(40, 350, teams)
+        vol = rng.uniform(0.05, 0.12, teams)
+        edges = []
+        order = rng.permutation(teams)
+        for home, away in zip(order[:120], order[120:240], strict=True):
+            outcome = float(rng.choice([0.0, 0.25, 0.5, 0.75, 1.0]))
+            edges.append((home, rating[away], rd[away], outcome))
+            edges.append((away, rating[home], rd[home], 1 - outcome))
+        # A few teams play twice in the same period.
+        for home, away in zip(order[:10], order[240:250], strict=True):
+            edges.append((home, rating[away], rd[away], 1.0))
+            edges.append((away, rating[home], rd[home], 0.0))
+        self._assert_parity(rating, rd, vol, edges)
+
+    def test_matches_scalar_player_on_reference_cases(self) -> None:
+        """Hand-picked cases cover both volatility bracketing branches."""
+        self._assert_parity(
+            np.array([1500.0, 2400.0, 1300.0]),
+            np.array([200.0, 60.0, 150.0]),
+            np.array([0.06, 0.11, 0.11]),
+            [
+                (0, 1400, 30, 1),
+                (0, 1550, 100, 0),
+                (0, 1700, 300, 0),
+                (1, 1000, 300, 0.6),
+                (1, 1100, 50, 1),
+            ],
+            tau=0.3,
+        )
+        self._assert_parity(
+            np.array([1500.0, 1500.0]),
+            np.array([30.0, 100.0]),
+            np.array([10.0, 0.11]),
+            [(0, 1500, 30, o) for o in (1, 0, 1, 0)] + [(1, 1500, 30, 1)],
+            tau=3,
+        )
+
+    def test_no_games_only_inflates_rd(self) -> None:
+        """Without edges every player is treated as idle."""
+        empty = np.empty(0)
+        rating, rd, vol = update_ratings_batch(
+            [1300.0], [150.0], [0.11], empty, empty, empty, empty
+        )
+        self.assertEqual(rating[0], 1300)
+        self.assertAlmostEqual(rd[0], 151.21227554615322, places=9)
+        self.assertEqual(vol[0], 0.11)
+
+
+class SolveVolatilityTests(TestCase):
+    """Tests for :func:`libs.glicko2.solve_volatility`."""
+
+    def _inputs(self) -> tuple[np.ndarray, ...]:
+        """Return internal-scale inputs for two players."""
+        mu = np.array([0.0, 900 / GLICKO2_SCALER])
+        phi = np.array([200.0, 60.0]) / GLICKO2_SCALER
+        vol = np.array([0.06, 0.11])
+        v = np.array([1.7785, 4.2])
+        delta = np.array([-0.4834, 0.9])
+        return mu, phi, vol, delta, v
+
+    def test_collects_iteration_stats(self) -> None:
+        """Converged solves report their iteration count and no hits."""
+        stats = SolverStats()
+        vol = solve_volatility(*self._inputs(), tau=0.5, stats=stats)
+        self.assertEqual(stats.teams, 2)
+        self.assertEqual(stats.max_iterations, 2)
+        self.assertEqual(stats.max_iter_hits, 0)
+        self.assertEqual(vol.shape, (2,))
+
+        solve_volatility(*self._inputs(), tau=0.5, stats=stats)
+        self.assertEqual(stats.teams, 4)
+
+    def test_max_iterations_are_counted(self) -> None:
+        """Players still iterating at ``max_iter`` are reported as hits."""
+        stats = SolverStats()
+        capped = solve_volatility(
+            *self._inputs(), tau=0.5, max_iter=1, stats=stats
+        )
+        full = solve_volatility(*self._inputs(), tau=0.5)
+        self.assertEqual(stats.max_iterations, 1)
+        self.assertEqual(stats.max_iter_hits, 2)
+        self.assertTrue(np.all(np.isfinite(capped)))
+        self.assertFalse(np.allclose(capped, full, rtol=1e-12, atol=0))
+
+    def test_convergence_on_the_last_step_is_not_a_hit(self) -> None:
+        """Players converging on step ``max_iter`` are not reported."""
+        stats = SolverStats()
+        capped = solve_volatility(
+            *self._inputs(), tau=0.5, max_iter=2, stats=stats
+        )
+        full = solve_volatility(*self._inputs(), tau=0.5)
+        self.assertEqual(stats.max_iterations, 2)
+        self.assertEqual(stats.max_iter_hits, 0)
+        np.testing.assert_array_equal(capped, full)
+
+    def test_bracketing_is_bounded(self) -> None:
+        """The bracketing search also stops after ``max_iter`` steps."""
+        args = (
+            np.zeros(1),
+            np.array([30 / GLICKO2_SCALER]),
+            np.array([10.0]),
+            np.zeros(1),
+            np.array([0.5]),
+        )
+        capped_stats = SolverStats()
+        capped = solve_volatility(*args, tau=3, max_iter=1, stats=capped_stats)
+        full_stats = SolverStats()
+        full = solve_volatility(*args, tau=3, stats=full_stats)
+        self.assertTrue(np.isfinite(capped[0]))
+        self.assertNotAlmostEqual(capped[0], full[0], places=6)
+
+        # The bracket is found on the one allowed step, the Illinois stage
+        # is capped there, and the player is reported once.
+        self.assertEqual(capped_stats.max_iterations, 2)
+        self.assertEqual(capped_stats.max_iter_hits, 1)
+        self.assertEqual(full_stats.max_iterations, 9)
+        self.assertEqual(full_stats.max_iter_hits, 0)
+        # Each stage converging exactly at the cap is not a hit.
+        exact_stats = SolverStats()
+        exact = solve_volatility(*args, tau=3, max_iter=8, stats=exact_stats)
+        self.assertEqual(exact_stats.max_iter_hits, 0)
+        self.assertEqual(exact[0], full[0])
+        bracket_only = SolverStats()
+        solve_volatility(
+            *args, tau=3, max_iter=1, eps=np.inf, stats=bracket_only
+        )
+        self.assertEqual(bracket_only.max_iterations, 1)
+        self.assertEqual(bracket_only.max_iter_hits, 0)
+        # A bracket still missing after the last step is a hit.
+        unbracketed = SolverStats()
+        solve_volatility(
+            *args, tau=3, max_iter=0, eps=np.inf, stats=unbracketed
+        )
+        self.assertEqual(unbracketed.max_iter_hits, 1)
+
+    def test_converged_without_stats(self) -> None:
+        """Already converged inputs return the starting volatility."""
+        vol = solve_volatility(
+            np.zeros(1),
+            np.ones(1),
+            np.array([0.06]),
+            np.zeros(1),
+            np.ones(1),
+            eps=np.inf,
+        )
+        self.assertAlmostEqual(vol[0], 0.06)
+
+
+class WinProbabilityTests(TestCase):
+    """Tests for :func:`libs.glicko2.win_probability`."""
+
+    def test_probabilities(self) -> None:
+        """Equal teams are a coin flip and uncertainty shrinks the edge."""
+        p = win_probability(
+            np.array([1500.0, 1700.0, 1700.0]),
+            np.array([50.0, 50.0, 300.0]),
+            np.array([1500.0, 1500.0, 1500.0]),
+            np.array([50.0, 50.0, 300.0]),
+        )
+        self.assertEqual(p[0], 0.5)
+        self.assertGreater(p[1], p[2])
+        self.assertGreater(p[2], 0.5)
+        reverse = win_probability(1500.0, 50.0, 1700.0, 50.0)
+        self.assertAlmostEqual(p[1] + reverse, 1.0)
@@ -0,0 +1,135 @@
+"""Tests for the struct-of-arrays rating state store."""
+
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+import numpy as np
+from django.test import TestCase
+
+from libs.constants import DEFAULT_RATING, DEFAULT_RD, DEFAULT_VOLATILITY
+from libs.glicko2 import inflate_rd
+from libs.rating_state import TeamRatingState
+
+django.setup()
+
+
+class TeamRatingStateTests(TestCase):
+    """Behavior tests for :class:`TeamRatingState`."""
+
+    def test_add_assigns_dense_indices(self) -> None:
+        """Teams receive consecutive indices and default values."""
+        state = TeamRatingState()
+        self.assertEqual(state.add(42), 0)
+        self.assertEqual(state.add(7, 1300, 300, 0.09), 1)
+        self.assertEqual(len(state), 2)
+        self.assertIn(42, state)
+        self.assertNotIn(1, state)
+        self.assertEqual(state.index, {42: 0, 7: 1})
+        self.assertEqual(state.team_ids, [42, 7])
+        self.assertEqual(state.rating.tolist(), [float(DEFAULT_RATING), 1300.0])
+        self.assertEqual(state.rd.tolist(), [float(DEFAULT_RD), 300.0])
+        self.assertEqual(state.vol.tolist(), [DEFAULT_VOLATILITY, 0.09])
+
+    def test_arrays_grow_beyond_initial_capacity(self) -> None:
+        """Adding more teams than the capacity keeps earlier values."""
+        state = TeamRatingState(capacity=0)
+        for team_id in range(10):
+            state.add(team_id, rating=1000 + team_id)
+        self.assertEqual(len(state), 10)
+        self.assertEqual(state.rating.tolist(), [1000.0 + i for i in range(10)])
+
+    def test_views_write_through(self) -> None:
+        """Writes to the array views update the store."""
+        state = TeamRatingState()
+        state.add(1)
+        state.add(2)
+        state.rating[:] = [1600, 1400]
+        state.rd[1] = 80
+        self.assertEqual(state.rating.tolist(), [1600.0, 1400.0])
+        self.assertEqual(state.rd[1], 80)
+
+    def test_snapshot_and_restore(self) -> None:
+        """``restore`` rolls back values and teams added after a snapshot."""
+        state = TeamRatingState()
+        state.add(1, 1500, 200, 0.06)
+        snap = state.snapshot()
+
+        state.rating[0] = 1700
+        state.vol[0] = 0.2
+        state.add(2)
+        self.assertEqual(snap.rating[0], 1500)
+
+        state.restore(snap)
+        self.assertEqual(len(state), 1)
+        self.assertEqual(state.team_ids, [1])
+        self.assertNotIn(2, state)
+        self.assertEqual(state.rating[0], 1500)
+        self.assertEqual(state.rd[0], 200)
+        self.assertEqual(state.vol[0], 0.06)
+        self.assertEqual(state.add(3), 1)
+
+    def test_sync_inflates_idle_teams_in_closed_form(self) -> None:
+        """Missed periods match repeated step-6 inflation."""
+        state = TeamRatingState()
+        state.add(1, 1500, 60, 0.06)
+        state.add(2, 1500, 80, 0.09)
+        for _ in range(5):
+            state.advance([1])
+        self.assertEqual(state.period, 5)
+        self.assertEqual(state.last_period.tolist(), [0, 5])
+        self.assertEqual(state.rd[0], 60)
+
+        state.sync([0, 1])
+        expected = np.array([60.0])
+        for _ in range(5):
+            expected = inflate_rd(expected, np.array([0.06]))
+        self.assertAlmostEqual(state.rd[0], expected[0], places=9)
+        self.assertEqual(state.rd[1], 80)
+        self.assertEqual(state.last_period.tolist(), [5, 5])
+
+    def test_add_with_stale_period(self) -> None:
+        """Teams added with an older period are inflated on the next sync."""
+        state = TeamRatingState()
+        state.period = 3
+        state.add(1, 1500, 50, 0.06, period=1)
+        state.add(2, 1500, 50, 0.06)
+        state.sync()
+        self.assertAlmostEqual(
+            state.rd[0], inflate_rd(np.array([50.0]), 0.06, 2)[0]
+        )
+        self.assertEqual(state.rd[1], 50)
+
+    def test_snapshot_syncs_and_restore_resets_periods(self) -> None:
+        """Snapshots carry up-to-date RDs and the current period."""
+        state = TeamRatingState()
+        state.add(1, 1500, 50, 0.06)
+        state.advance([])
+        snap = state.snapshot()
+        self.assertEqual(snap.period, 1)
+        self.assertGreater(snap.rd[0], 50)
+
+        state.advance([0])
+        state.restore(snap)
+        self.assertEqual(state.period, 1)
+        self.assertEqual(state.last_period.tolist(), [1])
+        self.assertEqual(state.rd[0], snap.rd[0])
+
+    def test_to_and_from_arrays_round_trip(self) -> None:
+        """A rebuilt store keeps values, indices and pending inflation."""
+        state = TeamRatingState()
+        state.add(10, 1600, 60, 0.05)
+        state.add(20, 1400, 80, 0.07)
+        state.advance([1])
+
+        rebuilt = TeamRatingState.from_arrays(state.to_arrays())
+        self.assertEqual(rebuilt.team_ids, [10, 20])
+        self.assertEqual(rebuilt.index, {10: 0, 20: 1})
+        self.assertEqual(rebuilt.period, 1)
+        self.assertEqual(rebuilt.last_period.tolist(), [0, 1])
+        self.assertEqual(rebuilt.rating.tolist(), [1600.0, 1400.0])
+        rebuilt.sync()
+        state.sync()
+        self.assertEqual(rebuilt.rd.tolist(), state.rd.tolist())
+        self.assertEqual(rebuilt.add(30), 2)